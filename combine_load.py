@@ -1,48 +1,87 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 import os
 import pandas as pd
 from utils.pkey_gen import custom_job_id
+from utils.schema import SCHEMA, TABLE, ensure_table, insert_jobs, swap_table
+from utils.aggregates import rebuild_summary
+from utils.canonical import canonicalize
+from utils.lineage import record_lineage
+from utils.source_registry import source_names
+from utils.logger import get_module_logger
 
-# List of source names (same as your main script)
-sources = ["jobnetmm", "jobsdbth", "jobsdbsg", "founditsg", "jobstreetmalay"]
+logger = get_module_logger(__name__, group='transform')
 
-# Read the database URL from environment (injected by GitHub Actions)
-DATABASE_URL = os.getenv("DATABASE_URL")
+# List of source names (sources.toml, as in main.py)
+sources = source_names()
 
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL not set. Make sure it is configured in GitHub Secrets.")
+STAGING_TABLE = "IT_staging"
 
-# Create engine
-engine = create_engine(DATABASE_URL)
 
-# Collect all transformed dataframes
-dfs = []
+def _drop_staging(engine):
+    with engine.begin() as conn:
+        conn.execute(text(f'DROP TABLE IF EXISTS "{SCHEMA}"."{STAGING_TABLE}"'))
 
-for source in sources:
-    table_name = f"{source}_transformed"
-    try:
-        df = pd.read_sql_table(table_name, con=engine)
-        dfs.append(df)
-        print(f"Loaded {table_name} with shape {df.shape}")
-    except Exception as e:
-        print(f"Error loading table {table_name}: {e}")
-
-# Combine and write
-if dfs:
-    full_df = pd.concat(dfs, ignore_index=True)
-    print(f"\nCombined DataFrame shape: {full_df.shape}")
-
-    # Generate custom job IDs
-    full_df = custom_job_id(full_df)
-    print("🔧 Custom job IDs generated.")
-    print(full_df[['job_id']].head())
 
+def combine_sources(database_url, sources=sources, chunk_size=50000):
+    """
+    Rebuild "IT_jobs"."IT" from the {source}_transformed tables.
+
+    Each source table is streamed through a server-side cursor in chunks; job
+    IDs and canonical company/location IDs are assigned per chunk, which is
+    inserted into a staging copy of the managed (partitioned) table that then
+    replaces IT in a single transaction. All chunks share one engine (and its
+    connection pool). Peak memory is about one chunk, and readers of IT see
+    either the old table or the new one, never a partial load: if a source
+    fails partway, staging is dropped and IT is left as it was. A source
+    without a transformed table is skipped.
+    Returns the number of rows loaded.
+    """
+    engine = create_engine(database_url)
+    total = 0
     try:
-        full_df.to_sql("IT", schema="IT_jobs", con=engine, if_exists='replace', index=False)
-        print("Data loaded into IT_jobs.IT successfully.")
-    except Exception as e:
-        print(f"Error writing combined data to IT_jobs.IT: {e}")
+        _drop_staging(engine)
+        ensure_table(engine, STAGING_TABLE)
+
+        for source in sources:
+            table_name = f"{source}_transformed"
+            if not inspect(engine).has_table(table_name):
+                logger.warning(f"No table {table_name}, skipping {source}")
+                continue
+            loaded = 0
+            try:
+                with engine.connect().execution_options(stream_results=True, max_row_buffer=chunk_size) as reader:
+                    for chunk in pd.read_sql_table(table_name, con=reader, chunksize=chunk_size):
+                        chunk = canonicalize(custom_job_id(chunk), database_url)
+                        loaded += insert_jobs(chunk, database_url, table=STAGING_TABLE, engine=engine)
+                        record_lineage(chunk, database_url, engine=engine)  # No-op for tables without lineage columns
+            except Exception:
+                # Staging holds part of this source; swapping it in would truncate the source in IT
+                logger.error(f"Error loading table {table_name} after {loaded} rows; "
+                             f"dropping {STAGING_TABLE} and keeping {SCHEMA}.{TABLE} as it was", exc_info=True)
+                _drop_staging(engine)
+                raise
+            logger.info(f"Staged {table_name}: {loaded} rows")
+            total += loaded
+
+        if total == 0:
+            logger.warning("No rows loaded, skipping combine operation")
+            _drop_staging(engine)
+            return 0
+
+        # Postgres DDL is transactional: drop + rename is one atomic swap
+        swap_table(engine, STAGING_TABLE, TABLE)
+        rebuild_summary(engine, SCHEMA, TABLE)
+        logger.info(f"Data loaded into {SCHEMA}.{TABLE} successfully ({total} rows)")
     finally:
         engine.dispose()
-else:
-    print("No dataframes loaded — skipping combine operation.")
+    return total
+
+
+if __name__ == "__main__":
+    # Read the database URL from environment (injected by GitHub Actions)
+    DATABASE_URL = os.getenv("DATABASE_URL")
+
+    if not DATABASE_URL:
+        raise ValueError("DATABASE_URL not set. Make sure it is configured in GitHub Secrets.")
+
+    combine_sources(DATABASE_URL)
@@ -1,139 +1,33 @@
-from sqlalchemy import create_engine
-from extract.jobnetmm import JobNetScraper
-from transform.jobnetmm_t import JobNetTransform
-from extract.jobsdbth import JobsDBThScraper
-from transform.jobsdbth_t import JobsDBTHTransform
-from extract.founditSG import FounditScraper
-from transform.founditsg_t import FounditTransform
-from extract.jobstreetmalay import JobStreetMalaysia
-from transform.jobstreetmalay_t import JobStreetMalayTransform
-from extract.jobdbsg import JobsDBScraper
-from transform.jobsdbsg_t import JobsDBSGTransform
-
-from utils.data_normalizer import JobDataNormalizer
+from sqlalchemy import create_engine, text
 from utils.pkey_gen import custom_job_id  # Import your job ID generator
+from utils.schema import insert_jobs
+from utils.dedup import NearDuplicateIndex
+from utils.canonical import canonicalize
+from utils.lineage import RUN_ID, record_lineage
+from utils.profiling import profiled, section
+from utils.memory import memory_stage
+from utils.source_registry import load_sources, run_scheduled
 import pandas as pd
 from dotenv import load_dotenv
+import argparse
 import os
 from datetime import datetime
 
 load_dotenv()
 
-## Function to extract jobs from JobNetMM and transform them
-def daily_jobnetmm():
-    """
-    Extracts jobs from JobNetMM, normalizes the data, and transforms it.
-    Returns a DataFrame of transformed job data.
-    """
-    email = os.getenv("JOBNET_EMAIL")
-    password = os.getenv("JOBNET_PASSWORD")
-    
-    # Scrape jobs
-    raw = JobNetScraper(email, password).get_jobs(job_function=17)
-    
-    # Normalize job data
-    raw_df = JobDataNormalizer().jobnetmm(raw)
-    
-    # Transform job data
-    transformer = JobNetTransform(raw_df, categories_path='categories.json')
-    transformed_df = transformer.transform()
-    
-    return transformed_df
-
-## Function to extract daily jobs from JobsDBTH and transform them
-def daily_jobsdbth():
-    """
-    Extracts jobs from JobsDBTH, normalizes the data, and transforms it.
-    Returns a DataFrame of transformed job data.
-    """
-    params = {
-        'siteKey': 'TH-Main',
-        'classification': '6281',  # IT Jobs
-        'pageSize': 100,
-        'locale': 'en-TH',
-        'dateRange': 1
-    }
-    
-    # Scrape jobs
-    raw = JobsDBThScraper(classification_id='6281', base_params=params).scrape_jobs()
-    
-    # Normalize job data
-    raw_df = JobDataNormalizer().jobsdbth(raw)
-    
-    # Transform job data
-    transformer = JobsDBTHTransform(raw_df, categories_path='categories.json')
-    transformed_df = transformer.transform()
-    
-    return transformed_df
-
-## Function to extract daily jobs from FounditSG and transform them
-def daily_founditsg():
+## Extract and transform one source in daily mode (last 24 hours; see sources.toml)
+def daily_source(config):
     """
-    Extracts jobs from FounditSG, normalizes the data, and transforms it.
+    Extracts the source's jobs, normalizes the data, and transforms it.
     Returns a DataFrame of transformed job data.
     """
-    base_params = {
-        "sort": 1,
-        "limit": 15,
-        "query": '""',
-        "quickApplyJobs": "true",
-        "jobFreshness": "1",  # Last 24 hours
-        "industries": [
-            "software",
-            "information technology",
-            "software engineering",
-            "it management",
-            "it infrastructure",
-            "cyber security",
-            "cloud computing",
-            "enterprise software",
-            "data center",
-            "cloud data services"
-        ],
-    }
-    
-    # Scrape jobs
-    raw = FounditScraper(base_params=base_params).extract_jobs()
-    
-    # Normalize job data
-    raw_df = JobDataNormalizer().founditsg(raw)
-    
-    # Transform job data
-    transformer = FounditTransform(raw_df)
-    transformed_df = transformer.transform()
-    
-    return transformed_df
-
-## Function to extract daily jobs from JobStreet Malaysia and transform them
-def daily_jobstreetmalay():
-    """
-    Extracts jobs from JobStreet Malaysia, normalizes the data, and transforms it.
-    Returns a DataFrame of transformed job data.
-    """
-    base_params = {
-        'siteKey': 'MY-Main',
-        'locale': 'en-MY',
-        'dateRange': 1  # Last 24 hours
-    }
-    raw = JobStreetMalaysia(classification_id="6281", base_params=base_params).fetch_jobs()
-    
-    # Normalize job data
-    raw_df = JobDataNormalizer().jobstreetmalay(raw)
-    
-    # Transform job data
-    transformer = JobStreetMalayTransform(raw_df)
-    transformed_df = transformer.transform()
-    
-    return transformed_df
-
-def daily_jobsdbsg():
-    scraper = JobsDBScraper(max_pages_override=1 ,dynamic_pages=True)
-    url_pattern = "https://sg.jobsdb.com/{role}-jobs?a=24h&p={page}"
-    raw = scraper.run(url_pattern=url_pattern)
-    raw_df = JobDataNormalizer().jobsdbsg(raw)
-    print(f"JobsDBSG: {len(raw_df)} jobs scraped")
-    transformer = JobsDBSGTransform(raw_df)
-    transformed_df = transformer.transform()
+    print(f"\n=== Scraping {config.name} ===")
+    # Sections only apply on the main thread, i.e. when sources run one at a time
+    with section(config.name), memory_stage(config.name):
+        raw_df = config.extract()
+        transformer = config.transform_class()(raw_df)
+        transformed_df = transformer.transform()
+    print(f"{config.name}: {len(transformed_df)} jobs scraped")
     return transformed_df
 
 def check_old_or_new(df: pd.DataFrame, table_name: str = r'"IT_jobs"."IT"') -> pd.DataFrame:
@@ -149,8 +43,12 @@ def check_old_or_new(df: pd.DataFrame, table_name: str = r'"IT_jobs"."IT"') -> p
     
     try:
         with engine.connect() as conn:
-            # Only select job_link column for efficiency
-            existing_df = pd.read_sql(f'SELECT job_link FROM {table_name}', conn)
+            # Only look up today's links; served by the job_link index
+            links = df['job_link'].dropna().astype(str).unique().tolist()
+            existing_df = pd.read_sql(
+                text(f'SELECT DISTINCT job_link FROM {table_name} WHERE job_link = ANY(:links)'),
+                conn, params={"links": links}
+            )
             existing_links = set(existing_df['job_link'].tolist())
             
             # Filter out existing jobs
@@ -183,25 +81,22 @@ def add_job_ids(df: pd.DataFrame) -> pd.DataFrame:
 
 def save_to_database(df: pd.DataFrame, table_name: str = "IT", schema: str = "IT_jobs"):
     """
-    Save the DataFrame to the database by appending to existing data.
+    Save the DataFrame to the managed (partitioned) table; rows already present are skipped.
     """
     if df.empty:
         print("No data to save to database.")
         return
     
     database_url = os.getenv("DATABASE_URL")
-    engine = create_engine(database_url)
     
     try:
-        # Use engine directly for auto-commit
-        df.to_sql(
-            table_name,
-            con=engine,
-            schema=schema,
-            if_exists='append',
-            index=False
-        )
-        print(f"Successfully saved {len(df)} new jobs to database.")
+        # Creates/migrates the table and its monthly partitions as needed,
+        # and folds the inserted rows into IT_jobs.IT_summary;
+        # bulk load goes through ADBC in Arrow mode (JOBS_ETL_ARROW=1)
+        inserted = insert_jobs(df, database_url, table=table_name, summarize=True)
+        print(f"Successfully saved {inserted} new jobs to database.")
+        # Run / page / position of every saved row, in the IT_jobs.etl_* side tables
+        record_lineage(df, database_url)
         
         # Log the job IDs that were added
         print("Sample of new job IDs added:")
@@ -211,54 +106,20 @@ def save_to_database(df: pd.DataFrame, table_name: str = "IT", schema: str = "IT
         print(f"Error saving to database: {e}")
         raise
 
-def main():
+def main(max_parallel=None):
     """
     Main function to run the daily job extraction, transformation, and loading processes.
     """
-    print(f"Starting daily job scraping process at {datetime.now()}")
+    print(f"Starting daily job scraping process at {datetime.now()} (run {RUN_ID})")
     
+    # Sources run longest-first in the [scheduler.daily] slots of sources.toml
+    results = run_scheduled(load_sources("daily").values(), daily_source, max_parallel=max_parallel)
     all_dfs = []
-    
-    # Extract and transform jobs from each source
-    try:
-        print("\n=== Scraping JobNetMM ===")
-        daily_jobnetmm_df = daily_jobnetmm()
-        print(f"JobNetMM: {len(daily_jobnetmm_df)} jobs scraped")
-        all_dfs.append(daily_jobnetmm_df)
-    except Exception as e:
-        print(f"Error scraping JobNetMM: {e}")
-
-    try:
-        print("\n=== Scraping JobsDB Singapore ===")
-        daily_jobsdbsg_df = daily_jobsdbsg()
-        print(f"JobsDB SG: {len(daily_jobsdbsg_df)} jobs scraped")
-        all_dfs.append(daily_jobsdbsg_df)
-    except Exception as e:
-        print(f"Error scraping JobsDB Singapore: {e}")
-    
-    try:
-        print("\n=== Scraping JobsDBTH ===")
-        daily_jobsdbth_df = daily_jobsdbth()
-        print(f"JobsDBTH: {len(daily_jobsdbth_df)} jobs scraped")
-        all_dfs.append(daily_jobsdbth_df)
-    except Exception as e:
-        print(f"Error scraping JobsDBTH: {e}")
-    
-    try:
-        print("\n=== Scraping FounditSG ===")
-        daily_founditsg_df = daily_founditsg()
-        print(f"FounditSG: {len(daily_founditsg_df)} jobs scraped")
-        all_dfs.append(daily_founditsg_df)
-    except Exception as e:
-        print(f"Error scraping FounditSG: {e}")
-    
-    try:
-        print("\n=== Scraping JobStreet Malaysia ===")
-        daily_jobstreetmalay_df = daily_jobstreetmalay()
-        print(f"JobStreet Malaysia: {len(daily_jobstreetmalay_df)} jobs scraped")
-        all_dfs.append(daily_jobstreetmalay_df)
-    except Exception as e:
-        print(f"Error scraping JobStreet Malaysia: {e}")
+    for name, result in results.items():
+        if isinstance(result, Exception):
+            print(f"Error scraping {name}: {result}")
+        else:
+            all_dfs.append(result)
     
     # Combine all DataFrames
     if all_dfs:
@@ -271,13 +132,13 @@ def main():
     
     return combined_df
 
-def run_daily_process():
+def run_daily_process(max_parallel=None):
     """
     Complete daily process: scrape, check duplicates, add IDs, and save to database.
     """
     try:
         # Step 1: Scrape all job sources
-        combined_df = main()
+        combined_df = main(max_parallel)
         
         if combined_df.empty:
             print("No jobs to process.")
@@ -287,17 +148,33 @@ def run_daily_process():
         print("\n=== Checking for New Jobs ===")
         fresh_df = check_old_or_new(combined_df)
         
+        # Step 3: Drop near-duplicates (same posting under another link or source)
+        print("\n=== Removing Near-Duplicates ===")
+        dedup_index = NearDuplicateIndex()
+        fresh_df = dedup_index.filter(fresh_df)
+        print(f"{len(fresh_df)} jobs left after near-duplicate check.")
+        
         if fresh_df.empty:
             print("Daily scraping completed. No new jobs to add.")
+            dedup_index.close()
             return
         
-        # Step 3: Add job IDs to new jobs
+        # Step 4: Add job IDs to new jobs
         print("\n=== Adding Job IDs ===")
         fresh_df_with_ids = add_job_ids(fresh_df)
         
-        # Step 4: Save to database
+        # Step 5: Canonical company/location IDs (fuzzy matching only for unseen values)
+        print("\n=== Canonicalizing Companies and Locations ===")
+        fresh_df_with_ids = canonicalize(fresh_df_with_ids, os.getenv("DATABASE_URL"))
+        
+        # Step 6: Save to database
         print("\n=== Saving to Database ===")
-        save_to_database(fresh_df_with_ids)
+        with memory_stage("load"):
+            save_to_database(fresh_df_with_ids)
+        
+        # Remember today's postings only once they are stored
+        dedup_index.register()
+        dedup_index.close()
         
         print(f"\n=== Daily Process Completed Successfully ===")
         print(f"Added {len(fresh_df_with_ids)} new jobs to the database.")
@@ -307,4 +184,11 @@ def run_daily_process():
         raise
 
 if __name__ == "__main__":
-    run_daily_process()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the run (one profile per source) into logs/profile/<run_id>/")
+    parser.add_argument("--max_parallel", type=int, default=None,
+                        help="Sources scraped at once (default: [scheduler.daily] in sources.toml)")
+    args = parser.parse_args()
+    with profiled("daily", enabled=args.profile):
+        run_daily_process(args.max_parallel)
\ No newline at end of file
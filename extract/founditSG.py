@@ -1,7 +1,8 @@
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode #To safely encode query parameters in the URL.
-import time  
-import pandas as pd
+from utils.rate_limiter import default_limiter
+from utils.job_record import JobRecord, join_list, records_to_frame
+from utils.memory import SpillBuffer
 
 #  Configure logger (custom filename: founditsg_YYYYMMDD_HHMMSS.log)
 from utils.logger import get_module_logger
@@ -9,7 +10,8 @@ logger = get_module_logger(__name__, group='extract')
 
 #1. Class Initialization
 class FounditScraper:
-    def __init__(self, base_params=None, headless=True):
+    def __init__(self, base_params=None, headless=True, rate_limiter=None, concurrency=4, max_start=600, page_size=None):
+        self.rate_limiter = rate_limiter or default_limiter
         self.headless = headless #headless: Reserved for future browser-based automation. Not used here, but shows potential for using Selenium or Puppeteer later.
         # to seem more like a real user.
         self.headers = {
@@ -18,9 +20,14 @@ class FounditScraper:
             "Referer": "https://www.foundit.sg/",
         }
 
-        #The main API endpoint    
+        #The main API endpoint
         self.base_endpoint = "https://www.foundit.sg/middleware/jobsearch"
         self.base_params = base_params.copy() if base_params else {}
+        if page_size:
+            self.base_params["limit"] = page_size
+        self.page_size = int(self.base_params.get("limit", 15))
+        self.concurrency = max(1, concurrency) # 1 = original sequential walk
+        self.max_start = max_start # Hard limit on the offset, for safety
 
 #2. Building the API URL
     def build_url(self, start):
@@ -33,93 +40,181 @@ class FounditScraper:
 
         return f"{self.base_endpoint}?{encoded}&{industry_params}"
 
-#3. Main Scraper Logic – run()
+#3. Fetching one offset window
+    def fetch_window(self, start):
+        """
+        Fetch the jobs at one offset. Returns (jobs, total); jobs is None on failure
+        and total is None when the response carries no paging metadata.
+        """
+        logger.info(" Fetching jobs at start=%s...", start)
+        try:
+            response = self.rate_limiter.get(self.build_url(start), headers=self.headers)
+        except Exception as e:
+            logger.error(" Request failed at start=%s: %s", start, e)
+            return None, None
+        if response.status_code != 200:
+            logger.error(" Failed to fetch jobs. Status code: %s", response.status_code)
+            return None, None
+
+        try:
+            data = response.json()
+        except ValueError as e:
+            logger.info(" Error parsing response: %s", e)
+            return None, None
+
+        search_response = data.get("jobSearchResponse", {}) or {}
+        return search_response.get("data", []) or [], self._find_total(search_response)
+
+    def _find_total(self, search_response):
+        # The total job count lives in the response metadata; probe the known spots
+        meta = search_response.get("meta", {}) or {}
+        candidates = [
+            (meta.get("paging", {}) or {}).get("total"),
+            meta.get("totalCount"),
+            meta.get("total"),
+            search_response.get("totalCount"),
+            search_response.get("total"),
+        ]
+        for value in candidates:
+            try:
+                if value is not None:
+                    return int(value)
+            except (TypeError, ValueError):
+                continue
+        return None
+
+    def _to_record(self, job, page_ref=None, position=None):
+        # Project to the fields we keep; list-valued fields are flattened here
+        return JobRecord(
+            title=job.get("title"),
+            company=job.get("companyName"),
+            location=join_list(job.get("locations")),
+            salary=job.get("salary"),
+            job_type=join_list(job.get("employmentTypes")),
+            date_posted=job.get("updatedAt"),
+            job_link=job.get("seoJdUrl"),
+            country="SG",
+            source="founditsg",
+            category=join_list(job.get("roles")),
+            page_ref=page_ref,
+            position=position,
+        )
+
+    def _filter_new(self, jobs, seen_job_ids, start):
+        # Filter duplicates; kept jobs are tagged with the window's URL and their index in it
+        page_ref = self.build_url(start)
+        new_jobs = []
+        for position, job in enumerate(jobs):
+            job_id = str(job.get("jobId") or job.get("id"))
+            if job_id not in seen_job_ids:
+                seen_job_ids.add(job_id)
+                new_jobs.append(self._to_record(job, page_ref, position))
+        return new_jobs
+
+#4. Main Scraper Logic – run()
     def extract_jobs(self):
-        start = 0
-        all_jobs = []
         seen_job_ids = set() # to avoid duplicates
-        max_pages_without_new_jobs = 3  # tolerate 3 consecutive pages without new jobs to  prevent infinite loops
-        pages_without_new_jobs = 0
+        if self.concurrency > 1:
+            all_jobs = self._extract_concurrent(seen_job_ids)
+        else:
+            all_jobs = self._extract_sequential(seen_job_ids)
 
-        
-        desired_fields = [
+        logger.info(f" Rate limiter metrics: {self.rate_limiter.metrics()}")
 
-            "title", "companyName", "locations", "salary",
-            "employmentTypes", "updatedAt", "seoJdUrl", 'roles'
+        if all_jobs:
+            logger.info(f" Total jobs scraped: {len(all_jobs)}")
+            logger.info(f" Total unique jobs scraped: {len(seen_job_ids)}")
 
-            # 'exp', "qualifications","jobId"
+            # self.save_to_json(all_jobs)
 
-        ]
+            foundit_df = all_jobs.to_frame()
+            return foundit_df
 
-        while True:
-            logger.info(f" Fetching jobs at start={start}...")
+        else:
+            logger.info(" No jobs were scraped.")
+            return records_to_frame([])  #  Return empty DataFrame
 
-            url = self.build_url(start)
-            
-            # Parse JSON safely.
-            response = requests.get(url, headers=self.headers)
-            if response.status_code != 200:
-                logger.error(f" Failed to fetch jobs. Status code: {response.status_code}")
+    def _extract_sequential(self, seen_job_ids):
+        start = 0
+        all_jobs = SpillBuffer('founditsg')  # Spills to disk past ETL_MEMORY_BUDGET_MB
+        max_pages_without_new_jobs = 3  # tolerate 3 consecutive pages without new jobs to  prevent infinite loops
+        pages_without_new_jobs = 0
 
+        while True:
+            jobs, _ = self.fetch_window(start)
+            if not jobs:
+                logger.info(" No job data returned. Ending.")
                 break
 
-            try:
-                data = response.json()
-                # Extract jobs
-                jobs = data.get("jobSearchResponse", {}).get("data", [])
+            new_jobs = self._filter_new(jobs, seen_job_ids, start)
 
-                if not jobs:
-                    logger.info(" No job data returned. Ending.")
-                    break
-                
-
-                # Filter duplicates
-                new_jobs = []
-                for job in jobs:
-                    job_id = str(job.get("jobId") or job.get("id"))
-                    if job_id not in seen_job_ids:
-                        seen_job_ids.add(job_id)
-                        
-                        filtered_job = {field: job.get(field) for field in desired_fields}
-
-                        new_jobs.append(filtered_job)
-
-                #Loop exit conditions
-                if not new_jobs:
-                    pages_without_new_jobs += 1
-                    logger.info(f" No new unique jobs found on this page. Skipped pages so far: {pages_without_new_jobs}")
-                    if pages_without_new_jobs >= max_pages_without_new_jobs:
-                        logger.info(" Too many skipped pages. Assuming end of data. Ending.")
-                        break
-                else:
-                    pages_without_new_jobs = 0  # reset if new jobs found
-
-                all_jobs.extend(new_jobs)
-                logger.info(f" Total unique jobs collected so far: {len(all_jobs)}")
-                time.sleep(1) #Sleep between requests
-                start += 15
-
-                if start >= 600: #Hard limit to break early for safety
-                    logger.info(" Reached start=600. Stopping to avoid scraping too much.")
+            #Loop exit conditions
+            if not new_jobs:
+                pages_without_new_jobs += 1
+                logger.info(" No new unique jobs found on this page. Skipped pages so far: %s", pages_without_new_jobs)
+                if pages_without_new_jobs >= max_pages_without_new_jobs:
+                    logger.info(" Too many skipped pages. Assuming end of data. Ending.")
                     break
+            else:
+                pages_without_new_jobs = 0  # reset if new jobs found
 
-            except Exception as e:
-                logger.info(f" Error parsing response: {e}")
-                break
-
-
-
-        if all_jobs:
+            all_jobs.extend(new_jobs)
+            logger.info(" Total unique jobs collected so far: %s", len(all_jobs))
+            start += self.page_size
 
-            unique_job_ids = {str(job.get("jobId") or job.get("id")) for job in all_jobs}
-            logger.info(f" Total jobs scraped: {len(all_jobs)}")
-            logger.info(f" Total unique jobs scraped: {len(unique_job_ids)}")
-            
-            # self.save_to_json(all_jobs)
+            if start >= self.max_start: #Hard limit to break early for safety
+                logger.info(f" Reached start={self.max_start}. Stopping to avoid scraping too much.")
+                break
 
-            foundit_df = pd.DataFrame(all_jobs)
-            return foundit_df
+        return all_jobs
+
+    def _extract_concurrent(self, seen_job_ids):
+        """
+        Fetch the first window to learn the real total, then fetch the remaining
+        offset windows in parallel (bounded by `concurrency`) and merge them in order.
+        A window that fails is fetched once more; windows that fail twice are logged.
+        """
+        all_jobs = SpillBuffer('founditsg')  # Spills to disk past ETL_MEMORY_BUDGET_MB
+        jobs, total = self.fetch_window(0)
+        if not jobs:
+            logger.info(" No job data returned. Ending.")
+            return all_jobs
+        all_jobs.extend(self._filter_new(jobs, seen_job_ids, 0))
+
+        # The API may cap `limit` silently; step by what it actually returned. Without a
+        # total, a short first window may also just be the end of the data, which costs
+        # one empty batch at most.
+        step = self.page_size
+        if len(jobs) < step and (total is None or len(jobs) < total):
+            logger.info(f" API returned {len(jobs)} jobs for limit={step}; using that as the window size.")
+            step = len(jobs)
+
+        last_start = min(total, self.max_start) if total is not None else self.max_start
+        offsets = list(range(step, last_start, step))
+        logger.info(f" Total reported: {total}. Fetching {len(offsets)} more windows with {self.concurrency} workers.")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            # Without a reported total, go batch by batch and stop at the first all-empty batch
+            batch_size = len(offsets) if total is not None else self.concurrency
+            dropped = []
+            for i in range(0, len(offsets), batch_size or 1):
+                batch = offsets[i:i + batch_size]
+                results = dict(zip(batch, executor.map(self.fetch_window, batch)))
+                failed = [start for start, (jobs, _) in results.items() if jobs is None]
+                if failed:
+                    logger.warning(" Retrying %s failed windows: starts %s", len(failed), failed)
+                    results.update(zip(failed, executor.map(self.fetch_window, failed)))
+                for start in batch:
+                    jobs, _ = results[start]
+                    if jobs is None:
+                        dropped.append(start)
+                        continue
+                    all_jobs.extend(self._filter_new(jobs, seen_job_ids, start))
+                logger.info(" Total unique jobs collected so far: %s", len(all_jobs))
+                if total is None and not any(jobs for jobs, _ in results.values()):
+                    logger.info(" Empty batch. Assuming end of data. Ending.")
+                    break
 
-        else:
-            logger.info(" No jobs were scraped.")
-            return pd.DataFrame()  #  Return empty DataFrame
\ No newline at end of file
+        if dropped:
+            logger.warning(" Dropped %s windows that failed twice: starts %s", len(dropped), dropped)
+        return all_jobs
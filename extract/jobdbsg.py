@@ -4,23 +4,42 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import NoSuchElementException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
-import time
-import pandas as pd
 import re
-import random
+from utils.page_wait import PolitePageWait
+from utils.job_record import JobRecord
+from utils.memory import SpillBuffer
 
 # Setup logging
 from utils.logger import get_module_logger
 logger = get_module_logger(__name__, group='extract')
 
 
+## Default role searches (sources.toml sets them for the registry runs)
+ROLES = [
+    "Software-Developer",
+    "Web-Developer",
+    "Data-Scientist",
+    "Data-Analyst",
+    "AI-Engineer",
+    "Machine-Learning-Engineer",
+    "DevOps-Engineer",
+    "Cloud-Engineer",
+    "Cybersecurity"
+]
+
+
 class JobsDBScraper:
-    def __init__(self, max_pages_override=None, dynamic_pages=False, headless=True):
+    def __init__(self, max_pages_override=None, dynamic_pages=False, headless=True,
+                 wait_timeout=10, min_delay=1.0, max_delay=4.0):
         self.max_pages_override = max_pages_override
         self.dynamic_pages = dynamic_pages
         self.headless = headless
+        self.wait_timeout = wait_timeout
+        self.min_delay = min_delay
+        self.max_delay = max_delay
         self.driver = None
-        self.jobs = []
+        self.page_wait = None
+        self.jobs = SpillBuffer('jobsdbsg')  # Spills to disk past ETL_MEMORY_BUDGET_MB
 
     def start_driver(self):
         print("Starting WebDriver...")
@@ -33,6 +52,8 @@ class JobsDBScraper:
 
         service = Service(ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=options)
+        self.page_wait = PolitePageWait(self.driver, timeout=self.wait_timeout,
+                                        min_delay=self.min_delay, max_delay=self.max_delay)
 
     def get_url_for_role(self, role, page, url_pattern):
         return url_pattern.format(role=role, page=page)
@@ -51,18 +72,8 @@ class JobsDBScraper:
         
         return 1
 
-    def extract_jobs(self, url_pattern):
-        roles = [
-            "Software-Developer",
-            "Web-Developer",            
-            "Data-Scientist",
-            "Data-Analyst",
-            "AI-Engineer",
-            "Machine-Learning-Engineer",
-            "DevOps-Engineer",
-            "Cloud-Engineer",
-            "Cybersecurity"
-        ]
+    def extract_jobs(self, url_pattern, roles=None):
+        roles = roles or ROLES
 
         for role in roles:
             print(f"Role {role}")
@@ -76,9 +87,10 @@ class JobsDBScraper:
             while page <= max_pages:
                 try:
                     url = self.get_url_for_role(role, page, url_pattern)
-                    logger.info(f"Scraping role: {role}, page: {page}, URL: {url}")
+                    logger.info("Scraping role: %s, page: %s, URL: %s", role, page, url)
+                    self.page_wait.pace()  # Politeness delay, counted from the previous request
                     self.driver.get(url)
-                    time.sleep(random.uniform(1, 4))  # Random sleep to avoid being blocked
+                    job_cards = self.page_wait.until_present(By.CSS_SELECTOR, "div.job-card")
 
                     if page == 1 and self.dynamic_pages:
                         dynamic_max_pages = self.get_max_pages(role)
@@ -88,12 +100,11 @@ class JobsDBScraper:
                             max_pages = dynamic_max_pages
                         logger.info(f"Dynamic max pages for {role}: {max_pages}")
 
-                    job_cards = self.driver.find_elements(By.CSS_SELECTOR, "div.job-card")
                     if not job_cards:
-                        logger.info(f"No jobs found for {role} on page {page}")
+                        logger.info("No jobs found for %s on page %s", role, page)
                         break
 
-                    for card in job_cards:
+                    for position, card in enumerate(job_cards):
                         elements = card.find_elements(By.CSS_SELECTOR, "h2.job-title")
                         title = elements[0].text.strip() if elements else ""
                         
@@ -130,36 +141,39 @@ class JobsDBScraper:
                             elif '-work-arrangement-badge' in class_name:
                                 work_arrangements.append(content)
 
-                        self.jobs.append({
-                            "Role": role.replace("-", " "),
-                            "Title": title,
-                            "Category": role,
-                            "Company": company,
-                            "Location": location,
-                            "Salary": salary,
-                            "Job_Type": job_type,
-                            "Work_Arrangement": ', '.join(work_arrangements),
-                            "Job_Link": link,
-                            "Date_Posted": date_posted
-                        })
+                        self.jobs.append(JobRecord(
+                            title=title,
+                            company=company,
+                            location=location,
+                            salary=salary,
+                            job_type=job_type,
+                            work_arrangement=', '.join(work_arrangements),
+                            date_posted=date_posted,
+                            job_link=link,
+                            country='SG',
+                            source='jobsdbsg',
+                            category=role,
+                            page_ref=url,
+                            position=position
+                        ))
                     page += 1
 
                 except NoSuchElementException as e:
-                    logger.warning(f"Missing element in card for {role} on page {page}: {e}")
+                    logger.warning("Missing element in card for %s on page %s: %s", role, page, e)
                     continue
                 
                 except WebDriverException as e:
-                    logger.error(f"WebDriver error while scraping {role} on page {page}: {e}")
+                    logger.error("WebDriver error while scraping %s on page %s: %s", role, page, e)
                     break
 
-    def run(self, url_pattern):
+    def run(self, url_pattern, roles=None):
         logger.info("Starting scraping process...")
         self.start_driver()
         try:
-            self.extract_jobs(url_pattern)
+            self.extract_jobs(url_pattern, roles)
         finally:
             self.driver.quit()
             logger.info("WebDriver closed.")
 
         logger.info(f"Scraping completed. Total jobs collected: {len(self.jobs)}")
-        return pd.DataFrame(self.jobs)
\ No newline at end of file
+        return self.jobs.to_frame()
\ No newline at end of file
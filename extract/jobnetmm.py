@@ -6,9 +6,14 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, NoSuchElementException
+from bs4 import BeautifulSoup
 from datetime import datetime
-import time
-import pandas as pd
+from urllib.parse import urljoin
+import requests
+from utils.page_wait import PolitePageWait
+from utils.rate_limiter import default_limiter
+from utils.job_record import JobRecord
+from utils.memory import SpillBuffer
 
 ## Set up logging
 from utils.logger import get_module_logger
@@ -16,13 +21,16 @@ logger = get_module_logger(__name__, group='extract')
 
 ## Class for extracting jobs
 class JobNetScraper:
-    def __init__(self, email:str, password:str, headless:bool=True):
+    def __init__(self, email:str, password:str, headless:bool=True, min_delay:float=1.0, max_delay:float=2.0):
         self.email = email
         self.password = password
         self.headless = headless
+        self.min_delay = min_delay
+        self.max_delay = max_delay
         self.driver = None
         self.wait = None
-        self.jobs = []
+        self.page_wait = None
+        self.jobs = SpillBuffer('jobnetmm')  # Spills to disk past ETL_MEMORY_BUDGET_MB
 
     def start_driver(self):
         options = Options()
@@ -34,6 +42,7 @@ class JobNetScraper:
         service = Service(ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=options)
         self.wait = WebDriverWait(self.driver, 18)
+        self.page_wait = PolitePageWait(self.driver, timeout=18, min_delay=self.min_delay, max_delay=self.max_delay)
 
     def login(self):
         self.driver.get("https://www.jobnet.com.mm/login")
@@ -51,7 +60,9 @@ class JobNetScraper:
         
     def scrape_jobs(self, job_function:int, location:int=0):
         try:
-            self.driver.get(f"https://www.jobnet.com.mm/jobs?keyword=&jobfunction={job_function}&location")
+            self.page_wait.pace()
+            jobs_url = f"https://www.jobnet.com.mm/jobs?keyword=&jobfunction={job_function}&location"
+            self.driver.get(jobs_url)
             logger.info("Redirected to jobs page")
         except Exception as e:
             logger.error(f"Error navigating to jobs page: {e}")
@@ -64,8 +75,10 @@ class JobNetScraper:
             while True:
                 self.wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, "serp-item")))
                 job_cards = self.driver.find_elements(By.CLASS_NAME, "serp-item")
+                # Later pages are __doPostBack calls on the same URL; record the page number
+                page_ref = f"{jobs_url} postback page={page}"
 
-                for job in job_cards:
+                for position, job in enumerate(job_cards):
                     try:
                         headings = job.find_elements(By.CLASS_NAME, "search__job-heading")
                         title = ""
@@ -108,20 +121,24 @@ class JobNetScraper:
                         job_link = job_link_element.get_attribute("href") if job_link_element else None
 
                         # Append job data to the list
-                        self.jobs.append({
-                            "Title": title,
-                            "Company": company,
-                            "Location": location,
-                            'Salary': salary,
-                            "Date_Posted": date,
-                            "Job_Link": job_link
-                        })
+                        self.jobs.append(JobRecord(
+                            title=title,
+                            company=company,
+                            location=location,
+                            salary=salary,
+                            date_posted=date,
+                            job_link=job_link,
+                            country='MM',
+                            source='jobnetmm',
+                            page_ref=page_ref,
+                            position=position
+                        ))
 
                     except Exception as e:
-                        logger.warning(f"Error scraping on page {page}: {e}")
+                        logger.warning("Error scraping on page %s: %s", page, e)
                         continue
                 
-                logger.info(f"Page {page}: Scraped. {len(self.jobs)} jobs.")
+                logger.info("Page %s: Scraped. %s jobs.", page, len(self.jobs))
 
                 ## Go to next page
                 try:
@@ -139,12 +156,13 @@ class JobNetScraper:
                     page += 1
 
                     # Use execute cause button is javaScript generated
+                    self.page_wait.pace()
                     self.driver.execute_script("__doPostBack('ctl00$BodyPlaceHolder$pagerControl','{}')".format(page))
-                    time.sleep(2) # Wait for the page to load
 
+                    # Wait for the old cards to detach; the next loop waits for the new ones
                     try:
-                        self.wait.until(EC.staleness_of(job_cards[0]))
-                    except (TimeoutException, StaleElementReferenceException):
+                        self.page_wait.until_stale(job_cards[0])
+                    except StaleElementReferenceException:
                         pass
                 except Exception as e:
                     logger.error(f"Error navigating to next page: {e}")
@@ -161,4 +179,180 @@ class JobNetScraper:
             self.driver.quit()
             logger.info("Driver closed.")
         logger.info(f"Total jobs scraped: {len(self.jobs)}")
-        return pd.DataFrame(self.jobs)
\ No newline at end of file
+        return self.jobs.to_frame()
+
+
+## HTTP-only scraper replaying the ASP.NET WebForms postbacks
+class JobNetHttpScraper:
+    BASE_URL = "https://www.jobnet.com.mm"
+    PAGER_TARGET = "ctl00$BodyPlaceHolder$pagerControl"
+
+    def __init__(self, email:str, password:str, timeout:int=30, max_pages:int=200, rate_limiter=None):
+        self.rate_limiter = rate_limiter or default_limiter
+        self.email = email
+        self.password = password
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0",
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        self.jobs = SpillBuffer('jobnetmm')  # Spills to disk past ETL_MEMORY_BUDGET_MB
+
+    def _get_form_state(self, soup):
+        """
+        Collect every hidden input of the WebForms form (__VIEWSTATE, __EVENTVALIDATION, ...).
+        """
+        form = soup.find("form") or soup
+        return {
+            field.get("name"): field.get("value", "")
+            for field in form.find_all("input", type="hidden")
+            if field.get("name")
+        }
+
+    def _post(self, url, data):
+        response = self.rate_limiter.post(url, session=self.session, data=data, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def login(self):
+        login_url = f"{self.BASE_URL}/login"
+        response = self.rate_limiter.get(login_url, session=self.session, timeout=self.timeout)
+        response.raise_for_status()
+
+        form_state = self._get_form_state(BeautifulSoup(response.text, "html.parser"))
+        form_state.update({
+            "ctl00$BodyPlaceHolder$txtEmail": self.email,
+            "ctl00$BodyPlaceHolder$txtLoginPassword": self.password,
+            "ctl00$BodyPlaceHolder$btnSignIn": "Sign In",
+        })
+        response = self._post(login_url, form_state)
+
+        if "dashboard" not in response.url:
+            logger.error("Login failed! Check credentials/captcha.")
+            raise Exception("Login failed!")
+        logger.info("Login Successful! Dashboard loaded.")
+
+    def _parse_job_cards(self, soup, page, page_ref=None):
+        job_cards = soup.select(".serp-item")
+        for position, job in enumerate(job_cards):
+            try:
+                headings = job.select(".search__job-heading")
+                title = ""
+                if len(headings) >= 1:
+                    primary_anchor = headings[0].find("a")
+                    primary_title = primary_anchor.get_text(strip=True) if primary_anchor else ""
+                    title = primary_title if primary_title else logger.warning("Title not found.")
+
+                if len(headings) >= 2:
+                    secondary_anchor = headings[1].find("a")
+                    secondary_title = secondary_anchor.get_text(strip=True).strip("()") if secondary_anchor else ""
+                    if secondary_title:
+                        title += f" ({secondary_title})"
+
+                company_element = job.select_one("a.ClickTrack-EmpProfile")
+                if company_element:
+                    company = company_element.get_text(strip=True)
+                else:
+                    logger.warning("Company name not found.")
+                    company = None
+
+                location_element = job.select_one("p.search__job-location span")
+                location = location_element.get_text(strip=True) if location_element else None
+
+                salary_element = job.select_one("a.search__job-sign.ClickTrack-JobDetail span")
+                if salary_element:
+                    salary = salary_element.get_text(strip=True)
+                else:
+                    salary = None
+                    logger.warning("Salary not found.")
+
+                date_element = job.select_one("p.search__job-posted u")
+                date = date_element.get_text(strip=True) if date_element else None
+
+                job_link_element = job.select_one("div.c-btn__wrapper a.c-btn")
+                job_link = urljoin(self.BASE_URL, job_link_element.get("href")) if job_link_element else None
+
+                self.jobs.append(JobRecord(
+                    title=title,
+                    company=company,
+                    location=location,
+                    salary=salary,
+                    date_posted=date,
+                    job_link=job_link,
+                    country='MM',
+                    source='jobnetmm',
+                    page_ref=page_ref,
+                    position=position
+                ))
+
+            except Exception as e:
+                logger.warning("Error scraping on page %s: %s", page, e)
+                continue
+
+        return len(job_cards)
+
+    def _has_next_page(self, soup):
+        for button in soup.select("a.search__action-btn"):
+            if button.get_text(strip=True) == ">" and not button.has_attr("disabled"):
+                return True
+        return False
+
+    def scrape_jobs(self, job_function:int, location:int=0):
+        jobs_url = f"{self.BASE_URL}/jobs?keyword=&jobfunction={job_function}&location"
+        response = self.rate_limiter.get(jobs_url, session=self.session, timeout=self.timeout)
+        response.raise_for_status()
+        logger.info("Redirected to jobs page")
+
+        page = 1
+        while True:
+            soup = BeautifulSoup(response.text, "html.parser")
+            # Later pages are postbacks to the same URL; record the page number
+            if not self._parse_job_cards(soup, page, f"{jobs_url} postback page={page}"):
+                logger.info("No job cards found on page %s.", page)
+                break
+            logger.info("Page %s: Scraped. %s jobs.", page, len(self.jobs))
+
+            if not self._has_next_page(soup) or page >= self.max_pages:
+                logger.info("No more pages to scrape.")
+                break
+
+            page += 1
+
+            # Replay the pager's __doPostBack with the current form state
+            form_state = self._get_form_state(soup)
+            form_state.update({
+                "__EVENTTARGET": self.PAGER_TARGET,
+                "__EVENTARGUMENT": str(page),
+            })
+            response = self._post(response.url, form_state)
+
+    def get_jobs(self, job_function:int):
+        try:
+            self.login()
+            self.scrape_jobs(job_function)
+        finally:
+            self.session.close()
+        logger.info(f"Rate limiter metrics: {self.rate_limiter.metrics()}")
+        logger.info(f"Total jobs scraped: {len(self.jobs)}")
+        return self.jobs.to_frame()
+
+
+def get_jobnet_jobs(email:str, password:str, job_function:int, headless:bool=True, max_pages:int=200,
+                    rate_limiter=None, min_delay:float=1.0, max_delay:float=2.0):
+    """
+    Scrape JobNet over plain HTTP, falling back to the Selenium scraper if the
+    postback replay fails (e.g. the site starts requiring JavaScript).
+    """
+    try:
+        df = JobNetHttpScraper(email, password, max_pages=max_pages,
+                               rate_limiter=rate_limiter).get_jobs(job_function=job_function)
+        if not df.empty:
+            return df
+        logger.warning("HTTP scraper returned no jobs. Falling back to Selenium.")
+    except Exception as e:
+        logger.warning(f"HTTP scraper failed: {e}. Falling back to Selenium.")
+    return JobNetScraper(email, password, headless=headless, min_delay=min_delay,
+                         max_delay=max_delay).get_jobs(job_function=job_function)
\ No newline at end of file
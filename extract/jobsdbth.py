@@ -1,8 +1,8 @@
 import requests
-import pandas as pd
-import time
-import random
 from datetime import datetime
+from utils.rate_limiter import default_limiter
+from utils.memory import SpillBuffer
+from extract.seek_fanout import seek_record
 
 
 ## Set up logging
@@ -10,7 +10,8 @@ from utils.logger import get_module_logger
 logger = get_module_logger(__name__, group='extract')
 
 class JobsDBThScraper:
-    def __init__(self, classification_id, base_params, page_size=100):
+    def __init__(self, classification_id, base_params, page_size=100, rate_limiter=None):
+        self.rate_limiter = rate_limiter or default_limiter
         self.url = "https://th.jobsdb.com/api/jobsearch/v5/search"
         self.params = base_params
         # Default headers for the request
@@ -26,48 +27,34 @@ class JobsDBThScraper:
         self.params['pageSize'] = self.page_size
 
     def scrape_jobs(self):
-        all_jobs = []
+        all_jobs = SpillBuffer('jobsdbth')  # Spills to disk past ETL_MEMORY_BUDGET_MB
         page = 1
 
         while True:
             self.params['page'] = page
 
             try:
-                response = requests.get(self.url, headers=self.headers, params=self.params)
+                response = self.rate_limiter.get(self.url, headers=self.headers, params=self.params)
+                response.raise_for_status()
                 data = response.json()
                 jobs = data.get('data', [])
                 total_jobs = data.get('totalCount', 0)
-                logger.info(f"Total jobs found: {total_jobs}")
+                logger.info("Total jobs found: %s", total_jobs)
                 
                 if not jobs:
-                    logger.info(f"No more jobs found on page {page}. Ending scrape.")
+                    logger.info("No more jobs found on page %s. Ending scrape.", page)
                     break
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request failed on page {page}: {e}")
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.error("Request failed on page %s: %s", page, e)
                 break
 
-            for job in jobs:
-                data_list = job.get('workArrangements', {}).get('data', [])
-                if data_list and isinstance(data_list, list) and len(data_list) > 0:
-                    work_arrangement = data_list[0].get('label', {}).get('text', '')
-                else:
-                    work_arrangement = ''
-                job_data = {
-                    'job_title': job.get('title'),
-                    'company': job.get('companyName', ''),
-                    'location': job.get('locations', [{}])[0].get('label', ''),
-                    'country_code': job.get('locations', [{}])[0].get('countryCode', ''),
-                    'salary': job.get('salaryLabel', ''),
-                    'job_type': ', '.join(map(str, job.get('workTypes', []))),
-                    'work_arrangement': work_arrangement,
-                    'date_posted': job.get('listingDate'),
-                    'job_link': f"https://th.jobsdb.com/job/{job.get('id')}"
-                }
-                all_jobs.append(job_data)
-            logger.info(f"Scraped job from page {page}: {len(all_jobs)} jobs collected.")
+            page_ref = response.url  # Exact request, for lineage/replay
+            all_jobs.extend(seek_record(job, "th.jobsdb.com", 'jobsdbth', page_ref, position)
+                            for position, job in enumerate(jobs))
+            logger.info("Scraped job from page %s: %s jobs collected.", page, len(all_jobs))
             page += 1
-            time.sleep(random.uniform(1, 4)) # Randon sleep time between requests
 
+        logger.info(f"Rate limiter metrics: {self.rate_limiter.metrics()}")
         logger.info(f"Scraping completed. Total jobs scraped: {len(all_jobs)}")
-        return pd.DataFrame(all_jobs)
\ No newline at end of file
+        return all_jobs.to_frame()
\ No newline at end of file
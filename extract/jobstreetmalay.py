@@ -1,8 +1,8 @@
 import requests
-import pandas as pd
-import time
-import random
 from datetime import datetime
+from utils.rate_limiter import default_limiter
+from utils.memory import SpillBuffer
+from extract.seek_fanout import seek_record
 
 # Ensure the logs directory exists
 
@@ -11,7 +11,8 @@ from utils.logger import get_module_logger
 logger = get_module_logger(__name__, group='extract')
 
 class JobStreetMalaysia:
-    def __init__(self, classification_id: str, base_params, page_size: int = 100):
+    def __init__(self, classification_id: str, base_params, page_size: int = 100, rate_limiter=None):
+        self.rate_limiter = rate_limiter or default_limiter
         self.base_url = "https://my.jobstreet.com/api/jobsearch/v5/search"
         self.headers = {
             "User-Agent": "Mozilla/5.0",
@@ -20,30 +21,34 @@ class JobStreetMalaysia:
             "Accept-Language": "en-US,en;q=0.9",
             "Origin": "https://my.jobstreet.com"
         }
-        self.classification_id = '6281'  # IT Jobs
+        self.classification_id = classification_id
         self.page_size = page_size
         self.base_params = base_params
         self.base_params['classification'] = self.classification_id
         self.base_params['pageSize'] = self.page_size
 
+    def _to_record(self, job, page_ref=None, position=None):
+        # Project the raw API job to the fields we keep, so the payload can be dropped right away
+        return seek_record(job, "my.jobstreet.com", 'jobstreetmalay', page_ref, position)
+
     def fetch_jobs(self):
-        all_jobs = []
+        all_jobs = SpillBuffer('jobstreetmalay')  # Spills to disk past ETL_MEMORY_BUDGET_MB
         page = 1
 
         while True:
             params = self.base_params.copy()
             params['page'] = page
             try:
-                response = requests.get(self.base_url, headers=self.headers, params=params)
+                response = self.rate_limiter.get(self.base_url, headers=self.headers, params=params)
                 response.raise_for_status()
             except requests.exceptions.RequestException as e:
-                logger.error(f"Failed to fetch page {page}: {e}")
+                logger.error("Failed to fetch page %s: %s", page, e)
                 break
 
             try:
                 data = response.json()
             except ValueError as e:
-                logger.error(f"Failed to parse JSON on page {page}: {e}")
+                logger.error("Failed to parse JSON on page %s: %s", page, e)
                 break
 
             jobs = data.get("data", [])
@@ -52,32 +57,12 @@ class JobStreetMalaysia:
                 logger.info("No more jobs found.")
                 break
 
-            all_jobs.extend(jobs)
-            logger.info(f"Fetched page {page} with {len(jobs)} jobs.")
+            page_ref = response.url  # Exact request, for lineage/replay
+            all_jobs.extend(self._to_record(job, page_ref, position) for position, job in enumerate(jobs))
+            logger.info("Fetched page %s with %s jobs.", page, len(jobs))
             page += 1
-            time.sleep(random.uniform(1, 3))
-
-        def extract_work_arrangement(job):
-            try:
-                return job.get('workArrangements', {}).get('data', [{}])[0].get('label', {}).get('text', '')
-            except Exception:
-                return ''
-
 
-        df = pd.DataFrame([
-            {
-                    'job_title': job.get('title'),
-                    'company': job.get('companyName', ''),
-                    'location': job.get('locations', [{}])[0].get('label', ''),
-                    'country_code': job.get('locations', [{}])[0].get('countryCode', ''),
-                    'salary': job.get('salaryLabel', ''),
-                    'job_type': ', '.join(map(str, job.get('workTypes', []))),
-                    'work_arrangement': extract_work_arrangement(job),
-                    'date_posted': job.get('listingDate'),
-                    'job_link': f"https://my.jobstreet.com/job/{job.get('id')}"
-                }
-            for job in all_jobs
-        ])
+        logger.info(f"Rate limiter metrics: {self.rate_limiter.metrics()}")
         logger.info(f"Scraping completed. Total jobs scraped: {len(all_jobs)}")
 
-        return df
+        return all_jobs.to_frame()
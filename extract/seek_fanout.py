@@ -0,0 +1,181 @@
+"""
+Concurrent crawler for the SEEK-backed job boards (JobsDB, JobStreet), which
+all serve the same /api/jobsearch/v5/search API.
+
+A crawl is a list of (site, classification) targets. The first page of every
+target is requested at once; its totalCount gives the remaining pages, which
+go into the same worker pool. A first page that still fails after the rate
+limiter's own retries is resubmitted up to `seed_retries` times; targets
+whose first page never arrives are logged and kept in `failed_targets`,
+since none of their pages can be requested. All workers share one requests.Session (a
+keep-alive pool per host) and one rate limiter, so targets on the same host
+are throttled together. stream() yields each page's records as it arrives;
+extract_jobs() collects them into one frame per site, keeping a job listed
+under several classifications once.
+
+    fanout = SeekFanout([("jobsdbth", "6281"), ("jobsdbth", "6304"), ("jobstreetmalay", "6281")])
+    frames = fanout.extract_jobs()      # {"jobsdbth": df, "jobstreetmalay": df}
+"""
+import math
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.job_record import JobRecord, join_list
+from utils.memory import SpillBuffer
+from utils.rate_limiter import default_limiter
+
+from utils.logger import get_module_logger
+logger = get_module_logger(__name__, group='extract')
+
+SEARCH_PATH = "/api/jobsearch/v5/search"
+
+## site -> (host, siteKey, locale); the site name is the `source` of its records
+SEEK_SITES = {
+    "jobsdbth": ("th.jobsdb.com", "TH-Main", "en-TH"),
+    "jobsdbhk": ("hk.jobsdb.com", "HK-Main", "en-HK"),
+    "jobstreetmalay": ("my.jobstreet.com", "MY-Main", "en-MY"),
+    "jobstreetsg": ("sg.jobstreet.com", "SG-Main", "en-SG"),
+    "jobstreetph": ("ph.jobstreet.com", "PH-Main", "en-PH"),
+    "jobstreetid": ("id.jobstreet.com", "ID-Main", "en-ID"),
+}
+
+
+def _work_arrangement(job):
+    data = (job.get('workArrangements') or {}).get('data') or [{}]
+    return ((data[0] or {}).get('label') or {}).get('text', '')
+
+
+def seek_record(job, host, source, page_ref=None, position=None):
+    """
+    Project one job of a search response to the fields we keep.
+    """
+    location = (job.get('locations') or [{}])[0]
+    return JobRecord(
+        title=job.get('title'),
+        company=job.get('companyName', ''),
+        location=location.get('label', ''),
+        salary=job.get('salaryLabel', ''),
+        job_type=join_list(job.get('workTypes', [])),
+        work_arrangement=_work_arrangement(job),
+        date_posted=job.get('listingDate'),
+        job_link=f"https://{host}/job/{job.get('id')}",
+        country=location.get('countryCode', ''),
+        source=source,
+        page_ref=page_ref,
+        position=position
+    )
+
+
+class SeekFanout:
+    def __init__(self, targets, base_params=None, page_size=100, rate_limiter=None, concurrency=4, max_pages=None,
+                 seed_retries=2):
+        unknown = {site for site, _ in targets} - set(SEEK_SITES)
+        if unknown:
+            raise ValueError(f"Unknown SEEK sites: {', '.join(sorted(unknown))}")
+        self.targets = [(site, str(classification)) for site, classification in targets]
+        self.base_params = dict(base_params or {})
+        self.page_size = page_size
+        self.rate_limiter = rate_limiter or default_limiter
+        self.concurrency = max(1, concurrency)
+        self.max_pages = max_pages
+        self.seed_retries = seed_retries
+        self.failed_targets = []  # (site, classification) without a first page
+        self.failed_pages = 0
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(SEEK_SITES), pool_maxsize=self.concurrency)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0",
+            "Accept": "application/json",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+
+    def _params(self, site, classification, page):
+        _, site_key, locale = SEEK_SITES[site]
+        params = {'siteKey': site_key, 'locale': locale}
+        params.update(self.base_params)
+        params.update(classification=classification, pageSize=self.page_size, page=page)
+        return params
+
+    def _fetch(self, site, classification, page):
+        host = SEEK_SITES[site][0]
+        response = self.rate_limiter.get(
+            f"https://{host}{SEARCH_PATH}", session=self.session,
+            headers={"Referer": f"https://{host}/", "Origin": f"https://{host}"},
+            params=self._params(site, classification, page),
+        )
+        response.raise_for_status()
+        data = response.json()
+        page_ref = response.url  # Exact request, for lineage/replay
+        records = [seek_record(job, host, site, page_ref, position)
+                   for position, job in enumerate(data.get('data') or [])]
+        return records, data.get('totalCount') or 0
+
+    def _last_page(self, total):
+        pages = math.ceil(total / self.page_size)
+        return min(pages, self.max_pages) if self.max_pages else pages
+
+    def stream(self):
+        """
+        Yield (site, classification, page, records) for every page, in completion order.
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="seek") as pool:
+            # future -> (site, classification, page, attempt)
+            pending = {pool.submit(self._fetch, *target, 1): (*target, 1, 0) for target in self.targets}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        site, classification, page, attempt = pending.pop(future)
+                        try:
+                            records, total = future.result()
+                        except (requests.exceptions.RequestException, ValueError) as e:
+                            if page > 1:
+                                logger.error("%s classification %s: page %s failed: %s", site, classification, page, e)
+                                self.failed_pages += 1
+                            elif attempt < self.seed_retries:
+                                # Back through the rate limiter, which has slowed down for the host
+                                logger.warning("%s classification %s: first page failed (%s), retrying",
+                                               site, classification, e)
+                                pending[pool.submit(self._fetch, site, classification, 1)] = (
+                                    site, classification, 1, attempt + 1)
+                            else:
+                                logger.error("%s classification %s: first page failed %s times (%s); "
+                                             "no jobs collected for it", site, classification, attempt + 1, e)
+                                self.failed_targets.append((site, classification))
+                            continue
+                        if page == 1:
+                            logger.info("%s classification %s: %s jobs", site, classification, total)
+                            for next_page in range(2, self._last_page(total) + 1):
+                                pending[pool.submit(self._fetch, site, classification, next_page)] = (
+                                    site, classification, next_page, 0)
+                        yield site, classification, page, records
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def extract_jobs(self):
+        """
+        Crawl every target; returns {site: frame} (a frame for every site, possibly empty).
+        """
+        jobs = {site: SpillBuffer(site) for site, _ in self.targets}  # Spills to disk past ETL_MEMORY_BUDGET_MB
+        seen = {site: set() for site in jobs}
+        try:
+            for site, classification, page, records in self.stream():
+                fresh = [record for record in records if record.job_link not in seen[site]]
+                seen[site].update(record.job_link for record in fresh)
+                jobs[site].extend(fresh)
+                logger.info("%s classification %s: page %s with %s jobs (%s new)",
+                            site, classification, page, len(records), len(fresh))
+        finally:
+            self.session.close()
+        logger.info("Rate limiter metrics: %s", self.rate_limiter.metrics())
+        if self.failed_targets or self.failed_pages:
+            logger.error("Incomplete crawl: %s failed pages; targets without results: %s", self.failed_pages,
+                         ", ".join(f"{site} classification {classification}"
+                                   for site, classification in self.failed_targets) or "none")
+        for site, buffer in jobs.items():
+            logger.info("%s: %s jobs scraped", site, len(buffer))
+        return {site: buffer.to_frame() for site, buffer in jobs.items()}
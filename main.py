@@ -1,119 +1,51 @@
 import argparse
-from sqlalchemy import create_engine
-from extract.jobnetmm import JobNetScraper
-from extract.jobdbsg import JobsDBScraper
-from extract.jobsdbth import JobsDBThScraper
-from extract.jobstreetmalay import JobStreetMalaysia
-from extract.founditSG import FounditScraper
-from utils.data_normalizer import JobDataNormalizer
+from utils.arrow_backend import enable_arrow, write_parquet, write_table
+from utils.profiling import profiled
+from utils.memory import memory_stage
+from utils.source_registry import load_sources
 
-from transform.founditsg_t import FounditTransform
-from transform.jobnetmm_t import JobNetTransform
-from transform.jobsdbsg_t import JobsDBSGTransform
-from transform.jobsdbth_t import JobsDBTHTransform
-from transform.jobstreetmalay_t import JobStreetMalayTransform
+from transform.parallel import parallel_transform
 
 import pandas as pd
 import os
 
-def extract_jobnetmm():
-    email = os.getenv("JOBNET_EMAIL")
-    password = os.getenv("JOBNET_PASSWORD")
-    raw = JobNetScraper(email, password).get_jobs(job_function=17)
-    df = JobDataNormalizer().jobnetmm(raw)
-    return df
+## Extractors, their parameters and the transform of every source are in sources.toml
+registry = load_sources("full")
 
-def extract_jobsdbsg():
-    url_pattern = "https://sg.jobsdb.com/{role}-jobs?page={page}"
-    raw = JobsDBScraper(max_pages_override=50, headless=True).run(url_pattern=url_pattern)
-    df = JobDataNormalizer().jobsdbsg(raw)
-    return df
+# Map the source to the corresponding transformation class
+transform_dispatch = {name: config.transform_class() for name, config in registry.items()}
 
-def extract_jobsdbth():
-    params = {
-                'siteKey': 'TH-Main',
-                'classification': '6281',  # IT Jobs
-                'pageSize': 100,
-                'locale': 'en-TH'
-            }
-    raw = JobsDBThScraper(classification_id='6281', base_params=params).scrape_jobs()
-    df = JobDataNormalizer().jobsdbth(raw)
-    return df
+def main(source, log_dir="logs", arrow=False, parquet_dir=None, workers=1):
+    if arrow:
+        enable_arrow()
 
-def extract_founditsg():
-    base_params = {
-            "sort": 1,
-            "limit": 15,
-            "query": '""',
-            "quickApplyJobs": "true",
-            "industries": [
-                "software",
-                "information technology",
-                "software engineering",
-                "it management",
-                "it infrastructure",
-                "cyber security",
-                "cloud computing",
-                "enterprise software",
-                "data center",
-                "cloud data services"
-            ],
-
-      }
-    raw = FounditScraper(base_params=base_params    ).extract_jobs()
-    df = JobDataNormalizer().founditsg(raw)
-    return df
-
-def extract_jobstreetmalay():
-    base_params = {
-                'siteKey': 'MY-Main',
-                'locale': 'en-MY',
-            }
-    raw = JobStreetMalaysia(classification_id="6281", base_params=base_params).fetch_jobs()
-    df = JobDataNormalizer().jobstreetmalay(raw)
-    return df
-
-def main(source, log_dir="logs"):
-    # Map the source to the corresponding extraction function
-    extract_dispatch = {
-        "jobnetmm": extract_jobnetmm,
-        "jobsdbsg": extract_jobsdbsg,
-        "jobsdbth": extract_jobsdbth,
-        "founditsg": extract_founditsg,
-        "jobstreetmalay": extract_jobstreetmalay,
-    }
-
-    # Map the source to the corresponding transformation function
-    transform_dispatch = {
-        "jobnetmm": JobNetTransform,
-        "jobsdbsg": JobsDBSGTransform,
-        "jobsdbth": JobsDBTHTransform,
-        "founditsg": FounditTransform,
-        "jobstreetmalay": JobStreetMalayTransform,
-    }
-    if source not in extract_dispatch:
+    if source not in registry:
         raise ValueError(f"Unknown source: {source}")
     
-    extracted_df = extract_dispatch[source]()
+    with memory_stage(f"{source} extract"):
+        extracted_df = registry[source].extract()
     print(f"Data extraction for {source} completed.")
     print(extracted_df.head())
 
     ## Transform the data
     if source in transform_dispatch:
-        transformer = transform_dispatch[source](extracted_df)
-        transformed_df = transformer.transform()
+        # workers > 1 partitions the frame across a process pool
+        with memory_stage(f"{source} transform"):
+            transformed_df = parallel_transform(transform_dispatch[source], extracted_df, workers=workers)
 
         print(f"Data transformation for {source} completed.")
         print(transformed_df.head())
 
+        if parquet_dir:
+            write_parquet(extracted_df, os.path.join(parquet_dir, f"{source}_raw.parquet"))
+            write_parquet(transformed_df, os.path.join(parquet_dir, f"{source}_transformed.parquet"))
+
     ## Load the data
     database_url = os.getenv("DATABASE_URL")
     def upload_to_database(df: pd.DataFrame, table_name: str, database_url: str = database_url):
-        engine = create_engine(database_url)
         try:
-            with engine.connect() as connection:
-                df.to_sql(table_name, con=connection, if_exists='replace', index=False)
-                print(f"Data loaded into {table_name} table.")
+            write_table(df, table_name, database_url, if_exists='replace')
+            print(f"Data loaded into {table_name} table.")
         except Exception as e:
             print(f"Error loading data into {table_name}: {e}")
 
@@ -123,7 +55,12 @@ def main(source, log_dir="logs"):
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--source", required=True)
+    parser.add_argument("--source", required=True, choices=list(registry))
     parser.add_argument("--log_dir", default="logs")
+    parser.add_argument("--arrow", action="store_true", help="Use the Arrow-backed data path (needs pyarrow)")
+    parser.add_argument("--parquet_dir", default=None, help="Also write raw/transformed frames as Parquet here")
+    parser.add_argument("--workers", type=int, default=1, help="Processes used for the transform step")
+    parser.add_argument("--profile", action="store_true", help="Profile the run into <log_dir>/profile/<run_id>/")
     args = parser.parse_args()
-    main(args.source, log_dir=args.log_dir)
\ No newline at end of file
+    with profiled(f"main-{args.source}", enabled=args.profile, out_dir=os.path.join(args.log_dir, "profile")):
+        main(args.source, log_dir=args.log_dir, arrow=args.arrow, parquet_dir=args.parquet_dir, workers=args.workers)
\ No newline at end of file
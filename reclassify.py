@@ -0,0 +1,191 @@
+"""
+Re-score the category of every row in "IT_jobs"."IT" with the current categories.json.
+
+Rows are streamed through a server-side cursor in (job_id, date_posted) order,
+re-scored with their source's transform spec, and only changed rows are written
+back (category and the category segment of job_id) via a temp table and one
+UPDATE ... FROM per chunk. Rows are matched on the full key (job_id, date_posted);
+a row whose new job_id would collide with an existing key keeps its old job_id.
+After each committed chunk the last key is written to a checkpoint file, so an
+interrupted run resumes where it stopped.
+
+    python reclassify.py [--chunk_size 50000] [--checkpoint PATH] [--restart] [--dry_run]
+"""
+import argparse
+import json
+import os
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from main import transform_dispatch
+from utils.aggregates import rebuild_summary
+from utils.category_index import load_index
+from utils.lineage import ensure_lineage_tables
+from utils.logger import get_module_logger
+from utils.pkey_gen import replace_category_code
+from utils.schema import SCHEMA, TABLE
+
+logger = get_module_logger(__name__, group='transform')
+
+DEFAULT_CHECKPOINT = os.path.join("logs", "reclassify", "checkpoint.json")
+
+
+def load_checkpoint(path, checksum):
+    """
+    Last processed (job_id, date_posted), or None. A checkpoint written for a different
+    categories.json is ignored, since its finished rows were scored with old keywords.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("checksum") != checksum:
+        logger.info("Checkpoint was written for another categories.json; starting over")
+        return None
+    if not state.get("last_job_id"):
+        return None
+    return state["last_job_id"], state.get("last_date_posted")
+
+
+def save_checkpoint(path, checksum, last_key, updated):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"checksum": checksum, "last_job_id": last_key[0],
+                   "last_date_posted": str(last_key[1]), "updated": updated}, f)
+    os.replace(tmp_path, path)
+
+
+def rescore_chunk(chunk: pd.DataFrame, transformers: dict) -> pd.DataFrame:
+    """
+    Returns (job_id, date_posted, new_job_id, category) for the rows whose category changed.
+    """
+    changed = []
+    for source, rows in chunk.groupby("source", sort=False, observed=True):
+        transformer = transformers.get(source)
+        if transformer is None:
+            continue
+        categories = transformer.categorize_titles(rows["title"])
+        if categories is None:
+            continue
+        diff = rows.loc[categories.ne(rows["category"]).to_numpy()]
+        if diff.empty:
+            continue
+        new_categories = categories.loc[diff.index]
+        changed.append(pd.DataFrame({
+            "job_id": diff["job_id"],
+            "date_posted": diff["date_posted"],
+            "new_job_id": [replace_category_code(j, c) for j, c in zip(diff["job_id"], new_categories)],
+            "category": new_categories,
+        }))
+    if not changed:
+        return pd.DataFrame(columns=["job_id", "date_posted", "new_job_id", "category"])
+    return pd.concat(changed, ignore_index=True)
+
+
+def apply_updates(engine, updates: pd.DataFrame):
+    """
+    Batched UPDATE ... FROM a temp table, in one transaction, matched on
+    (job_id, date_posted). A row whose new key already exists (in the table or
+    earlier in the batch) only gets its category. Lineage rows follow renamed job_ids.
+    """
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TEMP TABLE reclassify_updates (job_id text, date_posted date, new_job_id text, category text, "
+            "PRIMARY KEY (job_id, date_posted)) ON COMMIT DROP"
+        ))
+        conn.execute(
+            text("INSERT INTO reclassify_updates (job_id, date_posted, new_job_id, category) "
+                 "VALUES (:job_id, :date_posted, :new_job_id, :category)"),
+            updates.to_dict("records"),
+        )
+        kept = conn.execute(text(
+            "UPDATE reclassify_updates AS u SET new_job_id = u.job_id "
+            "WHERE u.new_job_id <> u.job_id AND ("
+            f'EXISTS (SELECT 1 FROM "{SCHEMA}"."{TABLE}" AS t '
+            "WHERE t.job_id = u.new_job_id AND t.date_posted = u.date_posted) "
+            "OR EXISTS (SELECT 1 FROM reclassify_updates AS o WHERE o.new_job_id = u.new_job_id "
+            "AND o.date_posted = u.date_posted AND o.job_id < u.job_id))"
+        )).rowcount
+        if kept:
+            logger.warning("%d re-categorized rows keep their job_id: the new one already exists", kept)
+        result = conn.execute(text(
+            f'UPDATE "{SCHEMA}"."{TABLE}" AS t '
+            "SET category = u.category, job_id = u.new_job_id "
+            "FROM reclassify_updates AS u WHERE t.job_id = u.job_id AND t.date_posted = u.date_posted"
+        ))
+        ensure_lineage_tables(conn)
+        # Lineage is keyed by job_id alone; skip renames onto a job_id it already has for that page
+        conn.execute(text(
+            f'UPDATE "{SCHEMA}".etl_lineage AS l SET job_id = u.new_job_id '
+            "FROM reclassify_updates AS u WHERE l.job_id = u.job_id AND u.new_job_id <> u.job_id "
+            f'AND NOT EXISTS (SELECT 1 FROM "{SCHEMA}".etl_lineage AS o '
+            "WHERE o.job_id = u.new_job_id AND o.page_key = l.page_key)"
+        ))
+    return result.rowcount
+
+
+def reclassify(database_url, chunk_size=50000, checkpoint=DEFAULT_CHECKPOINT, restart=False, dry_run=False):
+    checksum = load_index().checksum
+    last_key = None if restart else load_checkpoint(checkpoint, checksum)
+    if last_key:
+        logger.info(f"Resuming after job_id {last_key[0]} ({last_key[1]})")
+
+    empty = pd.DataFrame(columns=["title"])
+    transformers = {source: cls(empty) for source, cls in transform_dispatch.items()}
+    skipped = [source for source, t in transformers.items() if t.spec.category_field not in ("title", "cleaned_title")]
+    if skipped:
+        logger.info(f"Keeping stored categories for {skipped}: they are scored from raw fields not kept in {SCHEMA}.{TABLE}")
+
+    query = f'SELECT job_id, date_posted, title, category, source FROM "{SCHEMA}"."{TABLE}"'
+    params = {}
+    if last_key and last_key[1]:
+        query += " WHERE (job_id, date_posted) > (:last_job_id, CAST(:last_date_posted AS date))"
+        params.update(last_job_id=last_key[0], last_date_posted=last_key[1])
+    elif last_key:
+        # Checkpoint from before date_posted was recorded: redo that job_id (re-scoring is idempotent)
+        query += " WHERE job_id >= :last_job_id"
+        params["last_job_id"] = last_key[0]
+    query += " ORDER BY job_id, date_posted"
+
+    engine = create_engine(database_url)
+    scanned = updated = 0
+    try:
+        # Reader: server-side cursor, so only one chunk is held in memory at a time.
+        # Writes go through separate connections; the cursor keeps its snapshot.
+        with engine.connect().execution_options(stream_results=True, max_row_buffer=chunk_size) as reader:
+            for chunk in pd.read_sql(text(query), reader, params=params, chunksize=chunk_size):
+                updates = rescore_chunk(chunk, transformers)
+                if not updates.empty and not dry_run:
+                    apply_updates(engine, updates)
+                scanned += len(chunk)
+                updated += len(updates)
+                if not dry_run:
+                    last = chunk.iloc[-1]
+                    save_checkpoint(checkpoint, checksum, (last["job_id"], last["date_posted"]), updated)
+                logger.info(f"Scanned {scanned} rows, {updated} re-categorized so far")
+        if not dry_run:
+            rebuild_summary(engine, SCHEMA, TABLE)  # Category counts moved between groups
+    finally:
+        engine.dispose()
+
+    logger.info(f"Reclassification {'dry run ' if dry_run else ''}done: {scanned} rows scanned, {updated} changed")
+    if not dry_run and os.path.exists(checkpoint):
+        os.remove(checkpoint)  # Finished; the next run starts from the top
+    return scanned, updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Re-score categories in "IT_jobs"."IT" after editing categories.json')
+    parser.add_argument("--chunk_size", type=int, default=50000)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="Progress file used to resume")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    parser.add_argument("--dry_run", action="store_true", help="Count changes without writing")
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise ValueError("DATABASE_URL not set.")
+    reclassify(database_url, chunk_size=args.chunk_size, checkpoint=args.checkpoint,
+               restart=args.restart, dry_run=args.dry_run)
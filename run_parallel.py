@@ -1,59 +1,42 @@
-from sqlalchemy import create_engine
+import argparse
 import subprocess
 import sys
 import os
-import pandas as pd
-from utils.pkey_gen import custom_job_id
-
-sources = ["jobnetmm", "jobsdbth", "jobsdbsg", "founditsg", "jobstreetmalay"]
-procs = []
-
-for source in sources:
-    print(f"🚀 Starting ETL for {source} ...")
-    # Log output to separate files for each source
-    procs.append(subprocess.Popen(
-        [sys.executable, "main.py", "--source", source]
-    ))
-
-# Wait for all subprocesses to complete
-for proc in procs:
-    proc.wait()
-
-print("Combining data from all sources...")
-
-dfs = []
-url = os.getenv("DATABASE_URL")
-engine = create_engine(url)
-
-for source in sources:
-    table_name = f"{source}_transformed"
-    try:
-        df = pd.read_sql_table(table_name, con=engine)
-        dfs.append(df)
-    except Exception as e:
-        print(f"Error reading table {table_name}: {e}")
-
-## Combine all DataFrames into one
-if dfs:
-    full_df = pd.concat(dfs, ignore_index=True)
-    print(f"Combined DataFrame shape: {full_df.shape}")
-    full_df = custom_job_id(full_df)
-    print("Custom job IDs generated.")
-    print(full_df['job_id'].head())
-    print(full_df.columns)
-
-    try:
-        full_df.to_sql("IT", schema="IT_jobs", con=engine, if_exists='replace', index=False)
-        print("Data loaded into IT_jobs table.")
-    except Exception as e:
-        print(f"Error loading data into IT_jobs: {e}")
-    finally:
-        engine.dispose()
-
-else:
-    print("No data to combine. Please check the individual source tables.")
-# Clean up subprocesses
-for proc in procs:
-    if proc.poll() is None:  # If the process is still running
-        proc.terminate()  # Terminate the process
-        print(f"Terminated process {proc.pid} for source {source}.")
\ No newline at end of file
+from combine_load import combine_sources
+from utils.profiling import profiled, section
+from utils.source_registry import load_sources, run_scheduled
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--profile", action="store_true",
+                    help="Profile every source run and the combine step into logs/profile/<run_id>/")
+parser.add_argument("--max_parallel", type=int, default=None,
+                    help="Sources running at once (default: [scheduler] in sources.toml)")
+args = parser.parse_args()
+
+registry = load_sources("full")
+
+
+def run_source(config):
+    print(f"🚀 Starting ETL for {config.name} ...")
+    # Each source runs in its own process; a failed run raises CalledProcessError
+    subprocess.run(
+        [sys.executable, "main.py", "--source", config.name] + (["--profile"] if args.profile else []),
+        check=True,
+    )
+
+
+# Subprocesses inherit the run ID, so their profiles land in the same directory
+# and the merged flamegraph written at the end covers all of them
+with profiled("run_parallel", enabled=args.profile):
+    # Longest expected runtime first, so the slowest source never starts last
+    results = run_scheduled(registry.values(), run_source, max_parallel=args.max_parallel)
+    for source, result in results.items():
+        if isinstance(result, Exception):
+            print(f"ETL for {source} failed: {result}")
+
+    print("Combining data from all sources...")
+
+    # Streams each {source}_transformed table into a staging table, then swaps it in as IT_jobs.IT
+    url = os.getenv("DATABASE_URL")
+    with section("combine"):
+        combine_sources(url, list(registry))
@@ -0,0 +1,10 @@
+import pytest
+
+from utils.logger import stop_logging
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _drain_logging():
+    # Emit repeat summaries while pytest still captures stdout, not at interpreter exit
+    yield
+    stop_logging()
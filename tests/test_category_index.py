@@ -0,0 +1,48 @@
+import json
+import multiprocessing
+
+import numpy as np
+
+from utils.category_index import build_index, load_index
+
+CATEGORIES = {
+    "categories": {
+        "Data & Analytics": {"data": 2.0, "analyst": 1.5},
+        "Software/Web Development": {"developer": 2.0, "software": 1.0, "data": 0.5},
+    },
+    "manual_role_lookup": {"UI/UX": ["ux designer"]},
+}
+
+
+def _write_categories(tmp_path, categories=CATEGORIES):
+    path = tmp_path / "categories.json"
+    path.write_text(json.dumps(categories), encoding="utf-8")
+    return path
+
+
+def _load(json_path, build_dir):
+    index = load_index.__wrapped__(str(json_path), str(build_dir))
+    return index.best_category(["data", "analyst"])
+
+
+def test_concurrent_rebuilds_leave_a_consistent_index(tmp_path):
+    json_path = _write_categories(tmp_path)
+    build_dir = tmp_path / "build"
+    with multiprocessing.get_context("fork").Pool(6) as pool:
+        results = pool.starmap(_load, [(json_path, build_dir)] * 24)
+    assert set(results) == {"Data & Analytics"}
+    # No temp files left behind, and the pair on disk matches
+    assert sorted(p.name for p in build_dir.iterdir()) == ["categories.idx.json", "categories.idx.npy"]
+    index = load_index.__wrapped__(str(json_path), str(build_dir))
+    assert isinstance(index.weights, np.memmap)
+
+
+def test_weights_not_matching_the_meta_are_rebuilt(tmp_path):
+    json_path = _write_categories(tmp_path)
+    build_dir = tmp_path / "build"
+    npy_path, _ = build_index(json_path, build_dir)
+    np.save(npy_path, np.zeros((1, 1)))  # A weights file from some other build
+
+    index = load_index.__wrapped__(str(json_path), str(build_dir))
+    assert index.best_category(["developer"]) == "Software/Web Development"
+    assert np.load(npy_path).shape == (4, 2)  # data, analyst, developer, software
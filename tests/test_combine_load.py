@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+import combine_load
+
+
+@pytest.fixture
+def staged(tmp_path, monkeypatch):
+    """
+    SQLite stand-in for the transformed tables; staging calls are recorded.
+    """
+    url = f"sqlite:///{tmp_path / 'etl.db'}"
+    engine = create_engine(url)
+    frame = pd.DataFrame({'title': [f"Job {i}" for i in range(5)], 'source': 'a'})
+    frame.to_sql('a_transformed', engine, index=False)
+    frame.assign(source='b').to_sql('b_transformed', engine, index=False)
+    engine.dispose()
+
+    calls = []
+    monkeypatch.setattr(combine_load, "custom_job_id", lambda df: df)
+    monkeypatch.setattr(combine_load, "canonicalize", lambda df, url: df)
+    monkeypatch.setattr(combine_load, "record_lineage", lambda df, url, engine=None: 0)
+    monkeypatch.setattr(combine_load, "ensure_table", lambda engine, table: None)
+    monkeypatch.setattr(combine_load, "_drop_staging", lambda engine: calls.append("drop"))
+    monkeypatch.setattr(combine_load, "swap_table", lambda engine, staging, table: calls.append("swap"))
+    monkeypatch.setattr(combine_load, "rebuild_summary", lambda engine, schema, table: calls.append("summary"))
+
+    def insert_jobs(chunk, database_url, table, engine):
+        calls.append(("insert", chunk['source'].iloc[0], len(chunk)))
+        return len(chunk)
+
+    monkeypatch.setattr(combine_load, "insert_jobs", insert_jobs)
+    return url, calls
+
+
+def test_sources_are_staged_then_swapped(staged):
+    url, calls = staged
+    assert combine_load.combine_sources(url, ['a', 'missing', 'b'], chunk_size=2) == 10
+    assert calls == ["drop"] + [("insert", "a", n) for n in (2, 2, 1)] + \
+        [("insert", "b", n) for n in (2, 2, 1)] + ["swap", "summary"]
+
+
+def test_failed_source_aborts_the_swap(staged, monkeypatch):
+    url, calls = staged
+    inserted = combine_load.insert_jobs
+
+    def flaky(chunk, database_url, table, engine):
+        if chunk['source'].iloc[0] == 'b' and sum(1 for c in calls if c[:2] == ("insert", "b")) == 1:
+            raise RuntimeError("connection lost")
+        return inserted(chunk, database_url, table, engine)
+
+    monkeypatch.setattr(combine_load, "insert_jobs", flaky)
+    with pytest.raises(RuntimeError):
+        combine_load.combine_sources(url, ['a', 'b'], chunk_size=2)
+    assert "swap" not in calls and calls[-1] == "drop"
@@ -0,0 +1,45 @@
+import tracemalloc
+
+import pandas as pd
+import pytest
+
+from utils.data_normalizer import JobDataNormalizer
+from utils.job_record import JobRecord, records_to_frame
+
+ROWS = 100_000
+
+
+@pytest.fixture(scope="module")
+def scraped():
+    return records_to_frame([
+        JobRecord(title=f"Developer {i}", company=f"Company {i % 500}", location="Bangkok",
+                  salary="" if i % 3 else "฿30,000", job_type="Full time", work_arrangement="Hybrid",
+                  date_posted="2026-10-01T00:00:00Z", job_link=f"https://th.jobsdb.com/job/{i}",
+                  country="TH", source="jobsdbth", page_ref=f"page {i // 100}", position=i % 100)
+        for i in range(ROWS)
+    ])
+
+
+@pytest.mark.parametrize("method", ["jobsdbth", "jobstreetmalay"])
+def test_normalize_peak_memory_stays_near_input(scraped, method):
+    # The standard frame shares the scraper's columns, so normalizing should
+    # allocate a small fraction of the input (total peak about 1x the input)
+    input_bytes = scraped.memory_usage(deep=True).sum()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        out = getattr(JobDataNormalizer(), method)(scraped)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(out) == ROWS
+    assert peak < 0.25 * input_bytes, f"normalize peaked at {peak / input_bytes:.0%} of the input"
+
+
+def test_normalize_keeps_lineage_and_values(scraped):
+    out = JobDataNormalizer().jobsdbth(scraped)
+    assert out['source'].eq('jobsdbth').all()
+    assert out['title'].iloc[7] == "Developer 7"
+    assert {'run_id', 'page_ref', 'position'} <= set(out.columns)
+    pd.testing.assert_series_equal(out['job_link'], scraped['job_link'])
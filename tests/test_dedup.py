@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.dedup import MinHasher, NearDuplicateIndex, fingerprint
+
+
+def _posting(**overrides):
+    row = {
+        'title': 'Senior Python Developer',
+        'company': 'Acme Solutions Co., Ltd.',
+        'location': 'Khlong Toei, Bangkok',
+        'level': 'Senior',
+        'min_salary': 60000,
+        'max_salary': 90000,
+        'currency': 'THB',
+        'source': 'jobsdbth',
+        'job_link': 'https://th.jobsdb.com/job/1',
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = NearDuplicateIndex(path=str(tmp_path / "dedup.sqlite"))
+    yield index
+    index.close()
+
+
+def _count(index, table):
+    return index.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_repost_on_another_source_is_dropped(index):
+    df = pd.DataFrame([
+        _posting(),
+        # Same opening on JobStreet: company suffix and address detail differ
+        _posting(company='Acme Solutions', location='Bangkok', source='jobstreetmalay',
+                 job_link='https://my.jobstreet.com/job/9'),
+    ])
+    assert index.filter(df)['job_link'].tolist() == ['https://th.jobsdb.com/job/1']
+
+
+def test_distinct_postings_are_kept(index):
+    df = pd.DataFrame([
+        _posting(),
+        _posting(title='Junior Python Developer', level='Junior', job_link='https://th.jobsdb.com/job/2'),
+        _posting(title='Data Engineer', job_link='https://th.jobsdb.com/job/3'),
+        _posting(company='Other Corp', job_link='https://th.jobsdb.com/job/4'),
+    ])
+    assert len(index.filter(df)) == 4
+
+
+def test_postings_without_company_are_never_dropped(index):
+    df = pd.DataFrame([_posting(company=None), _posting(company=None, job_link='https://th.jobsdb.com/job/2')])
+    assert len(index.filter(df)) == 2
+
+
+def test_threshold_boundary(index):
+    a = np.arange(128, dtype=np.uint32)
+    b = a.copy()
+    b[:25] += 1000  # 103 / 128 agree: above 0.8
+    assert index._similar(a, b)
+    b[:26] += 1000  # 102 / 128 = 0.797: below
+    assert not index._similar(a, b)
+
+    strict = NearDuplicateIndex(path=index.path, threshold=0.95)
+    try:
+        b = a.copy()
+        b[:25] += 1000
+        assert not strict._similar(a, b)
+    finally:
+        strict.close()
+
+
+def test_minhash_estimates_jaccard():
+    hasher = MinHasher(num_perm=256)
+    base = {f"t:{i}" for i in range(100)}
+    close = set(base) - {"t:0", "t:1", "t:2", "t:3", "t:4"} | {"x:0", "x:1", "x:2", "x:3", "x:4"}  # Jaccard 0.905
+    far = {f"t:{i}" for i in range(50, 150)}  # Jaccard 0.33
+    agree = lambda a, b: np.mean(hasher.signature(a) == hasher.signature(b))
+    assert agree(base, close) >= 0.8
+    assert agree(base, far) < 0.5
+    assert np.array_equal(MinHasher(256).signature(base), hasher.signature(base))  # Stable across runs
+
+
+def test_band_keys_follow_signature_rows(index):
+    assert index.rows == 4 and index.bands == 32
+    sig = index.hasher.signature(fingerprint(_posting()))
+    keys = index._band_keys(sig)
+    assert len(keys) == 32 and keys == index._band_keys(sig.copy())
+
+    changed = sig.copy()
+    changed[5] += 1  # Row 5 is in band 1 only
+    new_keys = index._band_keys(changed)
+    assert [band for band, (x, y) in enumerate(zip(keys, new_keys)) if x != y] == [1]
+
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(path=index.path, num_perm=100, bands=32)
+
+
+def test_history_survives_reopen_and_register_is_explicit(tmp_path):
+    path = str(tmp_path / "dedup.sqlite")
+    first = NearDuplicateIndex(path=path)
+    assert len(first.filter(pd.DataFrame([_posting()]))) == 1
+    assert _count(first, "postings") == 0  # Nothing stored before register()
+    first.register()
+    assert _count(first, "postings") == 1 and _count(first, "bands") == 32
+    first.close()
+
+    second = NearDuplicateIndex(path=path)
+    try:
+        repost = _posting(company='ACME SOLUTIONS', source='jobstreetmalay', job_link='https://my.jobstreet.com/job/9')
+        assert second.filter(pd.DataFrame([repost])).empty
+        assert len(second.filter(pd.DataFrame([_posting(title='QA Engineer', job_link='x')]))) == 1
+    finally:
+        second.close()
+
+
+def test_prune_drops_expired_postings_and_their_bands(index):
+    index.filter(pd.DataFrame([_posting()]))
+    index.register(seen_date=datetime.now(timezone.utc) - timedelta(days=61))
+    assert _count(index, "postings") == 0 and _count(index, "bands") == 0
+
+    index.filter(pd.DataFrame([_posting()]))
+    index.register(seen_date=datetime.now(timezone.utc) - timedelta(days=59))
+    assert _count(index, "postings") == 1
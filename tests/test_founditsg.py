@@ -0,0 +1,77 @@
+from urllib.parse import parse_qs, urlsplit
+
+from extract.founditSG import FounditScraper
+from utils.memory import SpillBuffer
+
+
+class StubResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+
+class StubLimiter:
+    """
+    Serves `total` jobs, at most `cap` per window whatever `limit` asks for.
+    `fail` maps a start offset to the number of times it returns a 500 first.
+    """
+
+    def __init__(self, total, cap=None, report_total=True, fail=None):
+        self.total = total
+        self.cap = cap
+        self.report_total = report_total
+        self.fail = dict(fail or {})
+        self.starts = []
+
+    def get(self, url, headers=None):
+        query = parse_qs(urlsplit(url).query)
+        start, limit = int(query['start'][0]), int(query['limit'][0])
+        self.starts.append(start)
+        if self.fail.get(start):
+            self.fail[start] -= 1
+            return StubResponse({}, status_code=500)
+        size = min(limit, self.cap or limit)
+        jobs = [{'jobId': i, 'title': f"Job {i}"} for i in range(start, min(start + size, self.total))]
+        response = {'data': jobs}
+        if self.report_total:
+            response['meta'] = {'paging': {'total': self.total}}
+        return StubResponse({'jobSearchResponse': response})
+
+    def metrics(self):
+        return {}
+
+
+def _scraper(limiter, **kwargs):
+    return FounditScraper(base_params={'limit': 15}, rate_limiter=limiter, concurrency=3, **kwargs)
+
+
+def test_capped_limit_without_total_steps_by_returned_size():
+    limiter = StubLimiter(total=40, cap=10, report_total=False)
+    df = _scraper(limiter).extract_jobs()
+    assert len(df) == 40
+    assert sorted(set(limiter.starts)) == [0, 10, 20, 30, 40, 50, 60]  # Stops after one empty batch
+
+
+def test_failed_window_is_retried_once():
+    limiter = StubLimiter(total=60, fail={30: 1})
+    df = _scraper(limiter).extract_jobs()
+    assert len(df) == 60
+    assert limiter.starts.count(30) == 2
+
+
+def test_window_failing_twice_is_reported(caplog):
+    limiter = StubLimiter(total=60, fail={30: 2})
+    df = _scraper(limiter).extract_jobs()
+    assert len(df) == 45
+    assert "Dropped 1 windows that failed twice: starts [30]" in caplog.text
+
+
+def test_no_first_window_returns_an_empty_buffer():
+    limiter = StubLimiter(total=0)
+    scraper = _scraper(limiter)
+    jobs = scraper._extract_concurrent(set())
+    assert isinstance(jobs, SpillBuffer) and len(jobs) == 0
+    assert scraper.extract_jobs().empty
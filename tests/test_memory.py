@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from utils import memory
+from utils.job_record import JobRecord
+from utils.memory import SpillBuffer
+
+
+def _records(n):
+    return [JobRecord(title=f"Job {i}", job_link=f"https://x/{i}", source="founditsg") for i in range(n)]
+
+
+def test_over_budget_uses_current_rss(monkeypatch):
+    monkeypatch.setenv(memory.BUDGET_ENV, "100")
+    monkeypatch.setattr(memory, "rss_mb", lambda: 150.0)
+    assert memory.over_budget()
+    monkeypatch.setattr(memory, "rss_mb", lambda: 80.0)
+    assert not memory.over_budget()
+
+
+def test_budget_not_enforced_without_current_rss(monkeypatch, tmp_path):
+    # Only the (ever-growing) peak is known: nothing spills
+    monkeypatch.setenv(memory.BUDGET_ENV, "1")
+    monkeypatch.setenv(memory.SPILL_DIR_ENV, str(tmp_path))
+    monkeypatch.setattr(memory, "rss_mb", lambda: None)
+    assert not memory.over_budget()
+
+    buffer = SpillBuffer("founditsg")
+    for _ in range(3):
+        buffer.extend(_records(10))
+    assert list(tmp_path.iterdir()) == []
+    assert len(buffer.to_frame()) == 30
+
+
+def test_peak_rss_units(monkeypatch):
+    usage = SimpleNamespace(ru_maxrss=512 * 1024)
+    monkeypatch.setattr(memory, "resource", SimpleNamespace(getrusage=lambda who: usage, RUSAGE_SELF=0))
+    monkeypatch.setattr(memory.sys, "platform", "linux")
+    assert memory.peak_rss_mb() == 512.0  # KB
+    monkeypatch.setattr(memory.sys, "platform", "darwin")
+    assert memory.peak_rss_mb() == 0.5  # Bytes
+    monkeypatch.setattr(memory, "resource", None)
+    assert memory.peak_rss_mb() is None
+
+
+def test_rss_mb_reads_proc():
+    rss = memory.rss_mb()
+    assert rss is None or rss > 0
@@ -0,0 +1,131 @@
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+from utils import rate_limiter
+from utils.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+URL = "https://api.example.com/search"
+HOST = "api.example.com"
+
+
+class StubResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class StubSession:
+    """
+    Plays back a list of responses (or exceptions to raise), recording each call.
+    """
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append(method)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return StubResponse(outcome) if isinstance(outcome, int) else outcome
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", slept.append)
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: high)
+    return slept
+
+
+def test_aimd_increase_and_decrease(sleeps):
+    limiter = AdaptiveRateLimiter(initial_rate=1.0, min_rate=0.2, max_rate=2.0, increase=0.25, decrease=0.5)
+    for _ in range(3):
+        limiter.on_success(HOST)
+    assert limiter.current_rate(HOST) == 1.75
+    limiter.on_success(HOST)
+    limiter.on_success(HOST)
+    assert limiter.current_rate(HOST) == 2.0  # Capped at max_rate
+
+    limiter.on_throttle(HOST)
+    assert limiter.current_rate(HOST) == 1.0
+    for _ in range(5):
+        limiter.on_throttle(HOST)
+    assert limiter.current_rate(HOST) == 0.2  # Floored at min_rate
+    assert limiter.current_rate("other.example.com") == 1.0  # Hosts are independent
+    assert limiter.metrics()[HOST]["throttled"] == 6
+
+
+def test_throttled_get_is_retried_after_retry_after(sleeps):
+    limiter = AdaptiveRateLimiter(base_backoff=0.5, max_rate=100.0, initial_rate=100.0)
+    session = StubSession(StubResponse(429, {"Retry-After": "7"}), 503, 200)
+    response = limiter.get(URL, session=session)
+
+    assert response.status_code == 200
+    assert session.calls == ["GET"] * 3
+    assert 7.0 in sleeps  # Retry-After outranks the (shorter) backoff
+    assert limiter.metrics()[HOST] == {"rate": 25.25, "requests": 3, "throttled": 2, "retries": 2}
+
+
+def test_retries_stop_at_max_retries(sleeps):
+    limiter = AdaptiveRateLimiter(max_retries=2, initial_rate=100.0)
+    session = StubSession(500, 500, 500, 200)
+    assert limiter.get(URL, session=session).status_code == 500
+    assert len(session.calls) == 3
+
+
+def test_retry_budget_is_shared_by_the_limiter(sleeps):
+    limiter = AdaptiveRateLimiter(retry_budget=3, initial_rate=100.0)
+    first = StubSession(502, 502, 200)
+    assert limiter.get(URL, session=first).status_code == 200
+
+    # One retry left in the budget, then the error is returned / raised
+    second = StubSession(502, 502, 200)
+    assert limiter.get(URL, session=second).status_code == 502
+    assert len(second.calls) == 2
+    third = StubSession(requests.exceptions.ConnectionError("reset"))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        limiter.get(URL, session=third)
+    assert limiter.retry_budget == 0
+
+    # A new limiter (one per source) starts with a full budget
+    assert AdaptiveRateLimiter(retry_budget=3, initial_rate=100.0).get(URL, session=StubSession(502, 200)).status_code == 200
+
+
+def test_post_is_not_retried_unless_asked(sleeps):
+    limiter = AdaptiveRateLimiter(initial_rate=100.0)
+    session = StubSession(503, 200)
+    assert limiter.post(URL, session=session, data={"a": 1}).status_code == 503
+    assert session.calls == ["POST"]
+    assert limiter.current_rate(HOST) == 50.0  # Still backs off
+
+    with pytest.raises(requests.exceptions.Timeout):
+        limiter.post(URL, session=StubSession(requests.exceptions.Timeout()))
+
+    session = StubSession(503, 200)
+    assert limiter.post(URL, session=session, retry=True).status_code == 200
+    assert session.calls == ["POST", "POST"]
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after("soon") is None
+    at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=120), usegmt=True)
+    assert 110 < parse_retry_after(at) <= 120
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(hours=1), usegmt=True)
+    assert parse_retry_after(past) == 0.0
+
+
+def test_registry_sources_get_their_own_limiter():
+    from utils.source_registry import load_sources
+    config = load_sources("daily")["jobsdbth"]
+    first, second = config.rate_limiter(), config.rate_limiter()
+    assert first is not second and first is not rate_limiter.default_limiter
+    assert first.max_rate == 4.0
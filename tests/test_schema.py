@@ -0,0 +1,207 @@
+import logging
+from datetime import date
+
+import pandas as pd
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from utils import schema
+from utils.schema import COLUMN_NAMES, conform_frame, ensure_partitions, insert_jobs, swap_table
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+
+
+def _frame(**overrides):
+    rows = {
+        'job_id': ['a_sw_jth_th_202601', 'b_sw_jth_th_202602', 'c_sw_jth_th_202602', None],
+        'title': ['Developer'] * 4,
+        'min_salary': ['30000', 'Negotiable', '', '1'],
+        'date_posted': ['2026-01-31T23:00:00Z', '2026-02-01T00:00:00Z', 'yesterday', '2026-02-02'],
+        'job_link': ['https://x/1', 'https://x/2', 'https://x/3', 'https://x/4'],
+        'source': pd.Categorical(['jobsdbth'] * 4),
+        'company_id': ['7', None, '3', '1'],
+        'extra_column': [1, 2, 3, 4],
+    }
+    rows.update(overrides)
+    return pd.DataFrame(rows)
+
+
+def test_conform_frame_types_and_drops(caplog):
+    with caplog.at_level(logging.WARNING, logger='utils.schema'):
+        out = conform_frame(_frame())
+
+    assert list(out.columns) == COLUMN_NAMES
+    assert out['job_id'].tolist() == ['a_sw_jth_th_202601', 'b_sw_jth_th_202602']
+    assert out['date_posted'].tolist() == [date(2026, 1, 31), date(2026, 2, 1)]
+    assert out['min_salary'].iloc[0] == 30000 and pd.isna(out['min_salary'].iloc[1])
+    assert str(out['company_id'].dtype) == 'Int64'
+    assert out['source'].dtype == object
+    # The unparsable date and the missing job_id are reported, not dropped silently
+    assert "1 rows without job_id and 1 without a parsable date_posted" in caplog.text
+    assert "https://x/3" in caplog.text
+
+
+def test_conform_frame_drops_duplicate_keys():
+    out = conform_frame(_frame(
+        job_id=['a', 'a', 'b', 'c'],
+        date_posted=['2026-01-05'] * 4,
+        job_link=['https://x/1', 'https://x/2', 'https://x/3', 'https://x/3'],
+    ))
+    assert out['job_id'].tolist() == ['a', 'b']
+
+
+def test_ensure_partitions_month_boundary():
+    conn = RecordingConnection()
+    ensure_partitions(conn, ['2025-12-31T23:59:59', '2026-01-01', pd.NaT, 'not a date', '2026-01-15'])
+
+    assert len(conn.statements) == 2
+    december, january = conn.statements
+    assert '"IT_jobs"."IT_y2025m12" PARTITION OF "IT_jobs"."IT"' in december
+    assert "FROM ('2025-12-01') TO ('2026-01-01')" in december
+    assert '"IT_jobs"."IT_y2026m01"' in january
+    assert "FROM ('2026-01-01') TO ('2026-02-01')" in january
+    assert all(sql.startswith("CREATE TABLE IF NOT EXISTS") for sql in conn.statements)
+
+
+def test_ensure_partitions_staging_table_names():
+    conn = RecordingConnection()
+    ensure_partitions(conn, [date(2024, 2, 29)], table='IT_staging')
+    assert conn.statements == [
+        'CREATE TABLE IF NOT EXISTS "IT_jobs"."IT_staging_y2024m02" PARTITION OF "IT_jobs"."IT_staging" '
+        "FOR VALUES FROM ('2024-02-01') TO ('2024-03-01')"
+    ]
+
+
+class RecordingEngine:
+    """
+    engine.begin() hands out one RecordingConnection; `fail_on` makes a matching statement raise.
+    """
+
+    def __init__(self, fail_on=None):
+        self.conn = RecordingConnection()
+        self.fail_on = fail_on
+
+    def begin(self):
+        engine = self
+
+        class Transaction:
+            def __enter__(self):
+                return engine
+
+            def __exit__(self, *exc):
+                return False
+
+        return Transaction()
+
+    def execute(self, statement, params=None):
+        self.conn.execute(statement, params)
+        if self.fail_on and self.fail_on in str(statement):
+            raise RuntimeError("insert failed")
+        return type("Result", (), {"rowcount": 2})()
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    written = []
+    monkeypatch.setattr(schema, "ensure_table", lambda engine, table: None)
+    monkeypatch.setattr(schema, "write_table", lambda df, name, url, **kwargs: written.append(name))
+    return written
+
+
+def test_insert_jobs_uses_a_load_table_per_call(loader):
+    engine = RecordingEngine()
+    frame = _frame().iloc[:2]
+    assert insert_jobs(frame, "postgresql://unused", engine=engine) == 2
+    assert insert_jobs(frame, "postgresql://unused", engine=engine) == 2
+
+    first, second = loader
+    assert first != second and first.startswith("IT_load_")
+    dropped = [sql for sql in engine.conn.statements if sql.startswith("DROP TABLE")]
+    assert dropped == [f'DROP TABLE IF EXISTS "IT_jobs"."{name}"' for name in loader]
+
+
+def test_insert_jobs_drops_its_load_table_on_failure(loader):
+    engine = RecordingEngine(fail_on="INSERT INTO")
+    with pytest.raises(RuntimeError):
+        insert_jobs(_frame().iloc[:2], "postgresql://unused", engine=engine)
+    assert engine.conn.statements[-1] == f'DROP TABLE IF EXISTS "IT_jobs"."{loader[0]}"'
+
+
+class Catalog:
+    """
+    Engine + connection over an in-memory catalog: {table: relkind} and {parent: [partitions]}.
+    `blocked` tables cannot be dropped (a view depends on them).
+    """
+
+    def __init__(self, kinds, partitions=None, blocked=()):
+        self.kinds = dict(kinds)
+        self.partitions = {k: list(v) for k, v in (partitions or {}).items()}
+        self.blocked = set(blocked)
+        self.statements = []
+
+    def begin(self):
+        return RecordingEngine.begin(self)
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        result = type("Result", (), {})()
+        if "c.relkind" in sql:
+            result.scalar = lambda: self.kinds.get(params["table"])
+            return result
+        if "pg_inherits" in sql:
+            found = self.partitions.get(params["table"], [])
+            result.scalars = lambda: type("Scalars", (), {"all": lambda _: list(found)})()
+            return result
+        self.statements.append(sql)
+        if sql.startswith("DROP TABLE"):
+            name = sql.rsplit('"', 2)[1]
+            if name in self.blocked and name in self.kinds:
+                raise DBAPIError(sql, None, Exception("other objects depend on it"))
+            for partition in self.partitions.pop(name, []) + [name]:
+                self.kinds.pop(partition, None)
+        elif sql.startswith("ALTER TABLE"):
+            name, new = sql.split('"')[3], sql.split('"')[5]
+            self.kinds[new] = self.kinds.pop(name, 'r')
+            if name in self.partitions:
+                self.partitions[new] = self.partitions.pop(name)
+            for children in self.partitions.values():
+                children[:] = [new if child == name else child for child in children]
+        return result
+
+
+def test_swap_table_renames_aside_then_drops():
+    catalog = Catalog({'IT': 'p', 'IT_staging': 'p', 'IT_y2026m01': 'r', 'IT_staging_y2026m01': 'r'},
+                      {'IT': ['IT_y2026m01'], 'IT_staging': ['IT_staging_y2026m01']})
+    swap_table(catalog, 'IT_staging')
+
+    assert 'ALTER TABLE "IT_jobs"."IT" RENAME TO "IT_old"' in catalog.statements
+    assert 'ALTER TABLE "IT_jobs"."IT_y2026m01" RENAME TO "IT_old_y2026m01"' in catalog.statements
+    assert 'ALTER TABLE "IT_jobs"."IT_staging_y2026m01" RENAME TO "IT_y2026m01"' in catalog.statements
+    assert catalog.statements[-1] == 'DROP TABLE "IT_jobs"."IT_old"'
+    assert set(catalog.kinds) == {'IT', 'IT_y2026m01'}
+
+
+def test_swap_table_keeps_a_table_something_depends_on(caplog):
+    catalog = Catalog({'IT': 'p', 'IT_staging': 'p'}, blocked={'IT_old'})
+    swap_table(catalog, 'IT_staging')
+    assert set(catalog.kinds) == {'IT', 'IT_old'}
+    assert "Kept IT_jobs.IT_old" in caplog.text
+
+    # The next swap cannot drop it either: IT goes aside under another name and is dropped
+    catalog.kinds['IT_staging'] = 'p'
+    swap_table(catalog, 'IT_staging')
+    assert set(catalog.kinds) == {'IT', 'IT_old'}
+    assert any(sql.startswith('ALTER TABLE "IT_jobs"."IT" RENAME TO "IT_old_') for sql in catalog.statements)
+
+
+def test_swap_table_keeps_an_implicit_table_as_legacy():
+    catalog = Catalog({'IT': 'r', 'IT_staging': 'p'})
+    swap_table(catalog, 'IT_staging')
+    assert catalog.kinds == {'IT': 'p', 'IT_legacy': 'r'}
+    assert not any(sql.startswith('DROP TABLE "') for sql in catalog.statements)
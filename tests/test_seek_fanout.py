@@ -0,0 +1,105 @@
+import threading
+
+import requests
+
+from extract.seek_fanout import SEEK_SITES, SeekFanout
+
+
+class StubResponse:
+    def __init__(self, url, params):
+        self.url = f"{url}?classification={params['classification']}&page={params['page']}"
+        self._params = params
+
+    def raise_for_status(self):
+        pass
+
+
+class StubLimiter:
+    """
+    Serves `totals[classification]` jobs per classification; `fail` maps
+    (classification, page) to the number of times that page fails first.
+    """
+
+    def __init__(self, totals, fail=None, shared=()):
+        self.totals = totals
+        self.fail = dict(fail or {})
+        self.shared = set(shared)  # Job ids listed under every classification
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, session=None, headers=None, params=None):
+        key = (params['classification'], params['page'])
+        with self.lock:
+            self.calls.append((url, dict(params)))
+            if self.fail.get(key):
+                self.fail[key] -= 1
+                raise requests.exceptions.ConnectionError("reset")
+        classification, page = key
+        size, total = params['pageSize'], self.totals[classification]
+        ids = range((page - 1) * size, min(page * size, total))
+        response = StubResponse(url, params)
+        response.json = lambda: {
+            'totalCount': total,
+            'data': [{'id': f"{classification}-{i}" if i not in self.shared else f"shared-{i}",
+                      'title': 'Developer', 'listingDate': '2026-10-01T00:00:00Z'} for i in ids],
+        }
+        return response
+
+    def metrics(self):
+        return {}
+
+
+def _pages(limiter, classification):
+    return sorted(params['page'] for _, params in limiter.calls if params['classification'] == classification)
+
+
+def test_pages_seeded_from_total_count():
+    limiter = StubLimiter({"6281": 25, "6304": 10})
+    fanout = SeekFanout([("jobsdbth", "6281"), ("jobsdbth", 6304)], base_params={'dateRange': 1},
+                        page_size=10, rate_limiter=limiter, concurrency=3)
+    frames = fanout.extract_jobs()
+
+    assert _pages(limiter, "6281") == [1, 2, 3]
+    assert _pages(limiter, "6304") == [1]
+    url, params = limiter.calls[0]
+    host, site_key, locale = SEEK_SITES["jobsdbth"]
+    assert url == f"https://{host}/api/jobsearch/v5/search"
+    assert params['siteKey'] == site_key and params['locale'] == locale and params['dateRange'] == 1
+    assert len(frames["jobsdbth"]) == 35
+    assert fanout.failed_targets == [] and fanout.failed_pages == 0
+
+
+def test_jobs_under_several_classifications_kept_once():
+    limiter = StubLimiter({"6281": 5, "6304": 5}, shared={0, 1})
+    fanout = SeekFanout([("jobstreetmalay", "6281"), ("jobstreetmalay", "6304")], page_size=10, rate_limiter=limiter)
+    frame = fanout.extract_jobs()["jobstreetmalay"]
+    assert len(frame) == 8
+    assert frame['job_link'].is_unique
+
+
+def test_max_pages_caps_the_crawl():
+    limiter = StubLimiter({"6281": 100})
+    SeekFanout([("jobsdbth", "6281")], page_size=10, rate_limiter=limiter, max_pages=4).extract_jobs()
+    assert _pages(limiter, "6281") == [1, 2, 3, 4]
+
+
+def test_failed_first_page_is_retried():
+    limiter = StubLimiter({"6281": 15}, fail={("6281", 1): 2})
+    fanout = SeekFanout([("jobsdbth", "6281")], page_size=10, rate_limiter=limiter)
+    frames = fanout.extract_jobs()
+    assert _pages(limiter, "6281") == [1, 1, 1, 2]
+    assert len(frames["jobsdbth"]) == 15
+    assert fanout.failed_targets == []
+
+
+def test_target_without_first_page_is_reported(caplog):
+    limiter = StubLimiter({"6281": 15, "6304": 5}, fail={("6304", 1): 10, ("6281", 2): 1})
+    fanout = SeekFanout([("jobsdbth", "6281"), ("jobsdbth", "6304")], page_size=10,
+                        rate_limiter=limiter, seed_retries=1)
+    frames = fanout.extract_jobs()
+
+    assert _pages(limiter, "6304") == [1, 1]
+    assert fanout.failed_targets == [("jobsdbth", "6304")]
+    assert fanout.failed_pages == 1
+    assert len(frames["jobsdbth"]) == 10
+    assert "targets without results: jobsdbth classification 6304" in caplog.text
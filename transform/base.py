@@ -0,0 +1,271 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.logger import get_module_logger
+from utils.job_record import apply_categoricals
+from utils.data_normalizer import blank_to_na
+from utils.factorize import map_unique, map_unique_columns
+from utils.arrow_backend import arrow_enabled, is_arrow_string, match_rules, to_arrow_strings
+from utils.title_cleaner import TitleCleaner
+from utils.category_index import load_index
+from utils.lineage import LINEAGE_COLUMNS
+
+logger = get_module_logger(__name__, group='transform')
+
+expected_columns = ['title', 'category', 'company', 'location', 'country', 'min_salary', 'max_salary', 'avg_salary', 'currency', 'job_type', 'work_arrangement', 'level', 'date_posted', 'job_link', 'source']
+salary_columns = ['avg_salary', 'min_salary', 'max_salary', 'currency']
+
+## Ordered (level, keywords) rules; the first rule with a keyword in the title wins
+LEVEL_RULES = (
+    ('Intern', ('intern',)),
+    ('Entry', ('fresh',)),
+    ('Junior', ('junior',)),
+    ('Senior', ('senior',)),
+    ('Manager', ('manager', 'lead', 'head')),
+)
+LEVEL_RULES_FRESHER = (
+    ('Intern', ('intern', 'internship')),
+    ('Entry', ('fresher',)),
+    ('Junior', ('junior',)),
+    ('Senior', ('senior',)),
+    ('Manager', ('lead', 'manager', 'head')),
+)
+
+
+## Salary dialects
+def parse_range_salary(s, currency, strip_chars=(), na_markers=(), single_fills_range=True, keep_currency=False):
+    """
+    Parse 'a - b' / 'a' salary labels into (avg, min, max, currency).
+
+    `single_fills_range` uses a single value as min and max too; `keep_currency`
+    still reports the currency when no number could be found.
+    """
+    if not isinstance(s, str) or not s.strip() or any(marker in s for marker in na_markers):
+        return (pd.NA, pd.NA, pd.NA, pd.NA)
+
+    try:
+        s_clean = s.replace('–', '-').replace('—', '-')
+        for char, replacement in strip_chars:
+            s_clean = s_clean.replace(char, replacement)
+        s_clean = s_clean.strip()
+
+        range_match = re.search(r'([\d,]+)\s*-\s*([\d,]+)', s_clean)
+        if range_match:
+            min_str, max_str = range_match.groups()
+            min_salary = int(min_str.replace(',', ''))
+            max_salary = int(max_str.replace(',', ''))
+            avg_salary = (min_salary + max_salary) // 2
+            return (avg_salary, min_salary, max_salary, currency)
+
+        single_match = re.search(r'([\d,]+)', s_clean)
+        if single_match:
+            salary = int(single_match.group(1).replace(',', ''))
+            if single_fills_range:
+                return (salary, salary, salary, currency)
+            return (salary, pd.NA, pd.NA, currency)
+
+        return (pd.NA, pd.NA, pd.NA, currency if keep_currency else pd.NA)
+
+    except Exception as e:
+        logger.warning("Failed to parse salary: %s -> %s", s, e)
+        return (pd.NA, pd.NA, pd.NA, pd.NA)
+
+
+## Date dialects
+def parse_date_format(date_format):
+    """
+    Build a parser for timestamps in a fixed strptime format, returning 'YYYY-MM-DD'.
+    """
+    def parse_date(date_str):
+        try:
+            return datetime.strptime(date_str.strip(), date_format).strftime("%Y-%m-%d")
+        except (ValueError, AttributeError) as e:
+            logger.error("Date parsing error for string: %s -> %s", date_str, e)
+            return pd.NA
+    return parse_date
+
+
+## Tokenizers
+def tokenize_words(text):
+    text = text.lower()
+    tokens = re.findall(r'\w+', text)
+    bigrams = [' '.join(pair) for pair in zip(tokens, tokens[1:])]
+    return tokens + bigrams
+
+
+def tokenize_stripped(title):
+    title = title.lower().replace("/", " ")
+    title = re.sub(r"[^\w\s]", "", title)
+    words = title.split()
+    bigrams = [' '.join(pair) for pair in zip(words, words[1:])]
+    return words + bigrams
+
+
+@dataclass(frozen=True)
+class TransformSpec:
+    """
+    Declarative description of one source's transform.
+
+    name:               label used in log messages
+    salary_parser:      salary label -> (avg, min, max, currency)
+    date_parser:        raw date_posted -> 'YYYY-MM-DD' (or NA)
+    title_cleaner:      key into title_noise.json, or None to keep titles as-is
+    level_rules:        ordered (level, keywords) rules, or None to skip levels
+    level_default:      value when no level rule matches
+    level_field:        'title' or 'cleaned_title'
+    category_field:     column scored for the category ('title', 'cleaned_title', 'category')
+    manual_lookup:      try categories.json's manual_role_lookup before scoring
+    tokenizer:          tokens + bigrams used for scoring
+    salary_infer_dtypes: infer salary dtypes like `.apply(pd.Series)`
+    list_columns:       columns whose list values are joined with ', '
+    link_prefix:        prefix for relative job links
+    blank_as_na:        treat '' as missing in every column
+    required_fields:    rows missing any of these are dropped
+    """
+    name: str
+    salary_parser: Callable
+    date_parser: Callable
+    title_cleaner: Optional[str] = None
+    level_rules: Optional[Tuple] = LEVEL_RULES
+    level_default: object = pd.NA
+    level_field: str = 'title'
+    category_field: str = 'title'
+    manual_lookup: bool = False
+    tokenizer: Callable = tokenize_stripped
+    salary_infer_dtypes: bool = False
+    list_columns: Tuple[str, ...] = ()
+    link_prefix: Optional[str] = None
+    blank_as_na: bool = False
+    required_fields: Tuple[str, ...] = ()
+
+
+class BaseJobTransform:
+    """
+    Executes a source's TransformSpec over a normalized DataFrame.
+
+    Every derived column is computed once per distinct input value and the
+    output frame is assembled in a single step, in `expected_columns` order.
+    """
+    spec: TransformSpec = None
+
+    def __init__(self, df: pd.DataFrame, categories_path: str = None):
+        self.df = df
+        self.category_index = load_index(categories_path)
+        self.title_cleaner = TitleCleaner.for_source(self.spec.title_cleaner) if self.spec.title_cleaner else None
+
+    def parse_salary(self, s):
+        return self.spec.salary_parser(s)
+
+    def _extract_job_level(self, title):
+        if not isinstance(title, str):
+            return self.spec.level_default
+        title_lower = title.lower()
+        for level, keywords in self.spec.level_rules:
+            if any(keyword in title_lower for keyword in keywords):
+                return level
+        return self.spec.level_default
+
+    def _match_manual_lookup(self, text):
+        return self.category_index.match_manual(text)
+
+    def _categorize_series(self, series: pd.Series, threshold=1.5) -> pd.Series:
+        """
+        Categorize a whole column: manual lookups per distinct value, then one
+        batch score over the distinct values that are left.
+        """
+        codes, uniques = pd.factorize(series, use_na_sentinel=False)
+        results = np.full(len(uniques), "Other", dtype=object)
+        to_score = []
+        for i, text in enumerate(uniques):
+            if not isinstance(text, str):
+                continue
+            if self.spec.manual_lookup:
+                manual_result = self._match_manual_lookup(text)
+                if manual_result:
+                    results[i] = manual_result
+                    continue
+            to_score.append(i)
+        if to_score:
+            token_lists = [self.spec.tokenizer(uniques[i]) for i in to_score]
+            results[to_score] = self.category_index.best_categories(token_lists, threshold)
+        return pd.Series(results[codes], index=series.index)
+
+    def categorize_titles(self, titles: pd.Series):
+        """
+        Re-score stored (raw) titles the way transform() would.
+        Returns None when this source scores a column that is not kept after
+        the transform (Foundit's raw roles), so it cannot be re-scored later.
+        """
+        if self.spec.category_field == 'cleaned_title':
+            return self._categorize_series(self.title_cleaner.clean_series(titles))
+        if self.spec.category_field == 'title':
+            return self._categorize_series(titles)
+        return None
+
+    def _prepare(self, df):
+        # Column-level fixes that must run before parsing; returns new Series only
+        columns = {}
+        for col in self.spec.list_columns:
+            if col in df.columns:
+                columns[col] = map_unique(df[col], lambda x: ', '.join(x) if isinstance(x, list) else x)
+        if self.spec.link_prefix and 'job_link' in df.columns:
+            prefix = self.spec.link_prefix
+            columns['job_link'] = df['job_link'].map(
+                lambda x: f"{prefix}{x}" if isinstance(x, str) and not x.startswith("http") else x
+            )
+        return columns
+
+    def transform(self):
+        spec = self.spec
+        logger.info(f"Transforming {spec.name} DataFrame")
+        df = self.df
+        columns = {col: df[col] for col in df.columns}
+        columns.update(self._prepare(df))
+
+        salary = map_unique_columns(columns['salary'], self.parse_salary, salary_columns,
+                                    infer_dtypes=spec.salary_infer_dtypes)
+        for col in salary_columns:
+            columns[col] = salary[col]
+        columns['date_posted'] = map_unique(columns['date_posted'], spec.date_parser)
+
+        cleaned_title = None
+        if self.title_cleaner is not None:
+            cleaned_title = self.title_cleaner.clean_series(columns['title'])
+        if spec.level_rules:
+            level_source = cleaned_title if spec.level_field == 'cleaned_title' else columns['title']
+            if is_arrow_string(level_source):
+                # Arrow strings: substring rules run as pyarrow.compute kernels
+                columns['level'] = match_rules(level_source, spec.level_rules, spec.level_default)
+            else:
+                columns['level'] = map_unique(level_source, self._extract_job_level)
+
+        # Single assembly of the output frame; 'category' still holds the raw value here.
+        # Lineage columns from the scraper ride along after the expected ones.
+        lineage = [col for col in LINEAGE_COLUMNS if col in df.columns]
+        result = pd.DataFrame(columns, index=df.index).reindex(columns=expected_columns + lineage)
+        # Column-wise so untouched (categorical/numeric) columns are not rewritten
+        for col in expected_columns:
+            if spec.blank_as_na:
+                result[col] = blank_to_na(result[col])
+            if result[col].dtype == object:
+                result[col] = result[col].fillna(pd.NA)
+        if spec.required_fields:
+            result = result.dropna(subset=list(spec.required_fields))
+
+        logger.info("Categorizing job titles into categories")
+        if spec.category_field == 'cleaned_title':
+            category_source = cleaned_title.loc[result.index]
+        else:
+            category_source = result[spec.category_field]
+        result['category'] = self._categorize_series(category_source)
+
+        logger.info(f"Transformation {spec.name} complete")
+        result = apply_categoricals(result)
+        if arrow_enabled():
+            result = to_arrow_strings(result)
+        return result
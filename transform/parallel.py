@@ -0,0 +1,89 @@
+import argparse
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from utils.category_index import load_index
+from utils.job_record import apply_categoricals
+from utils.logger import get_module_logger
+
+logger = get_module_logger(__name__, group='transform')
+
+## Set per worker process by _init_worker
+_worker_transform = None
+_worker_kwargs = None
+
+
+def _init_worker(transform_cls, kwargs):
+    global _worker_transform, _worker_kwargs
+    _worker_transform = transform_cls
+    _worker_kwargs = kwargs
+
+
+def _transform_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    return _worker_transform(chunk, **_worker_kwargs).transform()
+
+
+def parallel_transform(transform_cls, df: pd.DataFrame, workers: int = None, chunk_size: int = None,
+                       min_rows: int = 20000, **kwargs) -> pd.DataFrame:
+    """
+    Run `transform_cls(chunk).transform()` over row partitions of `df` in a
+    process pool and concatenate the results in the original order.
+
+    Rows are independent, so this scales with cores for large backfills.
+    The compiled category index is loaded once in the parent; with the fork
+    start method the workers inherit it instead of reloading it. Small frames (under
+    `min_rows`) or `workers=1` run in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(df) < min_rows:
+        return transform_cls(df, **kwargs).transform()
+
+    chunk_size = chunk_size or -(-len(df) // (workers * 4))  # ~4 chunks per worker
+    chunks = [df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size)]
+
+    load_index(kwargs.get('categories_path'))  # Build/map the category index before forking
+    start_methods = mp.get_all_start_methods()
+    context = mp.get_context('fork' if 'fork' in start_methods else None)
+
+    logger.info(f"Transforming {len(df)} rows in {len(chunks)} chunks on {workers} processes")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(transform_cls, kwargs)) as executor:
+        results = list(executor.map(_transform_chunk, chunks))
+
+    # Chunks have their own category sets; concat falls back to object, so re-categorize
+    return apply_categoricals(pd.concat(results))
+
+
+def _read_frame(path):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype=str, keep_default_na=False).replace('', None)
+
+
+def _write_frame(df, path):
+    if path.endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+if __name__ == "__main__":
+    ## Backfill: transform an archived, normalized raw file across all cores
+    from main import transform_dispatch
+
+    parser = argparse.ArgumentParser(description="Transform archived raw data in parallel")
+    parser.add_argument("--source", required=True, choices=sorted(transform_dispatch))
+    parser.add_argument("--input", required=True, help="Normalized raw data (.csv or .parquet)")
+    parser.add_argument("--output", required=True, help="Where to write the transformed data (.csv or .parquet)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk_size", type=int, default=None)
+    args = parser.parse_args()
+
+    raw_df = _read_frame(args.input)
+    transformed = parallel_transform(transform_dispatch[args.source], raw_df,
+                                     workers=args.workers, chunk_size=args.chunk_size, min_rows=0)
+    _write_frame(transformed, args.output)
+    logger.info(f"Wrote {len(transformed)} rows to {args.output}")
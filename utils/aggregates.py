@@ -0,0 +1,89 @@
+"""
+Summary table for "IT_jobs"."IT", maintained incrementally.
+
+    "IT_jobs"."IT_summary"
+        month, category, country, source, level, currency   (key; missing values stored as '')
+        job_count, salary_count, min_salary, max_salary, sum_salary,
+        avg_salary  (generated: sum_salary / salary_count)
+
+Daily loads update it in the same statement as the insert, from the rows the
+insert actually returned, so dashboards read a few hundred summary rows instead
+of aggregating the whole history. rebuild_summary() recomputes it from scratch
+after bulk rewrites (combine_load, reclassify).
+"""
+from sqlalchemy import text
+
+from utils.logger import get_module_logger
+
+logger = get_module_logger(__name__, group='transform')
+
+SUMMARY_TABLE = "IT_summary"
+DIMENSIONS = ['category', 'country', 'source', 'level', 'currency']
+
+
+def ensure_summary_table(conn, schema):
+    dims_sql = ",\n    ".join(f"{dim} varchar(64) NOT NULL DEFAULT ''" for dim in DIMENSIONS)
+    conn.execute(text(
+        f'CREATE TABLE IF NOT EXISTS "{schema}"."{SUMMARY_TABLE}" (\n'
+        "    month date NOT NULL,\n"
+        f"    {dims_sql},\n"
+        "    job_count bigint NOT NULL DEFAULT 0,\n"
+        "    salary_count bigint NOT NULL DEFAULT 0,\n"
+        "    min_salary numeric,\n"
+        "    max_salary numeric,\n"
+        "    sum_salary numeric,\n"
+        "    avg_salary numeric GENERATED ALWAYS AS (sum_salary / NULLIF(salary_count, 0)) STORED,\n"
+        f"    PRIMARY KEY (month, {', '.join(DIMENSIONS)})\n"
+        ")"
+    ))
+
+
+def _aggregate_select(source_sql):
+    dims = ", ".join(f"COALESCE({dim}::text, '')" for dim in DIMENSIONS)
+    return (
+        f"SELECT date_trunc('month', date_posted)::date, {dims}, "
+        "count(*), count(avg_salary), min(min_salary), max(max_salary), sum(avg_salary) "
+        f"FROM {source_sql} GROUP BY 1, {', '.join(str(i + 2) for i in range(len(DIMENSIONS)))}"
+    )
+
+
+def _columns_sql():
+    return f"month, {', '.join(DIMENSIONS)}, job_count, salary_count, min_salary, max_salary, sum_salary"
+
+
+def insert_with_summary_sql(insert_sql, schema):
+    """
+    Wrap `INSERT ... ON CONFLICT DO NOTHING` into a statement that also folds the
+    inserted rows into the summary table. The statement returns the inserted row count.
+    """
+    target = f'"{schema}"."{SUMMARY_TABLE}"'
+    returning = f"date_posted, min_salary, max_salary, avg_salary, {', '.join(DIMENSIONS)}"
+    return (
+        f"WITH inserted AS ({insert_sql} RETURNING {returning}), "
+        f"summary AS (INSERT INTO {target} AS s ({_columns_sql()}) "
+        f"{_aggregate_select('inserted')} "
+        f"ON CONFLICT (month, {', '.join(DIMENSIONS)}) DO UPDATE SET "
+        "job_count = s.job_count + EXCLUDED.job_count, "
+        "salary_count = s.salary_count + EXCLUDED.salary_count, "
+        "min_salary = LEAST(s.min_salary, EXCLUDED.min_salary), "
+        "max_salary = GREATEST(s.max_salary, EXCLUDED.max_salary), "
+        "sum_salary = CASE WHEN s.sum_salary IS NULL AND EXCLUDED.sum_salary IS NULL THEN NULL "
+        "ELSE COALESCE(s.sum_salary, 0) + COALESCE(EXCLUDED.sum_salary, 0) END "
+        "RETURNING 1) "
+        "SELECT count(*) FROM inserted"
+    )
+
+
+def rebuild_summary(engine, schema, table):
+    """
+    Recompute the summary table from the full jobs table.
+    """
+    target = f'"{schema}"."{SUMMARY_TABLE}"'
+    source = f'"{schema}"."{table}"'
+    with engine.begin() as conn:
+        ensure_summary_table(conn, schema)
+        conn.execute(text(f"DELETE FROM {target}"))
+        result = conn.execute(text(
+            f"INSERT INTO {target} ({_columns_sql()}) {_aggregate_select(source)}"
+        ))
+    logger.info(f"Rebuilt {schema}.{SUMMARY_TABLE}: {result.rowcount} groups")
@@ -0,0 +1,145 @@
+"""
+Optional Arrow-backed data path.
+
+Enabled with JOBS_ETL_ARROW=1 (or `main.py --arrow`) when pyarrow is installed:
+scrapers build pyarrow record batches, string columns use `pd.ArrowDtype`,
+and loads go through ADBC bulk ingest when adbc-driver-postgresql is available.
+Without it everything falls back to the regular pandas/SQLAlchemy path.
+"""
+import os
+
+import pandas as pd
+
+from utils.logger import get_module_logger
+logger = get_module_logger(__name__, group='transform')
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pc = pq = None
+
+ARROW_ENV = "JOBS_ETL_ARROW"
+
+
+def arrow_enabled() -> bool:
+    return pa is not None and os.getenv(ARROW_ENV, "").lower() in ("1", "true", "yes")
+
+
+def enable_arrow():
+    if pa is None:
+        raise ImportError("Arrow mode needs pyarrow: pip install pyarrow")
+    os.environ[ARROW_ENV] = "1"
+
+
+def is_arrow_string(series: pd.Series) -> bool:
+    return pa is not None and isinstance(series.dtype, pd.ArrowDtype) and pa.types.is_string(series.dtype.pyarrow_dtype)
+
+
+def _types_mapper(arrow_type):
+    # Plain strings stay Arrow-backed; dictionary columns become pandas categoricals
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(pa.string())
+    return None
+
+
+def columns_to_arrow_frame(columns: dict, categorical_columns=()) -> pd.DataFrame:
+    """
+    Build a DataFrame through a pyarrow RecordBatch from {name: list of values}.
+    """
+    arrays = {}
+    for name, values in columns.items():
+        array = pa.array(values, type=pa.string(), from_pandas=True) if _all_strings(values) else pa.array(values, from_pandas=True)
+        if name in categorical_columns and pa.types.is_string(array.type):
+            array = array.dictionary_encode()
+        arrays[name] = array
+    batch = pa.RecordBatch.from_pydict(arrays)
+    return batch.to_pandas(types_mapper=_types_mapper)
+
+
+def _all_strings(values) -> bool:
+    return all(v is None or isinstance(v, str) for v in values)
+
+
+def to_arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert object/str columns holding only strings to `string[pyarrow]`.
+    """
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            if isinstance(series.dtype, (pd.ArrowDtype, pd.CategoricalDtype)):
+                continue
+            values = series.tolist()
+            if _all_strings([None if pd.isna(v) else v for v in values]):
+                df[col] = pd.array(pa.array(values, type=pa.string(), from_pandas=True), dtype=pd.ArrowDtype(pa.string()))
+    return df
+
+
+def match_rules(series: pd.Series, rules, default=None) -> pd.Series:
+    """
+    First-match substring rules evaluated with pyarrow.compute over the whole column.
+    `rules` is an ordered sequence of (label, keywords) matched against the lowercased text.
+    """
+    lowered = pc.utf8_lower(pa.array(series.array))
+    default_scalar = pa.scalar(None if default is None or default is pd.NA else default, type=pa.string())
+    result = pa.array([default_scalar.as_py()] * len(series), type=pa.string())
+    # Walk the rules backwards so earlier rules overwrite later ones
+    for label, keywords in reversed(rules):
+        hit = None
+        for keyword in keywords:
+            matched = pc.fill_null(pc.match_substring(lowered, keyword), False)
+            hit = matched if hit is None else pc.or_(hit, matched)
+        result = pc.if_else(hit, pa.scalar(label), result)
+    values = result.to_pylist()
+    missing = pd.NA if default is pd.NA else default
+    return pd.Series([missing if v is None else v for v in values], index=series.index, dtype=object)
+
+
+def write_parquet(df: pd.DataFrame, path: str):
+    """
+    Write a frame to Parquet (snappy); categoricals are stored dictionary-encoded.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, path)
+    logger.info(f"Wrote {len(df)} rows to {path}")
+
+
+def write_table(df: pd.DataFrame, table_name: str, database_url: str, schema: str = None, if_exists: str = 'append',
+                engine=None):
+    """
+    Bulk-load a frame into Postgres via ADBC (COPY BINARY under the hood) when
+    Arrow mode is on and the driver is installed; otherwise use DataFrame.to_sql
+    (on `engine` if given, which is left open).
+    """
+    if arrow_enabled():
+        try:
+            import adbc_driver_postgresql.dbapi as adbc
+        except ImportError:
+            adbc = None
+        if adbc is not None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            # ADBC wants plain strings, not dictionary columns
+            table = pa.table({
+                name: (col.cast(col.type.value_type) if pa.types.is_dictionary(col.type) else col)
+                for name, col in zip(table.column_names, table.columns)
+            })
+            mode = {'append': 'create_append', 'replace': 'replace'}.get(if_exists, if_exists)
+            with adbc.connect(database_url) as conn:
+                with conn.cursor() as cursor:
+                    cursor.adbc_ingest(table_name, table, mode=mode, db_schema_name=schema)
+                conn.commit()
+            logger.info(f"ADBC ingest of {len(df)} rows into {schema + '.' if schema else ''}{table_name}")
+            return
+
+    if engine is not None:
+        df.to_sql(table_name, con=engine, schema=schema, if_exists=if_exists, index=False)
+        return
+    from sqlalchemy import create_engine
+    engine = create_engine(database_url)
+    try:
+        df.to_sql(table_name, con=engine, schema=schema, if_exists=if_exists, index=False)
+    finally:
+        engine.dispose()
@@ -0,0 +1,229 @@
+"""
+Company and location canonicalization.
+
+Raw values ("Agoda Services Co., Ltd.", "Bangkok, Thailand", ...) are mapped to
+integer IDs kept in two dictionary tables:
+
+    "IT_jobs"."canonical_entity"  id, kind ('company' / 'location'), country, key, name
+    "IT_jobs"."canonical_alias"   kind, country, raw value -> entity_id
+
+A raw value is resolved by, in order: its alias, an entity with the same
+normalized key, then a fuzzy match (rapidfuzz, a requirement; the slow difflib
+fallback is only meant for local runs without it, and says so once in the log)
+among entities of the same country whose key shares the first two characters.
+Only distinct values never seen before reach the fuzzy step, and the dictionary
+is loaded once per process. Without a database URL the dictionary is kept in memory only.
+"""
+import difflib
+import re
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from utils.logger import get_module_logger
+
+logger = get_module_logger(__name__, group='transform')
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # pragma: no cover - local runs without requirements.txt
+    fuzz = process = None
+
+_fallback_logged = False
+
+
+def _log_fallback():
+    global _fallback_logged
+    if not _fallback_logged:
+        _fallback_logged = True
+        logger.warning("rapidfuzz is not installed; fuzzy matching falls back to difflib, "
+                       "which is much slower (pip install -r requirements.txt)")
+
+SCHEMA = "IT_jobs"
+## Minimum similarity (0-100) for a fuzzy match; place names differ by a letter or two
+## ('Bang Khen' / 'Bang Khae'), so locations only merge near-identical spellings
+FUZZY_CUTOFFS = {'company': 92, 'location': 97}
+
+_NON_WORD = re.compile("[^0-9a-z\u0e00-\u0e7f\u1000-\u109f]+")  # keeps Thai and Myanmar letters
+MISSING_VALUES = {'', 'n/a', 'na', 'none', 'null', '-'}
+COMPANY_SUFFIXES = {
+    'pte', 'ltd', 'limited', 'co', 'company', 'inc', 'llc', 'plc', 'corp', 'corporation',
+    'sdn', 'bhd', 'berhad', 'public', 'pcl', 'group', 'the',
+}
+COUNTRY_NAMES = {'TH': 'thailand', 'MY': 'malaysia', 'SG': 'singapore', 'MM': 'myanmar'}
+
+
+def words(text):
+    """
+    Lowercased word tokens; placeholders such as 'N/A' give no words.
+    """
+    if not isinstance(text, str) or text.strip().lower() in MISSING_VALUES:
+        return []
+    return [w for w in _NON_WORD.split(text.lower()) if w]
+
+
+def company_key(name, country=None):
+    return ' '.join(w for w in words(name) if w not in COMPANY_SUFFIXES)
+
+
+def location_key(location, country=None):
+    # 'Bangkok, Thailand' -> 'bangkok'; a bare 'Singapore' stays as it is
+    parts = [' '.join(words(part)) for part in str(location).split(',')] if isinstance(location, str) else []
+    parts = [p for p in parts if p]
+    country_name = COUNTRY_NAMES.get(str(country).upper())
+    if len(parts) > 1 and parts[-1] == country_name:
+        parts = parts[:-1]
+    return ', '.join(parts)
+
+
+KEY_FUNCTIONS = {'company': company_key, 'location': location_key}
+
+
+def _similarity(a, b):
+    if fuzz is not None:
+        return fuzz.token_sort_ratio(a, b)
+    return difflib.SequenceMatcher(None, a, b).ratio() * 100
+
+
+class Canonicalizer:
+    """
+    Dictionary for one kind of value, loaded once and extended as new values arrive.
+    """
+
+    def __init__(self, kind, database_url=None):
+        self.kind = kind
+        self.key_func = KEY_FUNCTIONS[kind]
+        self.cutoff = FUZZY_CUTOFFS[kind]
+        self.engine = create_engine(database_url) if database_url else None
+        self.aliases = {}   # (country, raw) -> id
+        self.by_key = {}    # (country, key) -> id
+        self.blocks = {}    # (country, key[:2]) -> [key, ...]
+        self._next_local_id = -1
+        if self.engine is not None:
+            self._load()
+
+    def _load(self):
+        with self.engine.begin() as conn:
+            conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA}"'))
+            conn.execute(text(
+                f'CREATE TABLE IF NOT EXISTS "{SCHEMA}".canonical_entity ('
+                " id serial PRIMARY KEY, kind varchar(16) NOT NULL, country varchar(8) NOT NULL DEFAULT '',"
+                " key text NOT NULL, name text NOT NULL, UNIQUE (kind, country, key))"
+            ))
+            conn.execute(text(
+                f'CREATE TABLE IF NOT EXISTS "{SCHEMA}".canonical_alias ('
+                " kind varchar(16) NOT NULL, country varchar(8) NOT NULL DEFAULT '', raw text NOT NULL,"
+                f' entity_id integer NOT NULL REFERENCES "{SCHEMA}".canonical_entity (id),'
+                " PRIMARY KEY (kind, country, raw))"
+            ))
+            for entity_id, country, key in conn.execute(text(
+                f'SELECT id, country, key FROM "{SCHEMA}".canonical_entity WHERE kind = :kind'
+            ), {"kind": self.kind}):
+                self._remember_entity(entity_id, country, key)
+            for country, raw, entity_id in conn.execute(text(
+                f'SELECT country, raw, entity_id FROM "{SCHEMA}".canonical_alias WHERE kind = :kind'
+            ), {"kind": self.kind}):
+                self.aliases[(country, raw)] = entity_id
+        logger.info(f"Loaded {len(self.by_key)} {self.kind} entities, {len(self.aliases)} aliases")
+
+    def _remember_entity(self, entity_id, country, key):
+        self.by_key[(country, key)] = entity_id
+        self.blocks.setdefault((country, key[:2]), []).append(key)
+
+    def _fuzzy(self, country, key):
+        choices = self.blocks.get((country, key[:2]))
+        if not choices:
+            return None
+        if process is not None:
+            match = process.extractOne(key, choices, scorer=fuzz.token_sort_ratio, score_cutoff=self.cutoff)
+            return match[0] if match else None
+        _log_fallback()
+        best = max(choices, key=lambda choice: _similarity(key, choice))
+        return best if _similarity(key, best) >= self.cutoff else None
+
+    def _new_entity(self, conn, country, key, name):
+        if conn is None:
+            entity_id, self._next_local_id = self._next_local_id, self._next_local_id - 1
+        else:
+            entity_id = conn.execute(text(
+                f'INSERT INTO "{SCHEMA}".canonical_entity (kind, country, key, name) '
+                "VALUES (:kind, :country, :key, :name) "
+                "ON CONFLICT (kind, country, key) DO UPDATE SET key = EXCLUDED.key RETURNING id"
+            ), {"kind": self.kind, "country": country, "key": key, "name": name}).scalar()
+        self._remember_entity(entity_id, country, key)
+        return entity_id
+
+    def resolve(self, pairs):
+        """
+        IDs for distinct (raw value, country) pairs; None for missing values.
+        New entities and aliases are written in one transaction.
+        """
+        ids, new_aliases = [], []
+        conn = self.engine.connect() if self.engine is not None else None
+        try:
+            for raw, country in pairs:
+                country = '' if pd.isna(country) else str(country)
+                if not isinstance(raw, str):
+                    ids.append(None)
+                    continue
+                entity_id = self.aliases.get((country, raw))
+                if entity_id is None:
+                    key = self.key_func(raw, country)
+                    if not key:
+                        ids.append(None)
+                        continue
+                    entity_id = self.by_key.get((country, key))
+                    if entity_id is None:
+                        match = self._fuzzy(country, key)
+                        entity_id = (self.by_key[(country, match)] if match is not None
+                                     else self._new_entity(conn, country, key, raw.strip()))
+                    self.aliases[(country, raw)] = entity_id
+                    new_aliases.append({"kind": self.kind, "country": country, "raw": raw, "entity_id": entity_id})
+                ids.append(entity_id)
+            if conn is not None:
+                if new_aliases:
+                    conn.execute(text(
+                        f'INSERT INTO "{SCHEMA}".canonical_alias (kind, country, raw, entity_id) '
+                        "VALUES (:kind, :country, :raw, :entity_id) ON CONFLICT DO NOTHING"
+                    ), new_aliases)
+                conn.commit()
+        finally:
+            if conn is not None:
+                conn.close()
+        if new_aliases:
+            logger.info(f"Added {len(new_aliases)} new {self.kind} aliases")
+        return ids
+
+    def map_series(self, values: pd.Series, countries: pd.Series) -> pd.Series:
+        """
+        Canonical IDs for a column, resolved once per distinct (value, country).
+        """
+        pairs = pd.Series(list(zip(values.astype(object), countries.astype(object))), index=values.index)
+        codes, uniques = pd.factorize(pairs, use_na_sentinel=False)
+        resolved = pd.array(self.resolve(uniques), dtype="Int64")
+        return pd.Series(resolved.take(codes), index=values.index)
+
+
+_canonicalizers = {}
+
+
+def get_canonicalizer(kind, database_url=None):
+    """
+    Process-wide cached Canonicalizer per (kind, database).
+    """
+    if (kind, database_url) not in _canonicalizers:
+        _canonicalizers[(kind, database_url)] = Canonicalizer(kind, database_url)
+    return _canonicalizers[(kind, database_url)]
+
+
+def canonicalize(df: pd.DataFrame, database_url=None) -> pd.DataFrame:
+    """
+    Add company_id and location_id columns to a transformed frame.
+    """
+    if df.empty:
+        return df.assign(company_id=pd.array([], dtype="Int64"), location_id=pd.array([], dtype="Int64"))
+    countries = df['country'] if 'country' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    return df.assign(
+        company_id=get_canonicalizer('company', database_url).map_series(df['company'], countries),
+        location_id=get_canonicalizer('location', database_url).map_series(df['location'], countries),
+    )
@@ -0,0 +1,229 @@
+"""
+Compiled keyword index for categories.json.
+
+`python -m utils.category_index` (or the first load after categories.json
+changes) writes two files to build/:
+
+    categories.idx.npy   token x category weight matrix (float64), memory-mapped on load
+    categories.idx.json  checksum of the source JSON and of the .npy, category order,
+                         token vocabulary and the manual-lookup keywords in priority order
+
+Both files are written under process/thread-unique temp names and renamed
+into place, the .npy first; a load whose .npy does not match the checksum in
+the .json (e.g. several processes rebuilding at once) rebuilds in memory.
+
+Scoring a title is then a sum of a few weight rows instead of a scan over
+every (category, token) pair, a batch of titles is one sparse title x token
+product with that matrix, and manual lookups are one regex pass.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CATEGORY_FILE = BASE_DIR / "categories.json"
+BUILD_DIR = BASE_DIR / "build"
+
+
+def _checksum(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _artifact_paths(json_path: Path, build_dir: Path):
+    stem = json_path.stem
+    return build_dir / f"{stem}.idx.npy", build_dir / f"{stem}.idx.json"
+
+
+def _file_checksum(path: Path) -> str:
+    return _checksum(path.read_bytes())
+
+
+def _replace_atomically(path: Path, write):
+    # Unique per process and thread, so concurrent builds never share a temp file
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+    try:
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _compile(raw: bytes):
+    """
+    (weights, meta) for the raw bytes of categories.json; meta has no weights checksum yet.
+    """
+    category_data = json.loads(raw)
+    categories = category_data["categories"]
+
+    category_names = list(categories)
+    vocab = {}
+    for keywords in categories.values():
+        for token in keywords:
+            vocab.setdefault(token, len(vocab))
+
+    weights = np.zeros((len(vocab), len(category_names)), dtype=np.float64)
+    for col, keywords in enumerate(categories.values()):
+        for token, weight in keywords.items():
+            weights[vocab[token], col] = weight
+
+    # Same flattening (and duplicate-keyword resolution) as the transforms' dict
+    manual_lookup_flat = {
+        kw.lower(): category
+        for category, keywords in category_data.get("manual_role_lookup", {}).items()
+        for kw in keywords
+    }
+
+    meta = {
+        "checksum": _checksum(raw),
+        "categories": category_names,
+        "vocab": list(vocab),
+        "manual_lookup": list(manual_lookup_flat.items()),
+    }
+    return weights, meta
+
+
+def _write(weights, meta, npy_path: Path, meta_path: Path):
+    # The .npy goes into place first; the .json then names its checksum
+    _replace_atomically(npy_path, lambda f: np.save(f, weights))
+    meta = dict(meta, weights_checksum=_file_checksum(npy_path))
+    _replace_atomically(meta_path, lambda f: f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8")))
+    return meta
+
+
+def build_index(json_path=CATEGORY_FILE, build_dir=BUILD_DIR):
+    """
+    Compile categories.json into the weight matrix and metadata files.
+    """
+    json_path, build_dir = Path(json_path), Path(build_dir)
+    weights, meta = _compile(json_path.read_bytes())
+    build_dir.mkdir(parents=True, exist_ok=True)
+    npy_path, meta_path = _artifact_paths(json_path, build_dir)
+    _write(weights, meta, npy_path, meta_path)
+    return npy_path, meta_path
+
+
+class CategoryIndex:
+    """
+    Loaded (memory-mapped) keyword index.
+    """
+
+    def __init__(self, weights, categories, vocab, manual_lookup, checksum):
+        self.weights = weights
+        self.categories = categories
+        self.vocab = {token: row for row, token in enumerate(vocab)}
+        self.checksum = checksum
+        self.manual_lookup = manual_lookup
+        self.manual_categories = [category for _, category in manual_lookup]
+        # Lookahead alternation in priority order: at each position the regex reports the
+        # highest-priority keyword starting there, so the minimum over all positions is the
+        # keyword the ordered dict scan would have returned first.
+        keywords = [kw for kw, _ in manual_lookup if kw]
+        self._priority = {kw: i for i, (kw, _) in enumerate(manual_lookup)}
+        self._empty_priority = self._priority.get('')  # '' is "in" every string
+        self._manual_pattern = (
+            re.compile("(?=(" + "|".join(re.escape(kw) for kw in keywords) + "))")
+            if keywords else None
+        )
+
+    def match_manual(self, text):
+        if not text:
+            return None
+        if self._manual_pattern is None:
+            return None if self._empty_priority is None else self.manual_categories[self._empty_priority]
+        best = self._empty_priority
+        for match in self._manual_pattern.finditer(text.lower()):
+            priority = self._priority[match.group(1)]
+            if best is None or priority < best:
+                best = priority
+        return None if best is None else self.manual_categories[best]
+
+    def score(self, tokens) -> np.ndarray:
+        scores = np.zeros(len(self.categories), dtype=np.float64)
+        for token in tokens:
+            row = self.vocab.get(token)
+            if row is not None:
+                scores += self.weights[row]  # Token order kept, same sums as the dict scan
+        return scores
+
+    def score_batch(self, token_lists) -> np.ndarray:
+        """
+        Scores for many titles at once: a sparse (COO) title x token matrix
+        times the token x category weights, returned as a dense (titles, categories) array.
+        """
+        title_ids, token_rows = [], []
+        for title_id, tokens in enumerate(token_lists):
+            for token in tokens:
+                row = self.vocab.get(token)
+                if row is not None:
+                    title_ids.append(title_id)
+                    token_rows.append(row)
+        scores = np.zeros((len(token_lists), len(self.categories)), dtype=np.float64)
+        if token_rows:
+            # Unbuffered, in-order accumulation: same sums as scoring titles one by one
+            np.add.at(scores, np.asarray(title_ids, dtype=np.intp), self.weights[np.asarray(token_rows, dtype=np.intp)])
+        return scores
+
+    def best_categories(self, token_lists, threshold=1.5, default="Other") -> np.ndarray:
+        """
+        Vectorized best_category over a batch of token lists.
+        """
+        result = np.full(len(token_lists), default, dtype=object)
+        if not self.categories or not len(token_lists):
+            return result
+        scores = self.score_batch(token_lists)
+        best = scores.argmax(axis=1)
+        passed = scores[np.arange(len(best)), best] >= threshold
+        result[passed] = np.asarray(self.categories, dtype=object)[best[passed]]
+        return result
+
+    def best_category(self, tokens, threshold=1.5, default="Other"):
+        if not self.categories:
+            return default
+        scores = self.score(tokens)
+        best = int(np.argmax(scores))  # First category wins ties, like max() over the dict
+        return self.categories[best] if scores[best] >= threshold else default
+
+
+@lru_cache(maxsize=None)
+def load_index(json_path=None, build_dir=None) -> CategoryIndex:
+    """
+    Load the compiled index, rebuilding it first if categories.json changed.
+    """
+    json_path = Path(json_path) if json_path else CATEGORY_FILE
+    if not json_path.is_absolute() and not json_path.exists():
+        json_path = BASE_DIR / json_path
+    build_dir = Path(build_dir) if build_dir else BUILD_DIR
+    npy_path, meta_path = _artifact_paths(json_path, build_dir)
+
+    raw = json_path.read_bytes()
+    meta = None
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("checksum") != _checksum(raw) or meta.get("weights_checksum") != _file_checksum(npy_path):
+            meta = None
+    except (OSError, ValueError):
+        meta = None
+
+    if meta is None:
+        # Stale, missing or mid-rebuild: compile here and use the arrays we built,
+        # so a concurrent build can't hand us another build's files
+        weights, meta = _compile(raw)
+        build_dir.mkdir(parents=True, exist_ok=True)
+        _write(weights, meta, npy_path, meta_path)
+    else:
+        weights = np.load(npy_path, mmap_mode="r")
+    return CategoryIndex(weights, meta["categories"], meta["vocab"],
+                         [tuple(item) for item in meta["manual_lookup"]], meta["checksum"])
+
+
+if __name__ == "__main__":
+    npy, meta = build_index()
+    print(f"Wrote {npy} and {meta}")
@@ -1,6 +1,89 @@
+import functools
+import re
+from datetime import datetime, timedelta
+
+import numpy as np
 import pandas as pd
+from utils.factorize import map_unique
+from utils.job_record import apply_categoricals
+from utils.lineage import LINEAGE_COLUMNS
+
+## Copy-on-write is always on from pandas 3. On older versions the normalizer
+## methods turn it on for their own duration only (not for the whole process), so
+## selecting/renaming columns below shares memory with the scraper's frame.
+_PANDAS_MAJOR = int(pd.__version__.split('.')[0])
+
+
+def copy_on_write(method):
+    if _PANDAS_MAJOR >= 3:
+        return method
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with pd.option_context("mode.copy_on_write", True):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def constant_column(value, length: int) -> pd.Categorical:
+    """
+    A constant column stored as a categorical: one byte per row instead of one pointer.
+    """
+    if value is None:
+        return pd.Categorical.from_codes(np.full(length, -1, dtype=np.int8), categories=[])
+    return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), categories=[value])
+
+
+def blank_to_na(series: pd.Series) -> pd.Series:
+    """
+    Replace '' with missing; for categoricals this only touches the categories.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        if '' in series.cat.categories:
+            return series.cat.remove_categories([''])
+        return series
+    return series.replace('', pd.NA)
+
+
+def fill_missing(series: pd.Series, value) -> pd.Series:
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+
+## Parse 'date_posted' and convert to full UTC datetime
+def parse_date_posted(text):
+    try:
+        match = re.search(r'(\d+)([a-z]+)', text.lower())
+        if not match:
+            return None
+        value, unit = int(match.group(1)), match.group(2)
+        now = datetime.utcnow()
+        if unit == 's':  # seconds
+            return (now - timedelta(seconds=value)).isoformat() + 'Z'
+        elif unit == 'm':  # minutes
+            return (now - timedelta(minutes=value)).isoformat() + 'Z'
+        elif unit == 'h':  # hours
+            return (now - timedelta(hours=value)).isoformat() + 'Z'
+        elif unit == 'd':  # days
+            return (now - timedelta(days=value)).isoformat() + 'Z'
+        elif unit == 'mo':  # months (approximate)
+            return (now - timedelta(days=30 * value)).isoformat() + 'Z'
+        else:
+            return None
+    except Exception:
+        return None
+
 
 class JobDataNormalizer:
+    """
+    Maps each scraper's frame onto the standard schema.
+
+    The standard frame is assembled directly from the scraper's columns
+    (shared, not copied, under copy-on-write); only columns that are actually
+    rewritten get new memory, and constant columns are one-byte categoricals.
+    Frames with the legacy raw column names (Title, job_title, ...) are still accepted.
+    """
 
     def __init__(self):
         self.standard_cols = [
@@ -9,35 +92,56 @@ class JobDataNormalizer:
             'job_link', 'country', 'source'
         ]
 
+    def _build(self, df: pd.DataFrame, renames: dict, constants: dict, extra_cols=()) -> pd.DataFrame:
+        """
+        Build the standard-schema frame from `df` without copying its columns.
+        `renames` maps legacy raw names to standard ones; `constants` fills
+        columns that are the same for every row of the source. Lineage
+        columns (run_id, page_ref, position) are passed through when present.
+        """
+        raw_for = {standard: raw for raw, standard in renames.items()}
+        columns = {}
+        for col in self.standard_cols + list(extra_cols):
+            if col in constants:
+                columns[col] = constant_column(constants[col], len(df))
+            elif col in df.columns:
+                columns[col] = df[col]
+            elif raw_for.get(col) in df.columns:
+                columns[col] = df[raw_for[col]]
+            else:
+                columns[col] = constant_column(None, len(df))
+        for col in LINEAGE_COLUMNS:
+            if col in df.columns:
+                columns[col] = df[col]
+        return pd.DataFrame(columns, index=df.index, copy=False)
+
     ## Jobnet Myanmar
+    @copy_on_write
     def jobnetmm(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Normalize the job data from JobNet Myanmar.
         """
-        df = df.rename(columns={
+        return self._build(df, renames={
             'Title': 'title',
             'Company': 'company',
             'Location': 'location',
             'Salary': 'salary',
             'Date_Posted': 'date_posted',
             'Job_Link': 'job_link'
+        }, constants={
+            'country': 'MM',
+            'job_type': None,
+            'work_arrangement': None,
+            'source': 'jobnetmm',
         })
-        df['country'] = 'MM'
-        df['job_type'] = None
-        df['work_arrangement'] = None
-        df['source'] = 'jobnetmm'
-        return df[self.standard_cols]
-    
+
     ## JobsDB Singapore
+    @copy_on_write
     def jobsdbsg(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Normalize the job data from JobsDB Singapore.
         """
-        import re
-        from datetime import datetime, timedelta
-
-        # Rename columns to standard format
-        df = df.rename(columns={
+        out = self._build(df, renames={
             'Title': 'title',
             'Category': 'category',
             'Company': 'company',
@@ -47,107 +151,63 @@ class JobDataNormalizer:
             'Work_Arrangement': 'work_arrangement',
             'Job_Link': 'job_link',
             'Date_Posted': 'date_posted'
-        })
+        }, constants={
+            'country': 'SG',
+            'source': 'jobsdbsg',
+        }, extra_cols=['category'])
+
+        # Fill missing salary, job_type, company and work_arrangement
+        for col in ['salary', 'job_type', 'company', 'work_arrangement']:
+            out[col] = blank_to_na(out[col])
+
+        # Relative dates ('3d ago') to full UTC timestamps, once per distinct label
+        out['date_posted'] = map_unique(out['date_posted'], parse_date_posted)
+        return out
 
-        df['country'] = 'SG'
-        df['source'] = 'jobsdbsg'
-
-        # Fill missing salary and job_type
-        df['salary'] = df['salary'].replace('', pd.NA)
-        df['job_type'] = df['job_type'].replace('', pd.NA)
-        df['company'] = df['company'].replace('', pd.NA)
-        # Fill missing or empty work_arrangement
-        df['work_arrangement'] = df['work_arrangement'].replace('', pd.NA)
-
-        # Parse 'date_posted' and convert to full UTC datetime
-        def parse_date_posted(text):
-            try:
-                match = re.search(r'(\d+)([a-z]+)', text.lower())
-                if not match:
-                    return None
-                value, unit = int(match.group(1)), match.group(2)
-                now = datetime.utcnow()
-                if unit == 's':  # seconds
-                    return (now - timedelta(seconds=value)).isoformat() + 'Z'
-                elif unit == 'm':  # minutes
-                    return (now - timedelta(minutes=value)).isoformat() + 'Z'
-                elif unit == 'h':  # hours
-                    return (now - timedelta(hours=value)).isoformat() + 'Z'
-                elif unit == 'd':  # days
-                    return (now - timedelta(days=value)).isoformat() + 'Z'
-                elif unit == 'mo':  # months (approximate)
-                    return (now - timedelta(days=30 * value)).isoformat() + 'Z'
-                else:
-                    return None
-            except Exception:
-                return None
-
-        df['date_posted'] = df['date_posted'].apply(parse_date_posted)
-
-        return df[self.standard_cols + ['category']]
-    
     ## JobsDB Thailand
+    @copy_on_write
     def jobsdbth(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Normalize the job data from JobsDB Thailand.
         """
-        df = df.rename(columns={
-            'job_title': 'title',
-            'company': 'company',
-            'location': 'location',
-            'salary': 'salary',
-            'job_type': 'job_type',
-            'work_arrangement': 'work_arrangement',
-            'date_posted': 'date_posted',
-            'job_link': 'job_link'
-        })
-        df['country'] = df['country_code']
-        df['source'] = 'jobsdbth'
-        return df[self.standard_cols]
-    
-        
+        renames = {'job_title': 'title'}
+        if 'country_code' in df.columns:
+            renames['country_code'] = 'country'
+        out = self._build(df, renames=renames, constants={'source': 'jobsdbth'})
+        return out
+
     ## Foundit Singapore
+    @copy_on_write
     def founditsg(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Normalize the job data from Foundit Singapore.
         """
-        df = df.rename(columns={
-            'title': 'title',
+        return self._build(df, renames={
             'companyName': 'company',
             'locations': 'location',
-            'salary': 'salary',
             'employmentTypes': 'job_type',
             'updatedAt': 'date_posted',
             'seoJdUrl': 'job_link',
             'roles': 'category'
-        })
-        
-        df['country'] = 'SG'
-        df['work_arrangement'] = None
-        df['source'] = 'founditsg'
-        return df[self.standard_cols+ ['category']]
+        }, constants={
+            'country': 'SG',
+            'work_arrangement': None,
+            'source': 'founditsg',
+        }, extra_cols=['category'])
 
-    
     ## JobStreet Malaysia
+    @copy_on_write
     def jobstreetmalay(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Normalize the job data from JobStreet Malaysia.
         """
-        df = df.rename(columns={
-            'job_title': 'title',
-            'company': 'company',
-            'location': 'location',
-            'salary': 'salary',
-            'job_type': 'job_type',
-            'work_arrangement': 'work_arrangement',
-            'date_posted': 'date_posted',
-            'job_link': 'job_link'
-        })
-    
-        df['country'] = df['country_code']
-        df['source'] = 'jobstreetmalay'
-    
+        renames = {'job_title': 'title'}
+        if 'country_code' in df.columns:
+            renames['country_code'] = 'country'
+        out = self._build(df, renames=renames, constants={'source': 'jobstreetmalay'})
+
         # Replace empty strings with NaN, then fill all NaNs with 'N/A'
-        df = df.replace('', pd.NA).fillna('N/A')
-    
-        return df[self.standard_cols]
\ No newline at end of file
+        for col in out.columns:
+            if col != 'source' and col not in LINEAGE_COLUMNS:
+                out[col] = fill_missing(blank_to_na(out[col]), 'N/A')
+        return apply_categoricals(out)
@@ -0,0 +1,227 @@
+"""
+Cross-source near-duplicate detection (MinHash + LSH banding).
+
+Each posting is fingerprinted as a set of field-tagged tokens (normalized
+title, company, location, level and salary range), reduced to a MinHash signature,
+and split into bands. Postings that share a band bucket are candidates; a
+candidate whose signatures agree on at least `threshold` of the hashes
+(estimated Jaccard similarity) is a duplicate.
+
+Recent postings live in an on-disk SQLite index (postings + band buckets),
+so a daily batch is only compared against candidates from history, not the
+whole table. Entries older than `retention_days` are pruned.
+
+    index = NearDuplicateIndex()
+    fresh_df = index.filter(fresh_df)   # drops near-duplicates of history / earlier rows
+    ...save fresh_df...
+    index.register()                     # only then remember the kept rows
+"""
+import hashlib
+import os
+import sqlite3
+import zlib
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from utils.canonical import COMPANY_SUFFIXES, words
+from utils.logger import get_module_logger
+
+logger = get_module_logger(__name__, group='transform')
+
+DEDUP_INDEX_ENV = "ETL_DEDUP_INDEX"
+DEFAULT_INDEX_PATH = os.path.join("output", "dedup_index.sqlite")
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _amount(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):  # None, 'Negotiable', ...
+        return None
+    return None if np.isnan(value) else int(value)
+
+
+def _salary_token(row):
+    low, high, currency = _amount(row.get('min_salary')), _amount(row.get('max_salary')), row.get('currency')
+    if low is None and high is None:
+        return None
+    return f"s:{'' if low is None else low}-{'' if high is None else high}{'' if pd.isna(currency) else currency}"
+
+
+def fingerprint(row) -> set:
+    """
+    Field-tagged token set for one posting (dict-like with the transformed columns).
+    """
+    # Title words, word pairs and the whole title, so the title outweighs company/location
+    title_words = words(row.get('title'))
+    tokens = {f"t:{w}" for w in title_words}
+    tokens |= {f"t2:{a} {b}" for a, b in zip(title_words, title_words[1:])}
+    if title_words:
+        tokens.add(f"tt:{' '.join(title_words)}")
+    tokens |= {f"c:{w}" for w in words(row.get('company')) if w not in COMPANY_SUFFIXES}
+    # One location token (the broadest part, e.g. 'Khlong Toei, Bangkok' -> bangkok), so
+    # a role reposted for another country differs by one token, not by every address word
+    place = words(str(row.get('location') or '').split(',')[-1])
+    if place:
+        tokens.add(f"l:{' '.join(place)}")
+    level = row.get('level')
+    if isinstance(level, str) and level:
+        tokens.add(f"v:{level.lower()}")  # Keeps e.g. Senior vs Junior openings apart
+    salary = _salary_token(row)
+    if salary:
+        tokens.add(salary)
+    return tokens
+
+
+class MinHasher:
+    """
+    MinHash over 32-bit token hashes with `num_perm` universal hash functions
+    (a * x + b mod 2^61 - 1), seeded so signatures are stable across runs.
+    """
+
+    def __init__(self, num_perm=128, seed=1):
+        rng = np.random.RandomState(seed)
+        # a, b < 2^31 keep a * x + b inside uint64 for 32-bit x
+        self.a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, tokens) -> np.ndarray:
+        if not tokens:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        hashed = np.fromiter((zlib.crc32(t.encode('utf-8')) for t in tokens), dtype=np.uint64, count=len(tokens))
+        values = (np.outer(hashed, self.a) + self.b) % _MERSENNE_PRIME & _MAX_HASH
+        return values.min(axis=0).astype(np.uint32)
+
+
+def _bucket(band_values: np.ndarray) -> int:
+    return int.from_bytes(hashlib.blake2b(band_values.tobytes(), digest_size=8).digest(), 'big', signed=True)
+
+
+class NearDuplicateIndex:
+    """
+    On-disk LSH index of recent postings.
+    """
+
+    def __init__(self, path=None, num_perm=128, bands=32, threshold=0.8, retention_days=60):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = path or os.getenv(DEDUP_INDEX_ENV, DEFAULT_INDEX_PATH)
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.retention_days = retention_days
+        self._pending = []
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "  id INTEGER PRIMARY KEY, source TEXT, job_link TEXT, signature BLOB, seen_date TEXT);"
+            "CREATE TABLE IF NOT EXISTS bands (band INTEGER, bucket INTEGER, posting_id INTEGER);"
+            "CREATE INDEX IF NOT EXISTS bands_lookup ON bands (band, bucket);"
+            "CREATE INDEX IF NOT EXISTS bands_posting ON bands (posting_id);"
+            "CREATE INDEX IF NOT EXISTS postings_seen ON postings (seen_date);"
+        )
+
+    def _band_keys(self, signature):
+        return [_bucket(signature[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+    def _history_candidates(self, keys_per_row):
+        """
+        {batch row -> set(posting ids)} sharing at least one band bucket, via one indexed join.
+        """
+        cur = self.conn.cursor()
+        cur.execute("CREATE TEMP TABLE IF NOT EXISTS query_keys (row INTEGER, band INTEGER, bucket INTEGER)")
+        cur.execute("DELETE FROM query_keys")
+        cur.executemany("INSERT INTO query_keys VALUES (?, ?, ?)",
+                        ((row, band, key) for row, keys in enumerate(keys_per_row) for band, key in enumerate(keys)))
+        candidates = {}
+        for row, posting_id in cur.execute(
+            "SELECT DISTINCT q.row, b.posting_id FROM query_keys q "
+            "JOIN bands b ON b.band = q.band AND b.bucket = q.bucket"
+        ):
+            candidates.setdefault(row, set()).add(posting_id)
+        return candidates
+
+    def _signatures_by_id(self, ids):
+        ids = list(ids)
+        found = {}
+        for start in range(0, len(ids), 500):
+            part = ids[start:start + 500]
+            query = f"SELECT id, signature FROM postings WHERE id IN ({','.join('?' * len(part))})"
+            for posting_id, blob in self.conn.execute(query, part):
+                found[posting_id] = np.frombuffer(blob, dtype=np.uint32)
+        return found
+
+    def _similar(self, a, b):
+        return np.count_nonzero(a == b) / len(a) >= self.threshold
+
+    def filter(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drop rows that near-duplicate a posting in the index or an earlier row of `df`.
+        Kept rows are held until register() is called.
+        """
+        if df.empty:
+            return df
+        records = df.to_dict('records')
+        fingerprints = [fingerprint(r) for r in records]
+        signatures = [self.hasher.signature(tokens) for tokens in fingerprints]
+        keys_per_row = [self._band_keys(sig) for sig in signatures]
+
+        history = self._history_candidates(keys_per_row)
+        history_sigs = self._signatures_by_id(set().union(*history.values())) if history else {}
+
+        keep = np.ones(len(records), dtype=bool)
+        batch_buckets = {}
+        for row, (sig, keys) in enumerate(zip(signatures, keys_per_row)):
+            if not any(token.startswith('c:') for token in fingerprints[row]):
+                continue  # Without a company, title + location alone is too weak to call a duplicate
+            if any(self._similar(sig, history_sigs[pid]) for pid in history.get(row, ()) if pid in history_sigs):
+                keep[row] = False
+                continue
+            earlier = {other for band, key in enumerate(keys) for other in batch_buckets.get((band, key), ())}
+            if any(self._similar(sig, signatures[other]) for other in earlier):
+                keep[row] = False
+                continue
+            for band, key in enumerate(keys):
+                batch_buckets.setdefault((band, key), []).append(row)
+            self._pending.append((records[row].get('source'), records[row].get('job_link'), sig, keys))
+
+        dropped = int((~keep).sum())
+        if dropped:
+            logger.info(f"Dropped {dropped} near-duplicate postings out of {len(df)}")
+        return df[keep]
+
+    def register(self, seen_date=None):
+        """
+        Add the rows kept by filter() to the index and prune old entries.
+        """
+        seen_date = (seen_date or datetime.now(timezone.utc)).strftime("%Y-%m-%d")
+        with self.conn:
+            for source, job_link, sig, keys in self._pending:
+                cur = self.conn.execute(
+                    "INSERT INTO postings (source, job_link, signature, seen_date) VALUES (?, ?, ?, ?)",
+                    (source, job_link, sig.tobytes(), seen_date),
+                )
+                self.conn.executemany("INSERT INTO bands VALUES (?, ?, ?)",
+                                      ((band, key, cur.lastrowid) for band, key in enumerate(keys)))
+        logger.info(f"Registered {len(self._pending)} postings in {self.path}")
+        self._pending = []
+        self.prune()
+
+    def prune(self):
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM bands WHERE posting_id IN (SELECT id FROM postings WHERE seen_date < ?)", (cutoff,)
+            )
+            self.conn.execute("DELETE FROM postings WHERE seen_date < ?", (cutoff,))
+
+    def close(self):
+        self.conn.close()
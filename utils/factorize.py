@@ -0,0 +1,39 @@
+"""
+Per-distinct-value mapping for the normalizer and the transforms.
+"""
+import numpy as np
+import pandas as pd
+
+
+def map_unique(series: pd.Series, func) -> pd.Series:
+    """
+    Apply `func` once per distinct value of `series` and broadcast the results back.
+
+    Job boards repeat the same titles, salary labels and dates many times, so
+    factorizing first turns a per-row apply into a per-unique-value one.
+    Missing values are passed to `func` once, like any other value.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    results = np.empty(len(uniques), dtype=object)
+    for i, value in enumerate(uniques):
+        results[i] = func(value)
+    return pd.Series(results[codes], index=series.index)
+
+
+def map_unique_columns(series: pd.Series, func, columns, infer_dtypes: bool = False) -> pd.DataFrame:
+    """
+    Like map_unique for a `func` returning a tuple; returns one column per tuple item.
+
+    With `infer_dtypes`, columns are inferred the way `.apply(pd.Series)` does
+    (e.g. ints with missing values become float), otherwise they stay as built.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    results = [func(value) for value in uniques]
+    if infer_dtypes and results:
+        frame = pd.Series(results, dtype=object).apply(pd.Series)
+        frame.columns = columns
+    else:
+        frame = pd.DataFrame(results, columns=columns)
+    frame = frame.take(codes)
+    frame.index = series.index
+    return frame
@@ -0,0 +1,80 @@
+import pandas as pd
+from utils.arrow_backend import arrow_enabled, columns_to_arrow_frame
+from utils.lineage import RUN_ID
+
+## Low-cardinality columns stored as pandas categoricals
+## (page_ref repeats once per page, run_id once per run)
+CATEGORICAL_COLUMNS = ['source', 'country', 'currency', 'job_type', 'work_arrangement', 'category', 'level',
+                       'run_id', 'page_ref']
+
+
+class JobRecord:
+    """
+    One scraped job, already projected to the normalized schema.
+
+    Uses __slots__ so a large crawl holds a handful of pointers per job
+    instead of a dict (or the full raw API payload) per job.
+    `page_ref` is the exact request the job came from (shared by every job
+    of that page) and `position` its index on the page, for lineage.
+    """
+    __slots__ = (
+        'title', 'company', 'location', 'salary',
+        'job_type', 'work_arrangement', 'date_posted',
+        'job_link', 'country', 'source', 'category',
+        'page_ref', 'position'
+    )
+
+    def __init__(self, title=None, company=None, location=None, salary=None,
+                 job_type=None, work_arrangement=None, date_posted=None,
+                 job_link=None, country=None, source=None, category=None,
+                 page_ref=None, position=None):
+        self.title = title
+        self.company = company
+        self.location = location
+        self.salary = salary
+        self.job_type = job_type
+        self.work_arrangement = work_arrangement
+        self.date_posted = date_posted
+        self.job_link = job_link
+        self.country = country
+        self.source = source
+        self.category = category
+        self.page_ref = page_ref
+        self.position = position
+
+    def __repr__(self):
+        return f"JobRecord(source={self.source!r}, title={self.title!r}, job_link={self.job_link!r})"
+
+
+def join_list(value, sep=', '):
+    """
+    Flatten list-valued API fields (e.g. Foundit's employmentTypes) into a string.
+    """
+    if isinstance(value, (list, tuple)):
+        return sep.join(map(str, value))
+    return value
+
+
+def apply_categoricals(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the low-cardinality columns present in `df` to categorical dtype.
+    """
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def records_to_frame(records) -> pd.DataFrame:
+    """
+    Build a DataFrame column by column from a list of JobRecord
+    (through a pyarrow RecordBatch in Arrow mode), with the run ID as a constant column.
+    """
+    columns = {
+        field: [getattr(record, field) for record in records]
+        for field in JobRecord.__slots__
+    }
+    columns['run_id'] = [RUN_ID] * len(records)
+    if arrow_enabled():
+        return columns_to_arrow_frame(columns, CATEGORICAL_COLUMNS)
+    return apply_categoricals(pd.DataFrame(columns))
@@ -0,0 +1,147 @@
+"""
+Run-level provenance and row lineage.
+
+Every run gets a run ID (utils.logger.RUN_ID: ETL_RUN_ID if set, else a UTC
+timestamp plus a short random suffix), shared by the subprocesses started by
+run_parallel.py. Scrapers tag each JobRecord with the exact request
+that produced it (page_ref) and its position on that page, and the loader
+records them in three side tables keyed by integers:
+
+    "IT_jobs"."etl_runs"      run_key, run_id, recorded_at, command
+    "IT_jobs"."etl_pages"     page_key, run_key, source, request
+    "IT_jobs"."etl_lineage"   job_id, page_key, position
+
+A page's request string is stored once, so each lineage row is a job_id and two
+integers. To find (and replay) the pages behind bad rows:
+
+    python -m utils.lineage <job_id> [<job_id> ...]
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from utils.logger import RUN_ID, get_module_logger
+
+logger = get_module_logger(__name__, group='transform')
+
+SCHEMA = "IT_jobs"
+LINEAGE_COLUMNS = ['run_id', 'page_ref', 'position']
+
+
+def ensure_lineage_tables(conn):
+    conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA}"'))
+    conn.execute(text(
+        f'CREATE TABLE IF NOT EXISTS "{SCHEMA}".etl_runs ('
+        " run_key serial PRIMARY KEY, run_id text NOT NULL UNIQUE,"
+        " recorded_at timestamptz NOT NULL DEFAULT now(), command text)"
+    ))
+    conn.execute(text(
+        f'CREATE TABLE IF NOT EXISTS "{SCHEMA}".etl_pages ('
+        f' page_key serial PRIMARY KEY, run_key integer NOT NULL REFERENCES "{SCHEMA}".etl_runs (run_key),'
+        " source varchar(32) NOT NULL, request text NOT NULL, UNIQUE (run_key, source, request))"
+    ))
+    conn.execute(text(
+        f'CREATE TABLE IF NOT EXISTS "{SCHEMA}".etl_lineage ('
+        f' job_id varchar(64) NOT NULL, page_key integer NOT NULL REFERENCES "{SCHEMA}".etl_pages (page_key),'
+        " position integer, PRIMARY KEY (job_id, page_key))"
+    ))
+
+
+def _run_key(conn, run_id):
+    return conn.execute(text(
+        f'INSERT INTO "{SCHEMA}".etl_runs (run_id, command) VALUES (:run_id, :command) '
+        "ON CONFLICT (run_id) DO UPDATE SET run_id = EXCLUDED.run_id RETURNING run_key"
+    ), {"run_id": run_id, "command": " ".join(sys.argv)}).scalar()
+
+
+def _page_keys(conn, run_key, pages: pd.DataFrame) -> dict:
+    """
+    {(source, request) -> page_key} for the distinct pages of one run, in one statement.
+    """
+    rows = conn.execute(text(
+        f'INSERT INTO "{SCHEMA}".etl_pages (run_key, source, request) '
+        "SELECT :run_key, s, r FROM unnest(CAST(:sources AS text[]), CAST(:requests AS text[])) AS p (s, r) "
+        "ON CONFLICT (run_key, source, request) DO UPDATE SET request = EXCLUDED.request "
+        "RETURNING page_key, source, request"
+    ), {"run_key": run_key, "sources": pages['source'].tolist(), "requests": pages['page_ref'].tolist()})
+    return {(source, request): page_key for page_key, source, request in rows}
+
+
+def record_lineage(df: pd.DataFrame, database_url: str, engine=None) -> int:
+    """
+    Record which run and page produced each row of a loaded frame (with job_id).
+    Frames without lineage columns are skipped. `engine`, if given, is reused
+    and left open. Returns the number of rows recorded.
+    """
+    if df.empty or not {'job_id', 'source', 'page_ref'}.issubset(df.columns):
+        return 0
+    frame = pd.DataFrame({
+        'job_id': df['job_id'].astype(object),
+        'source': df['source'].astype(object),
+        'run_id': df['run_id'].astype(object) if 'run_id' in df.columns else RUN_ID,
+        'page_ref': df['page_ref'].astype(object),
+        'position': pd.to_numeric(df['position'], errors='coerce') if 'position' in df.columns else None,
+    }).dropna(subset=['job_id', 'source', 'run_id', 'page_ref'])
+    if frame.empty:
+        return 0
+
+    owns_engine = engine is None
+    engine = engine or create_engine(database_url)
+    recorded = 0
+    try:
+        with engine.begin() as conn:
+            ensure_lineage_tables(conn)
+            for run_id, rows in frame.groupby('run_id', sort=False):
+                run_key = _run_key(conn, run_id)
+                page_keys = _page_keys(conn, run_key, rows[['source', 'page_ref']].drop_duplicates())
+                keys = [page_keys[(s, r)] for s, r in zip(rows['source'], rows['page_ref'])]
+                positions = [None if pd.isna(p) else int(p) for p in rows['position']]
+                result = conn.execute(text(
+                    f'INSERT INTO "{SCHEMA}".etl_lineage (job_id, page_key, position) '
+                    "SELECT * FROM unnest(CAST(:job_ids AS text[]), CAST(:page_keys AS integer[]), "
+                    "CAST(:positions AS integer[])) ON CONFLICT DO NOTHING"
+                ), {"job_ids": rows['job_id'].tolist(), "page_keys": keys, "positions": positions})
+                recorded += result.rowcount
+    finally:
+        if owns_engine:
+            engine.dispose()
+    logger.info(f"Recorded lineage for {recorded} rows")
+    return recorded
+
+
+def pages_for(database_url: str, job_ids) -> pd.DataFrame:
+    """
+    The runs and requests that produced the given job IDs, newest run first.
+    """
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as conn:
+            return pd.read_sql(text(
+                "SELECT l.job_id, r.run_id, p.source, p.request, l.position "
+                f'FROM "{SCHEMA}".etl_lineage l '
+                f'JOIN "{SCHEMA}".etl_pages p USING (page_key) '
+                f'JOIN "{SCHEMA}".etl_runs r USING (run_key) '
+                "WHERE l.job_id = ANY(:job_ids) ORDER BY r.recorded_at DESC, p.request, l.position"
+            ), conn, params={"job_ids": list(job_ids)})
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the runs and page requests that produced some rows")
+    parser.add_argument("job_ids", nargs="+")
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise ValueError("DATABASE_URL not set.")
+    pages = pages_for(database_url, args.job_ids)
+    if pages.empty:
+        print("No lineage recorded for these job IDs.")
+    for (run_id, source, request), rows in pages.groupby(['run_id', 'source', 'request'], sort=False):
+        print(f"{run_id}  {source}  {request}")
+        for job_id, position in zip(rows['job_id'], rows['position']):
+            print(f"    #{position}: {job_id}")
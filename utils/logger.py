@@ -1,31 +1,191 @@
+"""
+Logging for the ETL: module loggers put records on a queue and a single
+listener thread per process does the formatting and I/O.
+
+  * One file per group per run: logs/<group>/<group>_<run_id>.log, one JSON
+    object per line (ts, level, logger, run_id, pid, msg, exc).
+  * Human-readable lines on stdout, as before.
+  * Messages are formatted on the listener thread, so use lazy %-style
+    arguments in hot loops: logger.warning("Failed to parse salary: %s", s).
+  * Repeated warnings/errors (same logger and message template) are shown
+    REPEAT_LIMIT times per REPEAT_WINDOW seconds, then folded into one
+    "<message> ×<count>" line when the window closes or the process exits.
+
+The run ID (ETL_RUN_ID, or a UTC timestamp plus a short random suffix) is
+exported to the environment, so subprocesses of the same run share it.
+"""
+import atexit
+import json
 import logging
-from datetime import datetime
 import os
+import queue
 import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
-def get_module_logger(module_name: str, group: str = None, log_dir: str = 'logs'):
-    """Create a logger for the specified module and group."""
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    log_dir = os.path.join(log_dir, group)
-    os.makedirs(log_dir, exist_ok=True)
+RUN_ID_ENV = "ETL_RUN_ID"
+RUN_ID = os.environ.setdefault(RUN_ID_ENV, f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:6]}")
 
-    logfile_name = os.path.join(log_dir, f"{module_name}_{group}_{timestamp}.log" if group else f"{module_name}_{timestamp}.log")
-    logger = logging.getLogger(module_name)
-    logger.setLevel(logging.INFO)
+REPEAT_LIMIT = 5
+REPEAT_WINDOW = 60.0
+
+_TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "run_id": RUN_ID,
+            "pid": record.process,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "repeats", None):
+            entry["repeats"] = record.repeats
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _GroupFiles(logging.Handler):
+    """
+    Routes each record to its logger's group file (opened on first write).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.groups = {}  # logger name -> group
+        self.files = {}   # group -> FileHandler
+
+    def add(self, name, group, log_dir):
+        if group not in self.files:
+            group_dir = os.path.join(log_dir, group) if group else log_dir
+            os.makedirs(group_dir, exist_ok=True)
+            filename = f"{group}_{RUN_ID}.log" if group else f"{RUN_ID}.log"
+            handler = logging.FileHandler(os.path.join(group_dir, filename), delay=True, encoding="utf-8")
+            handler.setFormatter(JsonFormatter())
+            self.files[group] = handler
+        self.groups[name] = group
+
+    def emit(self, record):
+        handler = self.files.get(self.groups.get(record.name))
+        if handler is not None:
+            handler.handle(record)
+
+    def close(self):
+        for handler in self.files.values():
+            handler.close()
+        super().close()
+
+
+class _RunQueueHandler(QueueHandler):
+    """
+    Enqueues records unformatted and folds repeated warnings/errors.
+    """
+
+    def __init__(self, log_queue, repeat_limit=REPEAT_LIMIT, repeat_window=REPEAT_WINDOW):
+        super().__init__(log_queue)
+        self.repeat_limit = repeat_limit
+        self.repeat_window = repeat_window
+        self.repeats = {}  # (logger, level, template) -> [window start, count]
+        self.repeats_lock = threading.Lock()
 
-    if logger.hasHandlers():
-        return logger
+    def prepare(self, record):
+        return record  # Formatting (and %-interpolation) happens on the listener thread
 
-    ## File Handler
-    file_handler = logging.FileHandler(logfile_name)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    def filter(self, record):
+        if not super().filter(record):
+            return False
+        if not logging.WARNING <= record.levelno < logging.CRITICAL:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        summary = None
+        with self.repeats_lock:
+            state = self.repeats.get(key)
+            if state is None or record.created - state[0] >= self.repeat_window:
+                if state is not None and state[1] > self.repeat_limit:
+                    summary = (key, state[1])
+                state = self.repeats[key] = [record.created, 0]
+            state[1] += 1
+            keep = state[1] <= self.repeat_limit
+        if summary:
+            self._emit_summary(*summary)
+        return keep
 
-    ## Stream Handler
-    stream_handler = logging.StreamHandler(sys.stdout)
-    stream_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    stream_handler.setFormatter(stream_formatter)
-    logger.addHandler(stream_handler)
+    def _emit_summary(self, key, count):
+        name, levelno, template = key
+        self.emit(logging.makeLogRecord({
+            "name": name, "levelno": levelno, "levelname": logging.getLevelName(levelno),
+            "msg": "%s ×%d", "args": (template, count), "repeats": count,
+        }))
 
-    return logger
\ No newline at end of file
+    def flush_repeats(self):
+        with self.repeats_lock:
+            folded = [(key, state[1]) for key, state in self.repeats.items() if state[1] > self.repeat_limit]
+            self.repeats.clear()
+        for key, count in folded:
+            self._emit_summary(key, count)
+
+
+_files = _GroupFiles()
+_stream = logging.StreamHandler(sys.stdout)
+_stream.setFormatter(logging.Formatter(_TEXT_FORMAT))
+_queue_handler = _RunQueueHandler(queue.SimpleQueue())
+_listener = None
+_lock = threading.Lock()
+
+
+def _start_listener():
+    global _listener
+    _listener = QueueListener(_queue_handler.queue, _files, _stream)
+    _listener.start()
+
+
+def stop_logging():
+    """
+    Emit pending repeat summaries and drain the queue; registered at exit.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _queue_handler.flush_repeats()
+    _listener.stop()
+    _listener = None
+    _files.close()
+
+
+def _after_fork_in_child():
+    # The listener thread does not survive fork(); give the child its own queue and listener
+    global _listener
+    if _listener is None:
+        return
+    _queue_handler.queue = queue.SimpleQueue()
+    _queue_handler.repeats_lock = threading.Lock()
+    _queue_handler.repeats = {}
+    _start_listener()
+    # Pool workers leave through os._exit, which skips atexit
+    from multiprocessing import util
+    util.Finalize(None, stop_logging, exitpriority=0)
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def get_module_logger(module_name: str, group: str = None, log_dir: str = 'logs'):
+    """Create a logger for the specified module and group."""
+    logger = logging.getLogger(module_name)
+    with _lock:
+        if module_name in _files.groups:
+            return logger
+        _files.add(module_name, group, log_dir)
+        if _listener is None:
+            _start_listener()
+            atexit.register(stop_logging)
+
+    logger.setLevel(logging.INFO)
+    logger.addHandler(_queue_handler)
+    return logger
@@ -0,0 +1,191 @@
+"""
+Memory instrumentation and a spill-to-disk buffer for the extractors.
+
+  * memory_stage(name): logs RSS before/after a stage and the peak RSS sampled
+    while it ran; with ETL_TRACEMALLOC=1 also the traced peak and the top
+    allocation sites that grew during the stage (tracemalloc slows Python
+    code down, so it is opt-in).
+  * ETL_MEMORY_BUDGET_MB: process RSS budget (enforced where the current RSS
+    can be read, i.e. Linux; the getrusage peak is not a usable signal). A SpillBuffer that sees the
+    budget exceeded writes its buffered records to a pickle file (as a compact
+    frame) and drops them from memory; to_frame() reads the batches back.
+
+    jobs = SpillBuffer('jobstreetmalay')
+    jobs.extend(records)          # may spill to ETL_SPILL_DIR
+    df = jobs.to_frame()
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+from utils.job_record import apply_categoricals, records_to_frame
+from utils.logger import get_module_logger
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+logger = get_module_logger(__name__, group='extract')
+
+BUDGET_ENV = "ETL_MEMORY_BUDGET_MB"
+SPILL_DIR_ENV = "ETL_SPILL_DIR"
+TRACEMALLOC_ENV = "ETL_TRACEMALLOC"
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_mb():
+    """
+    Current resident set size in MB (Linux /proc); None where it cannot be read.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 2**20
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of the process so far in MB; None if unknown.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024  # Bytes on macOS, KB elsewhere
+
+
+def memory_budget_mb():
+    value = os.getenv(BUDGET_ENV)
+    return float(value) if value else None
+
+
+def over_budget():
+    # Current RSS only: the peak never comes back down, so once past the
+    # budget every extend would spill. Without /proc the budget is not enforced.
+    budget = memory_budget_mb()
+    if budget is None:
+        return False
+    rss = rss_mb()
+    return rss is not None and rss > budget
+
+
+class _RssSampler(threading.Thread):
+    def __init__(self, interval):
+        super().__init__(name="rss-sampler", daemon=True)
+        self.interval = interval
+        self.peak = rss_mb() or 0.0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            self.peak = max(self.peak, rss_mb() or 0.0)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self.peak = max(self.peak, rss_mb() or 0.0)
+        if not self.peak:  # No current RSS here: fall back to the process-wide peak
+            self.peak = peak_rss_mb() or 0.0
+
+
+@contextmanager
+def memory_stage(name, interval=0.5, top=5):
+    """
+    Log the memory used by the block (see module docstring).
+    """
+    trace = os.getenv(TRACEMALLOC_ENV) == "1"
+    if trace:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before_snapshot = tracemalloc.take_snapshot()
+    before = rss_mb()
+    sampler = _RssSampler(interval)
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        after = rss_mb()
+        logger.info("Memory %s: RSS %.0f -> %.0f MB, peak %.0f MB (%.1fs)",
+                    name, before or 0.0, after or 0.0, sampler.peak, time.perf_counter() - start)
+        if trace:
+            _, traced_peak = tracemalloc.get_traced_memory()
+            growth = tracemalloc.take_snapshot().compare_to(before_snapshot, "lineno")[:top]
+            logger.info("Memory %s: traced peak %.0f MB; top growth: %s", name, traced_peak / 2**20,
+                        "; ".join(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} "
+                                  f"{stat.size_diff / 2**20:+.1f} MB" for stat in growth))
+
+
+class SpillBuffer:
+    """
+    Append-only JobRecord buffer that moves batches to disk when the process is over
+    its memory budget. Each spilled batch is stored as a frame (categoricals for
+    the repetitive columns), so reading it back costs far less than the records did.
+    """
+
+    def __init__(self, name, check_every=500, min_batch=1000, spill_dir=None):
+        self.name = name
+        self.check_every = check_every
+        self.min_batch = min_batch
+        self.spill_dir = spill_dir or os.getenv(SPILL_DIR_ENV) or os.path.join(tempfile.gettempdir(), "etl_spill")
+        self.records = []
+        self.spilled = []      # pickle paths, in order
+        self.spilled_count = 0
+        self._since_check = 0
+
+    def __len__(self):
+        return self.spilled_count + len(self.records)
+
+    def append(self, record):
+        self.records.append(record)
+        self._since_check += 1
+        if self._since_check >= self.check_every:
+            self._maybe_spill()
+
+    def extend(self, records):
+        self.records.extend(records)
+        self._maybe_spill()  # Called once per page, so check every time
+
+    def _maybe_spill(self):
+        self._since_check = 0
+        if len(self.records) >= self.min_batch and over_budget():
+            self.spill()
+
+    def spill(self):
+        if not self.records:
+            return
+        os.makedirs(self.spill_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix=f"{self.name}_", suffix=".pkl", dir=self.spill_dir)
+        os.close(fd)
+        records_to_frame(self.records).to_pickle(path)
+        self.spilled.append(path)
+        self.spilled_count += len(self.records)
+        logger.info("%s: over the %s MB budget (RSS %.0f MB), spilled %d records to %s",
+                    self.name, os.getenv(BUDGET_ENV), rss_mb() or 0.0, len(self.records), path)
+        self.records = []
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        All records, spilled batches first, as one frame; spill files are removed.
+        """
+        frames = []
+        for path in self.spilled:
+            frames.append(pd.read_pickle(path))
+            os.remove(path)
+        if self.records or not frames:
+            frames.append(records_to_frame(self.records))
+        self.spilled, self.spilled_count, self.records = [], 0, []
+        if len(frames) == 1:
+            return frames[0]
+        # Batches have their own category sets; concat falls back to object, so re-categorize
+        return apply_categoricals(pd.concat(frames, ignore_index=True))
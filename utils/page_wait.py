@@ -0,0 +1,56 @@
+import random
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+
+class PolitePageWait:
+    """
+    Explicit render waits plus a politeness delay budget for Selenium scrapers.
+
+    The delay budget is measured from the start of the previous request, so the
+    time a page spends rendering counts towards it. Call `pace()` right before
+    each `driver.get` (or postback) and `until_present()` after it.
+    """
+
+    def __init__(self, driver, timeout: float = 10, min_delay: float = 1.0, max_delay: float = 4.0):
+        self.driver = driver
+        self.timeout = timeout
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._last_start = None
+        self._budget = 0.0
+
+    def pace(self):
+        """
+        Sleep only for whatever is left of the politeness budget, then start a new one.
+        """
+        if self._last_start is not None:
+            remaining = self._budget - (time.monotonic() - self._last_start)
+            if remaining > 0:
+                time.sleep(remaining)
+        self._last_start = time.monotonic()
+        self._budget = random.uniform(self.min_delay, self.max_delay)
+
+    def until_present(self, by, selector, timeout: float = None):
+        """
+        Wait until at least one element matches and return all matches, or [] on timeout.
+        """
+        try:
+            return WebDriverWait(self.driver, timeout or self.timeout).until(
+                EC.presence_of_all_elements_located((by, selector))
+            )
+        except TimeoutException:
+            return []
+
+    def until_stale(self, element, timeout: float = None):
+        """
+        Wait for an element from the previous page to be detached after a postback.
+        """
+        try:
+            WebDriverWait(self.driver, timeout or self.timeout).until(EC.staleness_of(element))
+            return True
+        except TimeoutException:
+            return False
@@ -40,9 +40,10 @@ def custom_job_id(df):
     df['hash'] = df.apply(generate_hash, axis=1)
 
     # Map codes
-    df['cat_code'] = df['category'].map(category_map).fillna("xx")
-    df['src_code'] = df['source'].map(source_map).fillna("xxx")
-    df['c_code'] = df['country'].str.lower()
+    # Categorical columns are mapped as plain objects so fillna can add new codes
+    df['cat_code'] = df['category'].astype(object).map(category_map).fillna("xx")
+    df['src_code'] = df['source'].astype(object).map(source_map).fillna("xxx")
+    df['c_code'] = df['country'].astype(object).str.lower()
     df['ym'] = pd.to_datetime(df['date_posted']).dt.strftime("%Y%m")
     
     # Final job_id
@@ -54,4 +55,15 @@ def custom_job_id(df):
     # Drop helper columns
     df.drop(columns=['hash', 'cat_code', 'src_code', 'c_code', 'ym'], inplace=True)
 
-    return df[['job_id'] + [col for col in df.columns if col != 'job_id']]
\ No newline at end of file
+    return df[['job_id'] + [col for col in df.columns if col != 'job_id']]
+
+
+def replace_category_code(job_id, category):
+    """
+    Rewrite the category segment of an existing job_id (hash_cat_src_cc_yyyymm).
+    """
+    parts = str(job_id).split('_')
+    if len(parts) != 5:
+        return job_id
+    parts[1] = category_map.get(category, "xx")
+    return '_'.join(parts)
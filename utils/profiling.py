@@ -0,0 +1,283 @@
+"""
+Opt-in profiling for ETL runs (the --profile flag of main.py, daily_scraper.py
+and run_parallel.py).
+
+Two profilers run side by side:
+
+  * cProfile on the main thread, dumped as <name>.prof (open with snakeviz or
+    pstats) plus <name>.txt: time per bucket (sleep, network/Selenium, regex,
+    database, pandas/numpy, other) and the top functions.
+  * A sampler thread that records the Python stacks of every thread each
+    `interval` seconds, written as <name>.folded (one "frame;frame;... count"
+    line per stack, the format of flamegraph.pl, speedscope and py-spy).
+
+Everything goes to logs/profile/<run_id>/, next to the logs the workflows
+already upload. Work inside `with section("jobsdbth"):` is written to its own
+<name>-jobsdbth.* files, so one process can produce a profile per source.
+After each run the .folded files of the run directory are merged into
+flamegraph.folded and flamegraph.svg; `python -m utils.profiling DIR` merges
+every profile under DIR (e.g. the artifacts of several jobs).
+"""
+import argparse
+import cProfile
+import html
+import io
+import os
+import pstats
+import sys
+import threading
+import zlib
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+from utils.logger import RUN_ID, get_module_logger
+
+logger = get_module_logger(__name__, group='transform')
+
+PROFILE_DIR = os.path.join("logs", "profile")
+
+## (bucket, substrings of the file name or function label), first match wins
+BUCKETS = (
+    ('sleep', ('time.sleep', 'page_wait.py', 'rate_limiter.py')),
+    ('network', ('socket', '_ssl', 'ssl.py', 'http/client.py', 'urllib3', 'requests', 'selenium')),
+    ('regex', ('re.Pattern', '/re/', '/re.py', '_sre', 'sre_')),
+    ('database', ('sqlalchemy', 'psycopg', 'adbc', 'sqlite3')),
+    ('pandas/numpy', ('/pandas/', '/numpy/', '/pyarrow/')),
+)
+
+
+def _bucket(label):
+    for bucket, needles in BUCKETS:
+        if any(needle in label for needle in needles):
+            return bucket
+    return 'other'
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class RunProfiler:
+    """
+    cProfile + stack sampler for one process; use as a context manager.
+    """
+
+    def __init__(self, name, out_dir=PROFILE_DIR, interval=0.01):
+        self.name = name
+        self.run_dir = os.path.join(out_dir, RUN_ID)
+        self.interval = interval
+        self.current = name
+        self.profiles = {}   # section name -> cProfile.Profile
+        self.samples = {}    # section name -> Counter of folded stacks
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def _profile(self, section):
+        if section not in self.profiles:
+            self.profiles[section] = cProfile.Profile()
+            self.samples[section] = Counter()
+        return self.profiles[section]
+
+    def _sample(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            section = self.current
+            counter = self.samples[section]
+            # Looked up every tick: scheduler threads are renamed after the source they run
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                name = names.get(ident, str(ident))
+                if name.endswith('(_monitor)'):
+                    continue  # The logging listener, idle on its queue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(name)
+                stack.append(section)
+                counter[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._profile(self.name).enable()
+        self._sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+        self._sampler.start()
+        return self
+
+    @contextmanager
+    def section(self, name):
+        """
+        Attribute the work inside the block to `<profiler name>-<name>`.
+        """
+        outer, inner = self.current, f"{self.name}-{name}"
+        self.profiles[outer].disable()
+        self._profile(inner).enable()
+        self.current = inner
+        try:
+            yield
+        finally:
+            self.profiles[inner].disable()
+            self.current = outer
+            self.profiles[outer].enable()
+
+    def stop(self):
+        self.profiles[self.current].disable()
+        self._stop.set()
+        self._sampler.join()
+        os.makedirs(self.run_dir, exist_ok=True)
+        for section, profile in self.profiles.items():
+            path = os.path.join(self.run_dir, section)
+            profile.dump_stats(path + ".prof")
+            with open(path + ".txt", "w", encoding="utf-8") as f:
+                f.write(report(pstats.Stats(profile)))
+            write_folded(self.samples[section], path + ".folded")
+        merged = aggregate(self.run_dir)
+        logger.info("Profile written to %s (%d stacks sampled)", self.run_dir, sum(merged.values()))
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+_active = None
+
+
+@contextmanager
+def profiled(name, enabled=True, out_dir=PROFILE_DIR):
+    """
+    Profile the block when `enabled`; otherwise do nothing.
+    """
+    global _active
+    if not enabled:
+        yield None
+        return
+    _active = RunProfiler(name, out_dir)
+    try:
+        with _active:
+            yield _active
+    finally:
+        _active = None
+
+
+def _after_fork_in_child():
+    # Forked workers (parallel transforms) inherit the enabled cProfile but not the sampler
+    global _active
+    if _active is not None:
+        _active.profiles[_active.current].disable()
+        _active = None
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def section(name):
+    """
+    Per-source section of the active profiler; a no-op when not profiling or
+    off the main thread (sources run in parallel share the process profile,
+    their sampled stacks are labelled with the thread name instead).
+    """
+    if _active is None or threading.current_thread() is not threading.main_thread():
+        return nullcontext()
+    return _active.section(name)
+
+
+def report(stats: pstats.Stats, top=30) -> str:
+    """
+    Main-thread time per bucket, then the functions with the most own time.
+    """
+    buckets = Counter()
+    for (filename, line, func), (_, _, tottime, _, _) in stats.stats.items():
+        buckets[_bucket(f"{filename}:{func}")] += tottime
+    total = sum(buckets.values()) or 1.0
+    out = io.StringIO()
+    out.write(f"Main-thread time by bucket ({total:.1f}s profiled):\n")
+    for bucket, seconds in buckets.most_common():
+        out.write(f"  {bucket:<14}{seconds:9.2f}s {100 * seconds / total:6.1f}%\n")
+    out.write("\n")
+    stats.stream = out
+    stats.sort_stats("tottime").print_stats(top)
+    return out.getvalue()
+
+
+def write_folded(samples: Counter, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in samples.most_common():
+            f.write(f"{stack} {count}\n")
+
+
+def read_folded(path) -> Counter:
+    samples = Counter()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack and count.isdigit():
+                samples[stack] += int(count)
+    return samples
+
+
+def aggregate(directory) -> Counter:
+    """
+    Merge every .folded file under `directory` into flamegraph.folded / flamegraph.svg there.
+    """
+    merged = Counter()
+    for root, _, files in os.walk(directory):
+        for filename in files:
+            if filename.endswith(".folded") and filename != "flamegraph.folded":
+                merged.update(read_folded(os.path.join(root, filename)))
+    for filename, writer in (("flamegraph.folded", write_folded), ("flamegraph.svg", write_svg)):
+        tmp_path = os.path.join(directory, f".{filename}.{os.getpid()}")
+        writer(merged, tmp_path)
+        os.replace(tmp_path, os.path.join(directory, filename))  # Concurrent runs may aggregate too
+    return merged
+
+
+def write_svg(samples: Counter, path, width=1200, row_height=16, min_width=0.5):
+    """
+    A static icicle-style flamegraph (roots at the top); hover a box for its sample count.
+    """
+    tree = {}
+    for stack, count in samples.items():
+        node = tree
+        for frame in stack.split(';'):
+            entry = node.setdefault(frame, [0, {}])
+            entry[0] += count
+            node = entry[1]
+    total = sum(samples.values()) or 1
+    scale = width / total
+    boxes, depth_max = [], 0
+
+    def layout(node, x, depth):
+        nonlocal depth_max
+        for frame, (count, children) in sorted(node.items()):
+            w = count * scale
+            if w >= min_width:
+                boxes.append((x, depth, w, frame, count))
+                depth_max = max(depth_max, depth)
+                layout(children, x, depth + 1)
+            x += w
+
+    layout(tree, 0.0, 0)
+    height = (depth_max + 1) * row_height
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                'font-family="monospace" font-size="11">\n')
+        for x, depth, w, frame, count in boxes:
+            y = depth * row_height
+            hue = zlib.crc32(frame.split(' (')[0].encode()) % 40 + 10
+            label = html.escape(frame)
+            text = html.escape(frame[:int(w / 7)]) if w > 21 else ""
+            f.write(f'<g><title>{label}: {count} samples ({100 * count / total:.1f}%)</title>'
+                    f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_height - 1}" fill="hsl({hue},80%,60%)"/>'
+                    f'<text x="{x + 2:.1f}" y="{y + row_height - 4}">{text}</text></g>\n')
+        f.write("</svg>\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge folded profiles under a directory into one flamegraph")
+    parser.add_argument("directory", nargs="?", default=PROFILE_DIR)
+    args = parser.parse_args()
+    merged = aggregate(args.directory)
+    print(f"Merged {sum(merged.values())} samples into {os.path.join(args.directory, 'flamegraph.svg')}")
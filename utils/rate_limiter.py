@@ -0,0 +1,186 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+
+from utils.logger import get_module_logger
+logger = get_module_logger(__name__, group='extract')
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+## Methods safe to resend; others (POST, PATCH) are sent once unless the caller opts in
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class _HostState:
+    __slots__ = ("rate", "next_allowed", "requests", "throttled", "retries")
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.next_allowed = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+
+
+class AdaptiveRateLimiter:
+    """
+    Per-host AIMD rate control shared by the HTTP scrapers.
+
+    Every successful response raises the host's request rate additively; a 429/5xx
+    or connection error cuts it multiplicatively and the request is retried with
+    jittered exponential backoff (or after `Retry-After` when the server sends it).
+    Retries are capped per request and by a retry budget shared by every request
+    made through the limiter (give each source its own limiter). Non-idempotent
+    requests are not retried by default.
+    """
+
+    def __init__(self, initial_rate: float = 1.0, min_rate: float = 0.2, max_rate: float = 4.0,
+                 increase: float = 0.25, decrease: float = 0.5, max_retries: int = 5,
+                 retry_budget: int = 50, base_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.max_retries = max_retries
+        self.retry_budget = retry_budget
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.initial_rate)
+        return state
+
+    def acquire(self, host: str):
+        """
+        Block until the host's next request slot is due.
+        """
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            start = max(now, state.next_allowed)
+            state.next_allowed = start + 1.0 / state.rate
+            state.requests += 1
+        if start > now:
+            time.sleep(start - now)
+
+    def on_success(self, host: str):
+        with self._lock:
+            state = self._state(host)
+            state.rate = min(self.max_rate, state.rate + self.increase)
+
+    def on_throttle(self, host: str, retry_after: float = None):
+        with self._lock:
+            state = self._state(host)
+            state.rate = max(self.min_rate, state.rate * self.decrease)
+            state.throttled += 1
+            if retry_after:
+                state.next_allowed = max(state.next_allowed, time.monotonic() + retry_after)
+
+    def current_rate(self, host: str) -> float:
+        with self._lock:
+            return self._state(host).rate
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                host: {
+                    "rate": round(state.rate, 3),
+                    "requests": state.requests,
+                    "throttled": state.throttled,
+                    "retries": state.retries,
+                }
+                for host, state in self._hosts.items()
+            }
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform in [0, base * 2^attempt], capped
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+
+    def _take_retry(self, host: str) -> bool:
+        with self._lock:
+            if self.retry_budget <= 0:
+                return False
+            self.retry_budget -= 1
+            self._state(host).retries += 1
+            return True
+
+    def request(self, method: str, url: str, session=None, retry: bool = None, **kwargs) -> requests.Response:
+        """
+        Send a rate-limited request, retrying throttled and failed attempts
+        (by default only for idempotent methods; pass `retry` to override).
+
+        Returns the last response once retries run out (callers still check the
+        status code); re-raises the last connection error if no response was received.
+        """
+        host = urlsplit(url).netloc
+        sender = session or requests
+        kwargs.setdefault("timeout", 30)
+        max_retries = self.max_retries if (method.upper() in IDEMPOTENT_METHODS if retry is None else retry) else 0
+        attempt = 0
+
+        while True:
+            self.acquire(host)
+            try:
+                response = sender.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.on_throttle(host)
+                if attempt >= max_retries or not self._take_retry(host):
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning("%s: %s, retrying in %.1fs", host, e.__class__.__name__, delay)
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if response.status_code not in RETRY_STATUS:
+                self.on_success(host)
+                return response
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.on_throttle(host, retry_after)
+            if attempt >= max_retries or not self._take_retry(host):
+                logger.error("%s: giving up after %s retries (status %s)", host, attempt, response.status_code)
+                return response
+
+            delay = max(retry_after or 0.0, self._backoff(attempt))
+            logger.warning("%s: status %s, retrying in %.1fs (rate now %.2f req/s)",
+                           host, response.status_code, delay, self.current_rate(host))
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, session=None, **kwargs) -> requests.Response:
+        return self.request("GET", url, session=session, **kwargs)
+
+    def post(self, url: str, session=None, retry: bool = False, **kwargs) -> requests.Response:
+        return self.request("POST", url, session=session, retry=retry, **kwargs)
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+## Fallback for scrapers built without a limiter; registry sources get their own
+## (SourceConfig.rate_limiter), so one source cannot spend another's retry budget
+default_limiter = AdaptiveRateLimiter()
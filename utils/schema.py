@@ -0,0 +1,323 @@
+"""
+Managed schema for "IT_jobs"."IT".
+
+The table is range-partitioned by month on date_posted (plus a default
+partition) and typed: DATE dates, NUMERIC salaries, short varchar codes.
+Postgres requires the partition key in every unique constraint, so the keys are
+    PRIMARY KEY (job_id, date_posted)
+    UNIQUE (source, job_link, date_posted)
+with plain indexes on job_link (daily "already loaded?" lookups) and on the
+canonical company_id / location_id (see utils/canonical.py) for joins.
+
+ensure_table() creates the table, or migrates the implicit table that
+DataFrame.to_sql used to create (kept as IT_legacy); insert_jobs() conforms a
+frame, creates any missing monthly partitions and inserts with ON CONFLICT DO NOTHING.
+"""
+import uuid
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError
+
+from utils.aggregates import ensure_summary_table, insert_with_summary_sql
+from utils.arrow_backend import write_table
+from utils.logger import get_module_logger
+
+logger = get_module_logger(__name__, group='transform')
+
+SCHEMA = "IT_jobs"
+TABLE = "IT"
+
+## (column, Postgres type), in table order
+COLUMNS = [
+    ('job_id', 'varchar(64) NOT NULL'),
+    ('title', 'text'),
+    ('category', 'varchar(64)'),
+    ('company', 'text'),
+    ('location', 'text'),
+    ('country', 'varchar(8)'),
+    ('min_salary', 'numeric'),
+    ('max_salary', 'numeric'),
+    ('avg_salary', 'numeric'),
+    ('currency', 'varchar(8)'),
+    ('job_type', 'text'),
+    ('work_arrangement', 'text'),
+    ('level', 'varchar(32)'),
+    ('date_posted', 'date NOT NULL'),
+    ('job_link', 'text'),
+    ('source', 'varchar(32)'),
+    ('company_id', 'integer'),
+    ('location_id', 'integer'),
+]
+COLUMN_NAMES = [name for name, _ in COLUMNS]
+SALARY_COLUMNS = ['min_salary', 'max_salary', 'avg_salary']
+INDEXED_COLUMNS = ['job_link', 'company_id', 'location_id']
+
+
+def _qualified(table):
+    return f'"{SCHEMA}"."{table}"'
+
+
+def _relkind(conn, table):
+    """
+    'p' for a partitioned table, 'r' for a plain one, None if missing.
+    """
+    return conn.execute(text(
+        "SELECT c.relkind FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE n.nspname = :schema AND c.relname = :table"
+    ), {"schema": SCHEMA, "table": table}).scalar()
+
+
+def list_partitions(conn, table=TABLE):
+    return conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "JOIN pg_namespace n ON n.oid = p.relnamespace "
+        "WHERE n.nspname = :schema AND p.relname = :table"
+    ), {"schema": SCHEMA, "table": table}).scalars().all()
+
+
+def _columns(conn, table):
+    return conn.execute(text(
+        "SELECT column_name FROM information_schema.columns WHERE table_schema = :schema AND table_name = :table"
+    ), {"schema": SCHEMA, "table": table}).scalars().all()
+
+
+def _add_missing_columns(conn, table):
+    """
+    Bring a managed table created by an older version up to COLUMNS (additive only).
+    """
+    existing = set(_columns(conn, table))
+    for name, sql_type in COLUMNS:
+        if name not in existing:
+            conn.execute(text(f'ALTER TABLE {_qualified(table)} ADD COLUMN "{name}" {sql_type}'))
+            if name in INDEXED_COLUMNS:
+                conn.execute(text(f'CREATE INDEX ON {_qualified(table)} ({name})'))
+            logger.info(f"Added column {name} to {SCHEMA}.{table}")
+
+
+def _create_table(conn, table):
+    columns_sql = ",\n    ".join(f'"{name}" {sql_type}' for name, sql_type in COLUMNS)
+    # Constraint and index names are left to Postgres so a staging copy never collides
+    conn.execute(text(
+        f"CREATE TABLE {_qualified(table)} (\n    {columns_sql},\n"
+        "    PRIMARY KEY (job_id, date_posted),\n"
+        "    UNIQUE (source, job_link, date_posted)\n"
+        ") PARTITION BY RANGE (date_posted)"
+    ))
+    for col in INDEXED_COLUMNS:
+        conn.execute(text(f'CREATE INDEX ON {_qualified(table)} ({col})'))
+    conn.execute(text(f'CREATE TABLE {_qualified(table + "_default")} PARTITION OF {_qualified(table)} DEFAULT'))
+    logger.info(f"Created partitioned table {SCHEMA}.{table}")
+
+
+def _to_dates(values) -> pd.Series:
+    """
+    Calendar dates of date-like values in any mix of formats (missing where unparsable).
+    The date is taken in each value's own timezone.
+    """
+    values = pd.Series(values, dtype=object)
+    try:
+        parsed = pd.to_datetime(values, errors='coerce', format='mixed')
+    except ValueError:  # Mixed timezones: parse one by one
+        parsed = pd.Series([pd.to_datetime(value, errors='coerce') for value in values], index=values.index)
+        return pd.Series([None if pd.isna(value) else value.date() for value in parsed], index=values.index, dtype=object)
+    return parsed.dt.date
+
+
+def ensure_partitions(conn, dates, table=TABLE):
+    """
+    Create the monthly partitions covering `dates` (anything date-like).
+    """
+    months = pd.to_datetime(_to_dates(dates).dropna()).dt.to_period('M').unique()
+    for month in sorted(months):
+        start = month.start_time.date()
+        end = (month + 1).start_time.date()
+        partition = f"{table}_y{month.year}m{month.month:02d}"
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {_qualified(partition)} PARTITION OF {_qualified(table)} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+
+
+def _migrate_legacy(conn, table):
+    """
+    Move the implicit to_sql table aside and copy its rows into the managed table.
+    Rows without a usable date_posted, or duplicating a key, are not copied.
+    """
+    legacy = f"{table}_legacy"
+    conn.execute(text(f'ALTER TABLE {_qualified(table)} RENAME TO "{legacy}"'))
+    _create_table(conn, table)
+
+    date_expr = (
+        "CASE WHEN date_posted::text ~ '^\\d{4}-\\d{2}-\\d{2}' "
+        "THEN left(date_posted::text, 10)::date END"
+    )
+    months = conn.execute(text(
+        f"SELECT DISTINCT date_trunc('month', {date_expr})::date FROM {_qualified(legacy)}"
+    )).scalars().all()
+    ensure_partitions(conn, [m for m in months if m is not None], table)
+
+    legacy_columns = set(_columns(conn, legacy))
+    select_sql = []
+    for name, sql_type in COLUMNS:
+        if name not in legacy_columns:
+            select_sql.append("NULL")
+        elif name == 'date_posted':
+            select_sql.append(date_expr)
+        elif name in SALARY_COLUMNS:
+            # Free-text salaries ('Negotiable', '') become NULL
+            select_sql.append(
+                f"CASE WHEN {name}::text ~ '^-?\\d+(\\.\\d+)?$' THEN {name}::text::numeric END"
+            )
+        elif sql_type == 'integer':
+            select_sql.append(f"CAST({name} AS integer)")
+        else:
+            select_sql.append(f"{name}::text")
+    result = conn.execute(text(
+        f"INSERT INTO {_qualified(table)} ({', '.join(COLUMN_NAMES)}) "
+        f"SELECT {', '.join(select_sql)} FROM {_qualified(legacy)} "
+        f"WHERE job_id IS NOT NULL AND ({date_expr}) IS NOT NULL "
+        "ON CONFLICT DO NOTHING"
+    ))
+    logger.info(f"Migrated {result.rowcount} rows from {SCHEMA}.{legacy} into {SCHEMA}.{table}; "
+                f"drop {legacy} once verified")
+
+
+def ensure_table(engine, table=TABLE):
+    """
+    Create the managed table if needed, migrating a plain (implicit) table in place.
+    """
+    with engine.begin() as conn:
+        conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA}"'))
+        kind = _relkind(conn, table)
+        if kind is None:
+            _create_table(conn, table)
+        elif kind == 'r':
+            _migrate_legacy(conn, table)
+        else:
+            _add_missing_columns(conn, table)
+
+
+def conform_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Project a transformed frame onto the table's columns and types.
+    Non-numeric salaries become missing. Rows without job_id or a parsable
+    date_posted (both part of the key) are dropped with a warning naming how many.
+    """
+    out = df.reindex(columns=COLUMN_NAMES)
+    for col in ('company_id', 'location_id'):
+        out[col] = pd.to_numeric(out[col], errors='coerce').astype('Int64')
+    for col in SALARY_COLUMNS:
+        out[col] = pd.to_numeric(out[col].astype(object), errors='coerce')
+    out['date_posted'] = _to_dates(out['date_posted'])
+    for col in out.columns:
+        if isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = out[col].astype(object)
+
+    no_id, no_date = out['job_id'].isna(), out['date_posted'].isna()
+    if no_id.any() or no_date.any():
+        logger.warning("Dropped %d rows without job_id and %d without a parsable date_posted "
+                       "(e.g. %s); date_posted is part of the table key",
+                       no_id.sum(), (no_date & ~no_id).sum(),
+                       out.loc[no_date & ~no_id, 'job_link'].head(3).tolist())
+        out = out[~(no_id | no_date)]
+
+    before = len(out)
+    out = out.drop_duplicates(subset=['job_id', 'date_posted'])
+    out = out.drop_duplicates(subset=['source', 'job_link', 'date_posted'])
+    if len(out) < before:
+        logger.info(f"Dropped {before - len(out)} rows duplicating a key")
+    return out
+
+
+def insert_jobs(df: pd.DataFrame, database_url: str, table: str = TABLE, summarize: bool = False,
+                engine=None) -> int:
+    """
+    Insert a transformed frame (with job_id) into the managed table.
+    Rows whose keys already exist are skipped. With `summarize`, the inserted
+    rows are also folded into the summary table in the same statement.
+    Pass `engine` to reuse a caller's connection pool (e.g. across chunks);
+    it is left open. Returns the number of rows inserted.
+    """
+    df = conform_frame(df)
+    if df.empty:
+        return 0
+
+    owns_engine = engine is None
+    engine = engine or create_engine(database_url)
+    # Unique per call: concurrent loaders (parallel sources, daily + combine) must not share it.
+    # Not a TEMP table because write_table may load it over its own (ADBC) connection.
+    load_table = f"{table}_load_{uuid.uuid4().hex[:12]}"
+    try:
+        ensure_table(engine, table)
+        with engine.begin() as conn:
+            ensure_partitions(conn, df['date_posted'], table)
+
+        try:
+            write_table(df, load_table, database_url, schema=SCHEMA, if_exists='replace', engine=engine)
+            casts = ", ".join(f"CAST({name} AS {sql_type.replace(' NOT NULL', '')})" for name, sql_type in COLUMNS)
+            insert_sql = (
+                f"INSERT INTO {_qualified(table)} ({', '.join(COLUMN_NAMES)}) "
+                f"SELECT {casts} FROM {_qualified(load_table)} ON CONFLICT DO NOTHING"
+            )
+            with engine.begin() as conn:
+                if summarize:
+                    ensure_summary_table(conn, SCHEMA)
+                    inserted = conn.execute(text(insert_with_summary_sql(insert_sql, SCHEMA))).scalar()
+                else:
+                    inserted = conn.execute(text(insert_sql)).rowcount
+        finally:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {_qualified(load_table)}"))
+        return inserted
+    finally:
+        if owns_engine:
+            engine.dispose()
+
+
+def _rename_with_partitions(conn, old, new):
+    partitions = list_partitions(conn, old)
+    conn.execute(text(f'ALTER TABLE {_qualified(old)} RENAME TO "{new}"'))
+    for partition in partitions:
+        conn.execute(text(f'ALTER TABLE {_qualified(partition)} RENAME TO "{new}{partition[len(old):]}"'))
+
+
+def swap_table(engine, staging: str, table: str = TABLE):
+    """
+    Atomically replace `table` with `staging` (managed), renaming the staging
+    partitions to the target's naming scheme.
+
+    The current table is renamed aside in the same transaction rather than
+    dropped, so objects depending on it cannot block the swap. A managed table
+    goes to {table}_old and is dropped afterwards; if views or foreign keys
+    still depend on it (they follow the rename), it is kept with a warning
+    and replaced by the next swap.
+    An implicit (never migrated) table is kept as {table}_legacy, as ensure_table does.
+    """
+    old = f"{table}_old"
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {_qualified(old)}"))  # Kept by an earlier swap
+    except DBAPIError as e:
+        old = f"{table}_old_{uuid.uuid4().hex[:8]}"
+        logger.warning(f"Could not drop {SCHEMA}.{table}_old ({e.orig}); moving {table} to {old}")
+
+    with engine.begin() as conn:
+        kind = _relkind(conn, table)
+        if kind == 'r' and _relkind(conn, f"{table}_legacy") is None:
+            old = f"{table}_legacy"
+            logger.info(f"Keeping the implicit {SCHEMA}.{table} as {old}; drop it once verified")
+        if kind is not None:
+            _rename_with_partitions(conn, table, old)
+        _rename_with_partitions(conn, staging, table)
+
+    if kind is None or old.endswith("_legacy"):
+        return
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE {_qualified(old)}"))
+    except DBAPIError as e:
+        logger.warning(f"Kept {SCHEMA}.{old}: {e.orig}. Objects depending on {table} now point at {old}; "
+                       f"recreate them on {table}, then drop {old}")
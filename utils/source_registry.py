@@ -0,0 +1,275 @@
+"""
+Source registry: sources.toml describes every source once (extractor, query
+params, full/daily overrides, politeness, concurrency, expected runtime) for
+main.py, daily_scraper.py, run_parallel.py and combine_load.py.
+
+    registry = load_sources("daily")
+    config = registry["jobsdbth"]
+    df = config.extract()                           # normalized frame
+    df = config.transform_class()(df).transform()
+
+run_scheduled() runs sources longest expected runtime first (LPT) in
+max_parallel slots: each slot that frees up takes the longest source left, so
+one slow source started last cannot stretch the whole run. The runtime of
+every successful source run is folded into output/source_runtimes.json, which
+replaces expected_minutes once a source has been timed.
+
+`python -m utils.source_registry --mode daily` prints the schedule;
+`--names` prints the enabled sources as a JSON list (for workflow matrices).
+"""
+import argparse
+import dataclasses
+import importlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+from utils.logger import get_module_logger
+
+logger = get_module_logger(__name__, group='extract')
+
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sources.toml")
+REGISTRY_ENV = "ETL_SOURCES"
+RUNTIMES_PATH = os.path.join("output", "source_runtimes.json")
+MODES = ("full", "daily")
+RUNTIME_WEIGHT = 0.5  # Weight of the newest run in a source's runtime estimate
+
+_DELAY_KEYS = ("min_delay", "max_delay")
+
+
+@dataclass
+class SourceConfig:
+    name: str
+    mode: str
+    extractor: str
+    normalizer: str
+    transform: str
+    expected_minutes: float = 10.0
+    max_concurrency: int = 1
+    politeness: dict = field(default_factory=dict)
+    params: dict = field(default_factory=dict)
+    options: dict = field(default_factory=dict)
+    enabled: bool = True
+
+    def transform_class(self):
+        module, _, name = self.transform.partition(":")
+        return getattr(importlib.import_module(module), name)
+
+    def rate_limiter(self):
+        """
+        A new AdaptiveRateLimiter with the source's politeness settings, so every
+        source run has its own rates and retry budget.
+        """
+        from utils.rate_limiter import AdaptiveRateLimiter
+        return AdaptiveRateLimiter(**{key: value for key, value in self.politeness.items() if key not in _DELAY_KEYS})
+
+    def delays(self):
+        """
+        Page delays for the Selenium scrapers.
+        """
+        return {key: self.politeness[key] for key in _DELAY_KEYS if key in self.politeness}
+
+    def extract(self):
+        """
+        Run the source's extractor and return its normalized frame.
+        """
+        from utils.data_normalizer import JobDataNormalizer
+        raw = EXTRACTORS[self.extractor](self)
+        return getattr(JobDataNormalizer(), self.normalizer)(raw)
+
+
+_FIELDS = {f.name for f in dataclasses.fields(SourceConfig)} - {"name", "mode"}
+
+
+## Extractor adapters: SourceConfig -> raw frame
+def _extract_jobnet(config):
+    from extract.jobnetmm import get_jobnet_jobs
+    return get_jobnet_jobs(os.getenv("JOBNET_EMAIL"), os.getenv("JOBNET_PASSWORD"),
+                           rate_limiter=config.rate_limiter(), **config.delays(), **config.options)
+
+
+def _extract_jobsdb_sg(config):
+    from extract.jobdbsg import JobsDBScraper
+    options = config.options
+    scraper = JobsDBScraper(max_pages_override=options.get("max_pages"),
+                            dynamic_pages=options.get("dynamic_pages", False),
+                            headless=options.get("headless", True), **config.delays())
+    return scraper.run(url_pattern=options["url_pattern"], roles=options.get("roles"))
+
+
+def _extract_foundit(config):
+    from extract.founditSG import FounditScraper
+    return FounditScraper(base_params=dict(config.params), rate_limiter=config.rate_limiter(),
+                          concurrency=config.max_concurrency,
+                          max_start=config.options.get("max_start", 600)).extract_jobs()
+
+
+def _extract_seek(config):
+    # One fan-out over the source's classifications (see extract/seek_fanout.py)
+    from extract.seek_fanout import SeekFanout
+    options = dict(config.options)
+    site = options.pop("site", config.name)
+    targets = [(site, classification) for classification in options.pop("classifications")]
+    params = dict(config.params)
+    fanout = SeekFanout(targets, base_params=params, page_size=params.pop("pageSize", 100),
+                        rate_limiter=config.rate_limiter(), concurrency=config.max_concurrency, **options)
+    return fanout.extract_jobs()[site]
+
+
+EXTRACTORS = {
+    "jobnet": _extract_jobnet,
+    "jobsdb_sg": _extract_jobsdb_sg,
+    "foundit": _extract_foundit,
+    "seek": _extract_seek,
+}
+
+
+def _merge(base, override):
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _read(path=None):
+    with open(path or os.getenv(REGISTRY_ENV) or REGISTRY_PATH, "rb") as f:
+        return tomllib.load(f)
+
+
+def _for_mode(entry, mode):
+    # Base settings with the [<mode>] table merged over them
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode: {mode}")
+    return _merge({key: value for key, value in entry.items() if key not in MODES}, entry.get(mode, {}))
+
+
+def load_sources(mode="full", path=None):
+    """
+    Enabled sources for `mode` ("full" or "daily"), in registry order.
+    """
+    sources = {}
+    for name, entry in _read(path).get("sources", {}).items():
+        settings = _for_mode(entry, mode)
+        unknown = set(settings) - _FIELDS
+        if unknown:
+            raise ValueError(f"Unknown settings for source {name}: {', '.join(sorted(unknown))}")
+        if settings.get("extractor") not in EXTRACTORS:
+            raise ValueError(f"Unknown extractor for source {name}: {settings.get('extractor')}")
+        config = SourceConfig(name=name, mode=mode, **settings)
+        if config.enabled:
+            sources[name] = config
+    return sources
+
+
+def source_names(mode="full", path=None):
+    return list(load_sources(mode, path))
+
+
+def scheduler_settings(mode="full", path=None):
+    return _merge({"max_parallel": 1}, _for_mode(_read(path).get("scheduler", {}), mode))
+
+
+class RuntimeHistory:
+    """
+    Exponentially weighted runtime of each source per mode, kept in a JSON file.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or RUNTIMES_PATH
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.runtimes = json.load(f)
+        except (OSError, ValueError):
+            self.runtimes = {}
+
+    def expected_seconds(self, config):
+        return self.runtimes.get(f"{config.mode}/{config.name}", config.expected_minutes * 60)
+
+    def record(self, config, seconds):
+        key = f"{config.mode}/{config.name}"
+        with self._lock:
+            previous = self.runtimes.get(key)
+            self.runtimes[key] = seconds if previous is None else (
+                RUNTIME_WEIGHT * seconds + (1 - RUNTIME_WEIGHT) * previous)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.runtimes, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+
+def schedule(configs, history=None):
+    """
+    Sources ordered longest expected runtime first.
+    """
+    history = history or RuntimeHistory()
+    return sorted(configs, key=history.expected_seconds, reverse=True)
+
+
+def run_scheduled(configs, worker, max_parallel=None, history=None):
+    """
+    Call worker(config) for every source in LPT order, at most `max_parallel`
+    at a time (threads; the worker may start a subprocess). Successful runs are
+    timed into the runtime history.
+    Returns {name: result} in the given order; a failed source maps to its exception.
+    """
+    configs = list(configs)
+    if not configs:
+        return {}
+    history = history or RuntimeHistory()
+    order = schedule(configs, history)
+    max_parallel = max_parallel or scheduler_settings(order[0].mode)["max_parallel"]
+    logger.info("Schedule (%d at a time): %s", max_parallel,
+                ", ".join(f"{c.name} ~{history.expected_seconds(c) / 60:.1f} min" for c in order))
+
+    def timed(config, rename=True):
+        if rename:
+            threading.current_thread().name = config.name  # Labels the thread in profiles
+        start = time.perf_counter()
+        result = worker(config)
+        elapsed = time.perf_counter() - start
+        history.record(config, elapsed)
+        logger.info("%s finished in %.1f min", config.name, elapsed / 60)
+        return result
+
+    results = {}
+    if max_parallel == 1:
+        for config in order:
+            try:
+                results[config.name] = timed(config, rename=False)
+            except Exception as e:
+                results[config.name] = e
+    else:
+        with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+            # The pool takes queued sources in submission order, i.e. longest first
+            futures = {config.name: pool.submit(timed, config) for config in order}
+        for name, future in futures.items():
+            results[name] = future.exception() or future.result()
+    return {config.name: results[config.name] for config in configs}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the sources of sources.toml in schedule order")
+    parser.add_argument("--mode", choices=MODES, default="full")
+    parser.add_argument("--names", action="store_true", help="Print the enabled sources as a JSON list")
+    args = parser.parse_args()
+    registry = load_sources(args.mode)
+    if args.names:
+        print(json.dumps(list(registry)))
+    else:
+        history = RuntimeHistory()
+        print(f"{args.mode}: {scheduler_settings(args.mode)['max_parallel']} at a time")
+        for config in schedule(registry.values(), history):
+            print(f"  {config.name:<16}{history.expected_seconds(config) / 60:7.1f} min  ({config.extractor})")